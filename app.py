@@ -9,7 +9,63 @@ from collections import defaultdict
 
 # import 경로 수정
 from scraper.discussion_scraper import SteamDiscussionScraper
-from scraper.review_scraper import SteamReviewScraper
+from scraper.metrics import get_default_metrics
+from scraper.scrape_jobs import ScrapeJobManager, ACTIVE_STATUSES, RESUMABLE_STATUSES, JOB_DONE
+from scraper.search_index import get_default_search_index
+
+# 분석/차트 캐시에 함수별로 보관할 최대 항목 수
+CACHE_MAX_ENTRIES = 16
+
+# 실행 중인 수집 작업의 진행 상황을 다시 읽어오는 간격(초)
+JOB_POLL_SECONDS = 2
+
+# 목록 화면에서 한 번에 그리는 행 수 (선택지)와 게시글마다 미리 보여줄 댓글 수
+LIST_PAGE_SIZES = [20, 50, 100]
+COMMENT_PREVIEW_COUNT = 20
+
+DISCUSSION_SORT_OPTIONS = {
+    '목록 순서': (None, True),
+    '댓글 많은 순': ('reply_count', False),
+    '제목 순': ('title', True)
+}
+REVIEW_SORT_OPTIONS = {
+    '최신 순': ('timestamp', False),
+    '오래된 순': ('timestamp', True),
+    '플레이 시간 긴 순': ('playtime', False),
+    '추천 많은 순': ('votes_up', False)
+}
+
+JOB_KIND_LABELS = {'discussions': '토론', 'reviews': '리뷰'}
+SEARCH_KIND_LABELS = {'review': '리뷰', 'discussion': '토론', 'comment': '댓글'}
+
+# 전문 검색 결과로 보여줄 최대 문서 수
+SEARCH_RESULT_LIMIT = 50
+
+# 키워드 추이에서 보여줄 키워드 수와 차트에 그릴 상위 키워드 수
+TREND_KEYWORD_COUNT = 20
+TREND_CHART_KEYWORDS = 5
+TREND_FREQ_LABELS = {'D': '일별', 'W': '주별'}
+
+# 이상 징후 구간 음영 색 (리뷰 수/긍정 비율이 예상보다 높음/낮음)
+ANOMALY_COLORS = {'up': '#fb8c00', 'down': '#e53935'}
+ANOMALY_METRIC_LABELS = {'count': '리뷰 수', 'positive_ratio': '긍정 비율'}
+ANOMALY_RULE_LABELS = {'zscore': '급변(z-score)', 'cusum': '누적 변화(CUSUM)'}
+
+# 수집 통계 패널의 단계 이름
+STAGE_LABELS = {
+    'steam_http_request_seconds': '네트워크 대기',
+    'steam_rate_limit_wait_seconds': '속도 제한 대기',
+    'steam_parse_seconds': '파싱',
+    'steam_transform_seconds': '테이블 변환',
+    'steam_analysis_seconds': '분석'
+}
+JOB_STATUS_LABELS = {
+    'queued': '대기 중',
+    'running': '수집 중',
+    'done': '완료',
+    'failed': '실패',
+    'interrupted': '중단됨'
+}
 
 def check_password():
     """비밀번호 확인 함수"""
@@ -67,10 +123,22 @@ def display_media_info(media_info):
             for link in media_info['media_links']:
                 st.write(f"- [{link['type']}]({link['url']})")
 
-def create_daily_review_chart(df):
-    """일별 리뷰 카운트 차트 생성"""
-    daily_counts = df.groupby(df['timestamp'].dt.date).size().reset_index()
-    daily_counts.columns = ['date', 'count']
+def add_anomaly_windows(fig, windows):
+    """감지된 이상 징후 구간(연속된 날짜)을 차트에 음영으로 표시"""
+    for start, end, direction in windows:
+        fig.add_vrect(
+            x0=start - pd.Timedelta(hours=12),
+            x1=end + pd.Timedelta(hours=12),
+            fillcolor=ANOMALY_COLORS[direction],
+            opacity=0.2,
+            line_width=0,
+            annotation_text='급증' if direction == 'up' else '급감',
+            annotation_position='top left'
+        )
+
+def create_daily_review_chart(cube, anomalies=None):
+    """일별 리뷰 카운트 차트 생성 (anomalies를 주면 전체 리뷰 수 이상 징후 구간 표시)"""
+    daily_counts = cube.daily()[['date', 'total']].rename(columns={'total': 'count'})
     
     fig = px.line(daily_counts, 
                   x='date', 
@@ -81,18 +149,35 @@ def create_daily_review_chart(df):
     fig.update_layout(showlegend=True, 
                      xaxis_title="날짜",
                      yaxis_title="리뷰 수")
+    if anomalies is not None:
+        add_anomaly_windows(fig, anomalies.windows('count'))
     
     return fig
 
-def create_daily_sentiment_chart(df):
-    """일별 긍정/부정 비율 차트 생성"""
-    daily_sentiment = df.groupby(df['timestamp'].dt.date)['recommended'].agg(['sum', 'size']).reset_index()
-    daily_sentiment['positive_ratio'] = (daily_sentiment['sum'] / daily_sentiment['size'] * 100).round(1)
+def add_polarity_trace(fig, x, avg_polarity, x_label):
+    """리뷰 텍스트의 평균 감성 점수(-1~1)를 오른쪽 축에 겹쳐 그림 (채점된 리뷰가 없으면 생략)"""
+    if not avg_polarity.notna().any():
+        return
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=avg_polarity,
+        mode='lines+markers',
+        name='텍스트 감성 평균',
+        yaxis='y2',
+        line=dict(dash='dot', color='#43a047'),
+        hovertemplate=f'{x_label}: %{{x}}<br>감성 평균: %{{y:.3f}}<extra></extra>'
+    ))
+    fig.update_layout(yaxis2=dict(title='텍스트 감성 평균', overlaying='y', side='right', range=[-1, 1]))
+
+def create_daily_sentiment_chart(cube, anomalies=None):
+    """일별 긍정/부정 비율 차트 생성 (anomalies를 주면 전체 긍정 비율 이상 징후 구간 표시)"""
+    daily_sentiment = cube.daily()
+    daily_sentiment['positive_ratio'] = (daily_sentiment['positive'] / daily_sentiment['total'] * 100).round(1)
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=daily_sentiment['timestamp'],
+        x=daily_sentiment['date'],
         y=daily_sentiment['positive_ratio'],
         mode='lines+markers',
         name='긍정 리뷰 비율',
@@ -105,21 +190,17 @@ def create_daily_sentiment_chart(df):
         yaxis_title='긍정 리뷰 비율 (%)',
         yaxis=dict(range=[0, 100])
     )
+    add_polarity_trace(fig, daily_sentiment['date'], daily_sentiment['avg_polarity'], '날짜')
+    if anomalies is not None:
+        add_anomaly_windows(fig, anomalies.windows('positive_ratio'))
     
     return fig
 
-def create_language_sentiment_chart(df):
+def create_language_sentiment_chart(cube):
     """언어별 긍정/부정 비율 차트 생성"""
-    lang_sentiment = df.groupby('language').agg({
-        'recommended': ['count', 'sum']
-    }).reset_index()
-    
-    lang_sentiment.columns = ['language', 'total', 'positive']
-    lang_sentiment['negative'] = lang_sentiment['total'] - lang_sentiment['positive']
-    lang_sentiment['positive_ratio'] = (lang_sentiment['positive'] / lang_sentiment['total'] * 100).round(1)
-    
     # 리뷰 수가 많은 상위 10개 언어만 선택
-    lang_sentiment = lang_sentiment.nlargest(10, 'total')
+    lang_sentiment = cube.languages().head(10)
+    lang_sentiment['negative'] = lang_sentiment['total'] - lang_sentiment['positive']
     
     fig = go.Figure()
     
@@ -144,37 +225,630 @@ def create_language_sentiment_chart(df):
         yaxis_title='리뷰 수',
         hovermode='x'
     )
+    add_polarity_trace(fig, lang_sentiment['language'], lang_sentiment['avg_polarity'], '언어')
     
     return fig
 
-def create_daily_review_tables(df):
-    """일별 리뷰 데이터 테이블 생성"""
+def sentiment_table(counts, key_label):
+    """(기준, total, positive) 집계를 긍정/부정 비율 표로 변환"""
+    table = counts.rename(columns={counts.columns[0]: key_label, 'total': '전체 리뷰 수', 'positive': '긍정 리뷰 수'})
+    table['부정 리뷰 수'] = table['전체 리뷰 수'] - table['긍정 리뷰 수']
+    table['긍정 비율'] = (table['긍정 리뷰 수'] / table['전체 리뷰 수'] * 100).round(1).astype(str) + '%'
+    # 감성 점수 열은 비율 뒤에 둠 (채점된 리뷰가 없으면 빈 값)
+    table['텍스트 감성 평균'] = table.pop('avg_polarity').astype(float).round(3)
+    return table
+
+def create_daily_review_tables(cube):
+    """일별 리뷰 데이터 테이블 생성 (리뷰 원본 대신 집계 큐브 사용)"""
+    daily = cube.daily()
     
     # 1. 일별 리뷰 카운트 테이블
-    daily_counts = df.groupby(df['timestamp'].dt.date).size().reset_index()
-    daily_counts.columns = ['날짜', '리뷰 수']
+    daily_counts = daily[['date', 'total']].rename(columns={'date': '날짜', 'total': '리뷰 수'})
     
     # 2. 일별 긍정/부정 비율 테이블
-    daily_sentiment = df.groupby(df['timestamp'].dt.date).agg({
-        'recommended': ['count', 'sum']
-    }).reset_index()
-    daily_sentiment.columns = ['날짜', '전체 리뷰 수', '긍정 리뷰 수']
-    daily_sentiment['부정 리뷰 수'] = daily_sentiment['전체 리뷰 수'] - daily_sentiment['긍정 리뷰 수']
-    daily_sentiment['긍정 비율'] = (daily_sentiment['긍정 리뷰 수'] / daily_sentiment['전체 리뷰 수'] * 100).round(1)
-    daily_sentiment['긍정 비율'] = daily_sentiment['긍정 비율'].astype(str) + '%'
+    daily_sentiment = sentiment_table(daily, '날짜')
     
-    # 3. 언어별 리뷰 분포 테이블
-    lang_sentiment = df.groupby('language').agg({
-        'recommended': ['count', 'sum']
-    }).reset_index()
-    lang_sentiment.columns = ['언어', '전체 리뷰 수', '긍정 리뷰 수']
-    lang_sentiment['부정 리뷰 수'] = lang_sentiment['전체 리뷰 수'] - lang_sentiment['긍정 리뷰 수']
-    lang_sentiment['긍정 비율'] = (lang_sentiment['긍정 리뷰 수'] / lang_sentiment['전체 리뷰 수'] * 100).round(1)
-    lang_sentiment['긍정 비율'] = lang_sentiment['긍정 비율'].astype(str) + '%'
-    lang_sentiment = lang_sentiment.sort_values('전체 리뷰 수', ascending=False)
+    # 3. 언어별 리뷰 분포 테이블 (리뷰 수가 많은 순)
+    lang_sentiment = sentiment_table(cube.languages(), '언어')
     
     return daily_counts, daily_sentiment, lang_sentiment
 
+# 아래 캐시 함수들은 key(내용 해시 또는 작업 ID와 행 수)로만 결과를 구분하고, 밑줄로
+# 시작하는 인자는 Streamlit이 다시 해시하지 않도록 제외한다.
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_review_tables(cube_key, _cube):
+    return create_daily_review_tables(_cube)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_review_chart(chart_type, cube_key, _cube, _anomalies=None, has_anomalies=False):
+    """차트 객체 캐시 (복사/직렬화 없이 같은 Figure 재사용)
+
+    이상 징후는 같은 리뷰에서 나오지만 수집이 끝난 뒤에야 계산되므로 유무를 키에 함께 넣는다.
+    """
+    builders = {
+        'daily': lambda: create_daily_review_chart(_cube, _anomalies),
+        'sentiment': lambda: create_daily_sentiment_chart(_cube, _anomalies),
+        'language': lambda: create_language_sentiment_chart(_cube)
+    }
+    return builders[chart_type]()
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_csv(frame_key, _df):
+    return _df.to_csv(index=False).encode('utf-8-sig')
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_discussion_analysis(frame_key, app_id, _discussions_df):
+    return SteamDiscussionScraper(app_id).analyze_keywords(_discussions_df)
+
+@st.cache_resource
+def get_job_manager():
+    """서버 프로세스 전체에서 함께 쓰는 수집 작업 관리자 (브라우저 새로고침과 무관하게 유지)"""
+    return ScrapeJobManager()
+
+def format_eta(seconds):
+    if seconds is None:
+        return "계산 중"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"약 {minutes}분 {seconds}초" if minutes else f"약 {seconds}초"
+
+def render_job_progress(job):
+    """작업 하나의 상태/진행률 표시"""
+    label = JOB_KIND_LABELS[job['kind']]
+    status = JOB_STATUS_LABELS.get(job['status'], job['status'])
+    pages = f"{job['pages_done']}/{job['pages_total']}" if job['pages_total'] else f"{job['pages_done']}"
+    text = f"{label} 수집 ({status}) - {pages} 페이지, {job['rows_done']}개 수집"
+    if job['status'] in ACTIVE_STATUSES:
+        text += f", 남은 시간 {format_eta(job['eta_seconds'])}"
+
+    if job['status'] == 'failed':
+        st.error(f"{text}: {job['error']}")
+    elif job['status'] == 'interrupted':
+        st.warning(f"{text}: 서버가 다시 시작되어 작업이 중단되었습니다")
+    elif job['pages_total']:
+        st.progress(min(job['pages_done'] / job['pages_total'], 1.0), text=text)
+    else:
+        st.write(text)
+
+def build_job_results(manager, jobs, period_text):
+    """작업 테이블과 지금까지 저장된 배치로 render_results에 넘길 결과 구성"""
+    any_job = next(iter(jobs.values()))
+    results = {'app_id': any_job['app_id'], 'collected_at': datetime.fromtimestamp(any_job['created_at'])}
+
+    if 'discussions' in jobs:
+        job = jobs['discussions']
+        tables = manager.load_results(job['job_id'])
+        discussions_df = tables['discussions']
+        # 같은 작업의 결과는 배치가 추가될 때만 바뀌므로 내용 해시 대신 (작업 ID, 행 수)를 캐시 키로 사용
+        frame_key = f"{job['job_id']}:{len(discussions_df)}"
+        results['discussions_df'] = discussions_df
+        results['comments_df'] = tables['comments']
+        results['discussion_analysis'] = cached_discussion_analysis(frame_key, job['app_id'], discussions_df)
+        results['discussions_csv'] = cached_csv(frame_key, discussions_df)
+        results['comments_csv'] = cached_csv(f"{job['job_id']}:comments:{len(tables['comments'])}", tables['comments'])
+
+    if 'reviews' in jobs:
+        job = jobs['reviews']
+        reviews_df = manager.load_results(job['job_id'])['reviews']
+        params = job['params']
+        frame_key = f"{job['job_id']}:{len(reviews_df)}"
+        results['reviews_df'] = reviews_df
+        results['review_cube'] = manager.review_cube(job['job_id'])
+        results['keyword_trends'] = manager.keyword_trends(job['job_id'])
+        results['review_anomalies'] = manager.review_anomalies(job['job_id'])
+        results['reviews_csv'] = cached_csv(frame_key, reviews_df)
+        results['crawl_stats'] = {'pages_fetched': 0, 'pages_skipped': 0, 'rows_discarded': 0, **job['stats']}
+        # 끝까지 읽지도, 검색 시작일에 닿지도 않고 끝났으면 페이지 수 제한에 걸려 기간 일부만 수집된 것
+        results['reviews_truncated'] = (job['status'] == JOB_DONE
+                                        and not job['stats'].get('exhausted')
+                                        and not job['stats'].get('stopped_early'))
+        results['review_conditions'] = {
+            'period_text': period_text,
+            'start_date': datetime.fromisoformat(params['start_date']),
+            'end_date': datetime.fromisoformat(params['end_date']),
+            'min_playtime': params['min_playtime']
+        }
+
+    return results
+
+def render_jobs(manager, active_jobs):
+    """선택된 작업들의 진행 상황과 지금까지의 결과를 표시하고, 아직 실행 중인지 반환"""
+    jobs = {kind: manager.get(job_id) for kind, job_id in active_jobs['job_ids'].items()}
+    jobs = {kind: job for kind, job in jobs.items() if job is not None}
+    if not jobs:
+        return False
+
+    for job in jobs.values():
+        render_job_progress(job)
+    render_results(build_job_results(manager, jobs, active_jobs['period_text']))
+    return any(job['status'] in ACTIVE_STATUSES for job in jobs.values())
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def poll_jobs(manager, active_jobs):
+    """실행 중인 작업이 있는 동안 이 부분만 주기적으로 다시 그려 새 배치를 바로 반영"""
+    if not render_jobs(manager, active_jobs):
+        # 모두 끝나면 전체 화면을 한 번 다시 실행해 주기적 갱신을 멈춤
+        st.rerun()
+
+def render_job_history(manager):
+    """최근 작업 목록 (새로고침 후에도 이전 작업 결과를 다시 열 수 있음)"""
+    jobs = manager.list_jobs()
+    if not jobs:
+        return
+
+    with st.expander("최근 수집 작업"):
+        st.dataframe(pd.DataFrame([{
+            '작업 ID': job['job_id'],
+            '종류': JOB_KIND_LABELS[job['kind']],
+            '게임 ID': job['app_id'],
+            '상태': JOB_STATUS_LABELS.get(job['status'], job['status']),
+            '페이지': job['pages_done'],
+            '수집 수': job['rows_done'],
+            '시작 시각': datetime.fromtimestamp(job['created_at']).strftime('%Y-%m-%d %H:%M:%S')
+        } for job in jobs]), hide_index=True)
+
+        selected = st.selectbox("결과를 볼 작업", options=[job['job_id'] for job in jobs])
+        job = next(job for job in jobs if job['job_id'] == selected)
+        col1, col2 = st.columns(2)
+        with col1:
+            show = st.button("선택한 작업 결과 보기")
+        with col2:
+            # 실패/중단된 작업은 마지막으로 기록된 페이지 다음부터 같은 작업에 이어서 수집
+            resume = st.button("이어서 수집", disabled=job['status'] not in RESUMABLE_STATUSES)
+        if resume:
+            manager.resume(job['job_id'])
+        if show or resume:
+            st.session_state['active_jobs'] = {
+                'job_ids': {job['kind']: job['job_id']},
+                'period_text': "이전 수집 작업"
+            }
+
+def render_search(app_id):
+    """수집하면서 쌓인 전문 검색 색인에서 리뷰/토론/댓글 검색"""
+    index = get_default_search_index()
+    st.markdown('<h2 class="sub-header">수집 텍스트 검색</h2>', unsafe_allow_html=True)
+
+    query = st.text_input(
+        "검색어",
+        key="search_query",
+        placeholder='예: crash "frame drop" optim*',
+        help='큰따옴표로 묶으면 구절 검색, 단어 끝에 *를 붙이면 접두어 검색입니다. 모든 단어가 포함된 글만 찾습니다'
+    )
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        only_this_game = st.checkbox(f"현재 게임({app_id})만", value=True, key="search_this_game")
+    search_app_id = app_id if only_this_game else None
+    kinds, languages = index.facets(search_app_id)
+    with col2:
+        selected_kinds = st.multiselect("종류", options=kinds, format_func=lambda k: SEARCH_KIND_LABELS.get(k, k),
+                                        key="search_kinds")
+    with col3:
+        selected_languages = st.multiselect("언어", options=languages, key="search_languages")
+    period = st.date_input("기간 (리뷰는 작성일, 토론/댓글은 수집일)", value=(), key="search_period")
+
+    if not query:
+        st.caption(f"색인된 문서 {index.count(search_app_id):,}개")
+        return
+
+    start_date, end_date = (period[0], period[-1]) if period else (None, None)
+    started = datetime.now()
+    hits = index.search(query, app_id=search_app_id, kinds=selected_kinds, languages=selected_languages,
+                        start_date=start_date, end_date=end_date, limit=SEARCH_RESULT_LIMIT)
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+    st.caption(f"상위 {len(hits)}개 결과 ({elapsed_ms:.0f}ms)")
+
+    for hit in hits.itertuples(index=False):
+        label = SEARCH_KIND_LABELS.get(hit.kind, hit.kind)
+        title = f" · {hit.title}" if hit.title else ""
+        st.markdown(f"**[{label}]** {hit.app_id} · {hit.posted_on} · {hit.language}{title}")
+        st.markdown(f"> {hit.snippet}")
+        if hit.url:
+            st.caption(hit.url)
+
+def render_review_anomalies(anomalies):
+    """일별 리뷰 수/긍정 비율 이상 징후 목록 (언어별 포함, 최근 날짜부터)"""
+    if anomalies is None:
+        st.caption("리뷰 수집이 끝나면 이상 징후를 계산합니다.")
+        return
+    flagged = anomalies.anomalies()
+    if flagged.empty:
+        st.caption("감지된 이상 징후가 없습니다.")
+        return
+    recent = flagged.iloc[::-1]
+    st.caption(f"이상 징후 {len(flagged)}건 (가장 최근: {recent['date'].iloc[0].strftime('%Y-%m-%d')}, "
+               "잠정 표시는 아직 리뷰가 더 들어올 수 있는 마지막 날짜)")
+    with st.expander("이상 징후 상세 데이터"):
+        table = pd.DataFrame({
+            '날짜': recent['date'].dt.date,
+            '언어': recent['language'],
+            '지표': recent['metric'].map(ANOMALY_METRIC_LABELS),
+            '값': recent['value'],
+            '예상': recent['expected'],
+            'z': recent['z'],
+            '규칙': recent['rule'].map(ANOMALY_RULE_LABELS),
+            '잠정': recent['provisional']
+        })
+        st.dataframe(table.style.format({'값': '{:.3g}', '예상': '{:.3g}', 'z': '{:+.1f}'}), hide_index=True)
+
+def render_keyword_trends(trends):
+    """리뷰 키워드의 기간별 TF-IDF 상위/급상승 키워드와 등장 추이 (집계기에 쌓인 빈도로 바로 계산)"""
+    if trends.empty:
+        st.write("키워드를 계산할 리뷰가 없습니다.")
+        return
+
+    freq = st.radio("기간 단위", options=list(TREND_FREQ_LABELS), format_func=TREND_FREQ_LABELS.get,
+                    horizontal=True, key="trend_freq")
+    periods = trends.periods(freq)
+    period = st.selectbox("기간", options=periods[::-1], format_func=lambda p: p.strftime('%Y-%m-%d'),
+                          key=f"trend_period_{freq}")
+
+    top = trends.top_keywords(period, k=TREND_KEYWORD_COUNT, freq=freq)
+    trending = trends.trending(period, k=TREND_KEYWORD_COUNT, freq=freq)
+
+    st.write("##### 기간 상위 키워드 (TF-IDF)")
+    st.dataframe(
+        top.rename(columns={'keyword': '키워드', 'count': '등장 횟수', 'docs': '리뷰 수', 'score': '점수'})
+           .style.format({'점수': '{:.2f}'}),
+        hide_index=True
+    )
+
+    st.write("##### 직전 기간 대비 급상승 키워드")
+    if trending.empty:
+        st.caption("직전 기간보다 늘어난 키워드가 없습니다.")
+    else:
+        st.dataframe(
+            trending.rename(columns={'keyword': '키워드', 'count': '등장 횟수', 'previous_count': '직전 기간',
+                                     'change': '상승 점수'}).style.format({'상승 점수': '{:.3f}'}),
+            hide_index=True
+        )
+
+    keywords = top['keyword'].head(TREND_CHART_KEYWORDS).tolist()
+    if keywords:
+        series = trends.keyword_series(keywords, freq).reset_index().melt(
+            id_vars='date', var_name='keyword', value_name='count'
+        )
+        fig = px.line(series, x='date', y='count', color='keyword',
+                      title=f"상위 키워드 {TREND_FREQ_LABELS[freq]} 등장 추이",
+                      labels={'date': '날짜', 'count': '등장 횟수', 'keyword': '키워드'})
+        st.plotly_chart(fig, use_container_width=True)
+
+def stage_label(stage):
+    """'steam_parse_seconds:thread_html' 같은 단계 키를 '파싱 (thread_html)'으로 표시"""
+    name, _, detail = stage.partition(':')
+    label = STAGE_LABELS.get(name, name)
+    return f"{label} ({detail})" if detail else label
+
+def render_crawl_stats():
+    """이 서버 프로세스에서 실행된 수집/분석의 요청·파싱·변환 지표"""
+    metrics = get_default_metrics()
+    overview = metrics.overview()
+    with st.expander("수집 통계"):
+        st.caption(f"서버 시작(또는 초기화) 후 {overview['uptime_seconds'] / 60:.0f}분 동안의 누적값")
+        retries = sum(overview['retries'].values())
+        cache_total = sum(overview['cache'].values())
+        cache_hits = overview['cache'].get('fresh', 0) + overview['cache'].get('revalidated', 0)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("네트워크 요청", f"{overview['requests']:,}개")
+        with col2:
+            st.metric("재시도", f"{retries:,}회",
+                      help="429(요청 한도 초과)가 늘면 동시 요청 수나 초당 요청 수를 줄이세요")
+        with col3:
+            st.metric("캐시 적중률", f"{cache_hits / cache_total * 100:.0f}%" if cache_total else "-")
+        with col4:
+            latency = overview['latency']
+            st.metric("요청 지연 p95", f"{latency['p95']:.2f}초" if latency else "-")
+
+        if overview['status'] or overview['retries'] or overview['errors']:
+            st.dataframe(pd.DataFrame(
+                [{'구분': '응답 상태', '값': code, '횟수': count} for code, count in sorted(overview['status'].items())] +
+                [{'구분': '재시도 사유', '값': reason, '횟수': count} for reason, count in sorted(overview['retries'].items())] +
+                [{'구분': '요청 오류', '값': error, '횟수': count} for error, count in sorted(overview['errors'].items())]
+            ), hide_index=True)
+
+        if overview['stages']:
+            stages = pd.DataFrame([{
+                '단계': stage_label(stage['stage']),
+                '누적 시간(초)': round(stage['seconds'], 3),
+                '횟수': stage['count'],
+                'p95(초)': round(stage['p95'], 4) if stage['p95'] is not None else None
+            } for stage in overview['stages']]).sort_values('누적 시간(초)', ascending=False)
+            fig = px.bar(stages, x='누적 시간(초)', y='단계', orientation='h', title='단계별 누적 시간')
+            fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(stages, hide_index=True)
+        else:
+            st.info("아직 기록된 수집 지표가 없습니다.")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("Prometheus 형식으로 다운로드", data=metrics.to_prometheus(),
+                               file_name="steam_metrics.prom", mime='text/plain')
+        with col2:
+            st.download_button("JSON으로 다운로드", data=metrics.to_json(),
+                               file_name="steam_metrics.json", mime='application/json')
+        with col3:
+            if st.button("지표 초기화"):
+                metrics.reset()
+                st.rerun()
+
+def filter_frame(df, columns, query):
+    """여러 텍스트 컬럼 중 하나라도 검색어를 포함하는 행만 남김 (대소문자 무시)"""
+    if not query or df.empty:
+        return df
+    mask = pd.Series(False, index=df.index)
+    for column in columns:
+        mask |= df[column].astype(str).str.contains(query, case=False, regex=False, na=False)
+    return df[mask]
+
+def paginate_frame(df, key, search_columns, sort_options):
+    """검색/정렬/페이지 위젯을 그리고 화면에 보일 구간만 잘라 반환
+
+    필터링과 정렬은 서버에서 DataFrame으로 처리하고 현재 페이지의 행만
+    화면 요소로 만들기 때문에, 수집량이 늘어도 그리는 비용은 페이지 크기에 머문다.
+    """
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("검색", key=f"{key}_query", placeholder="제목/내용/작성자 검색")
+    with col2:
+        sort_label = st.selectbox("정렬", options=list(sort_options), key=f"{key}_sort")
+    with col3:
+        page_size = st.selectbox("표시 개수", options=LIST_PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    view = filter_frame(df, search_columns, query)
+    sort_column, ascending = sort_options[sort_label]
+    if sort_column is not None and not view.empty:
+        view = view.sort_values(sort_column, ascending=ascending, kind='stable')
+
+    total_pages = max(1, -(-len(view) // page_size))
+    # 검색 결과가 줄어 현재 페이지가 범위를 벗어나면 마지막 페이지로 이동
+    if st.session_state.get(f"{key}_page", 1) > total_pages:
+        st.session_state[f"{key}_page"] = total_pages
+    with col4:
+        page = st.number_input("페이지", min_value=1, max_value=total_pages, key=f"{key}_page")
+
+    st.caption(f"전체 {len(df)}개 중 {len(view)}개 일치 · {page}/{total_pages} 페이지")
+    start = (page - 1) * page_size
+    return view.iloc[start:start + page_size]
+
+def render_discussion_list(discussions_df, comments_df):
+    """토론 목록을 페이지 단위로 표시 (펼쳐 보기 / 표 형식)"""
+    compact = st.toggle("표 형식으로 보기", key="discussions_compact")
+    window = paginate_frame(discussions_df, 'discussions', ['title', 'content', 'author'],
+                            DISCUSSION_SORT_OPTIONS)
+
+    if compact:
+        st.dataframe(pd.DataFrame({
+            '제목': window['title'],
+            '작성자': window['author'],
+            '작성일': window['last_post'],
+            '댓글 수': window['comment_count'],
+            'URL': window['url']
+        }), hide_index=True, column_config={'URL': st.column_config.LinkColumn('URL')})
+        return
+
+    # 현재 페이지에 보이는 토론의 댓글만 골라 토론별로 묶음
+    window_comments = comments_df[comments_df['discussion_id'].isin(window['discussion_id'])]
+    comments_by_discussion = dict(list(window_comments.groupby('discussion_id', sort=False)))
+
+    for idx, row in window.iterrows():
+        with st.expander(f"📝 {row['title']} (댓글 {row['comment_count']}개)"):
+            st.write("**작성자:** " + row['author'])
+            st.write("**작성일:** " + row['last_post'])
+            st.write("\n**📌 본문 내용:**")
+            st.write(row['content'] if row['content'] else "본문 내용 없음")
+
+            row_comments = comments_by_discussion.get(row['discussion_id'])
+            if row_comments is not None:
+                st.write("\n**💬 댓글:**")
+                for comment in row_comments.head(COMMENT_PREVIEW_COUNT).itertuples():
+                    st.write(f"- **{comment.author}** ({comment.posted_at})")
+                    st.write(f"  {comment.content}")
+                if len(row_comments) > COMMENT_PREVIEW_COUNT:
+                    st.caption(f"외 {len(row_comments) - COMMENT_PREVIEW_COUNT}개 댓글은 CSV에서 확인하세요")
+
+            st.write("\n**🔗 URL:**")
+            st.write(row['url'])
+
+def render_review_list(reviews_df):
+    """리뷰 목록을 페이지 단위로 표시 (펼쳐 보기 / 표 형식)"""
+    compact = st.toggle("표 형식으로 보기", key="reviews_compact")
+    window = paginate_frame(reviews_df, 'reviews', ['content', 'author', 'language'], REVIEW_SORT_OPTIONS)
+
+    if compact:
+        st.dataframe(pd.DataFrame({
+            '작성일': window['timestamp'],
+            '작성자': window['author'],
+            '언어': window['language'],
+            '플레이 시간': (window['playtime'] / 60).round(1),
+            '추천': window['recommended'],
+            '👍': window['votes_up'],
+            '내용': window['content']
+        }), hide_index=True)
+        return
+
+    for idx, row in window.iterrows():
+        with st.expander(f"💭 리뷰 (작성자: {row['author']})"):
+            st.write(f"**작성일:** {row['timestamp']}")
+            st.write(f"**플레이 시간:** {row['playtime']/60:.1f}시간")
+            st.write(f"**언어:** {row['language']}")
+            st.write("\n**리뷰 내용:**")
+            st.write(row['content'])
+            st.write(f"👍 {row['votes_up']} | 😄 {row['votes_funny']}")
+
+def render_results(results):
+    """세션에 보관된 수집 결과 표시 (무거운 계산은 캐시된 함수로 처리)"""
+    app_id = results['app_id']
+    collected_on = results['collected_at'].strftime("%Y%m%d")
+    collect_discussions = 'discussions_df' in results
+    collect_reviews = 'reviews_df' in results
+
+    if collect_discussions:
+        discussions_df = results['discussions_df']
+        comments_df = results['comments_df']
+        discussion_analysis = results['discussion_analysis']
+
+    if collect_reviews:
+        reviews_df = results['reviews_df']
+        # 요약/차트/표는 모두 집계 큐브에서 만들어 리뷰 수와 무관하게 빠름
+        review_cube = results['review_cube']
+        keyword_trends = results['keyword_trends']
+        review_anomalies = results['review_anomalies']
+        cube_key = review_cube.fingerprint()
+        review_analysis = review_cube.summary()
+        crawl_stats = results['crawl_stats']
+        conditions = results['review_conditions']
+
+        # 수집 결과 요약 표시
+        st.info(f"""
+        📊 리뷰 수집 결과:
+        - 검색 기간: {conditions['period_text']} ({conditions['start_date'].strftime('%Y-%m-%d')} ~ {conditions['end_date'].strftime('%Y-%m-%d')})
+        - 최소 플레이 시간: {conditions['min_playtime']}시간 이상
+        - 수집된 리뷰 수: {len(reviews_df)}개
+        - 요청한 페이지 수: {crawl_stats['pages_fetched']}개 (기간보다 최신이라 건너뛴 페이지 {crawl_stats['pages_skipped']}개)
+        - 조건에 맞지 않아 제외된 리뷰 수: {crawl_stats['rows_discarded']}개
+        """)
+        if results['reviews_truncated']:
+            st.warning("페이지 수 제한에 도달해 검색 기간의 리뷰를 모두 수집하지 못했습니다. "
+                       "리뷰 페이지 수를 늘리거나 0으로 두고 다시 수집하세요.")
+
+    # 결과 표시
+    st.markdown('<h2 class="sub-header">분석 결과</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        if collect_discussions:
+            st.subheader("수집된 토론 목록")
+            render_discussion_list(discussions_df, comments_df)
+
+        if collect_reviews:
+            st.subheader("수집된 리뷰 목록")
+            render_review_list(reviews_df)
+
+    with col2:
+        st.subheader("분석 결과")
+
+        if collect_discussions:
+            st.write("### 토론 분석")
+            # 언어 분포
+            st.write("### 언어 분포")
+            languages = discussion_analysis['languages']
+            for lang, count in languages.items():
+                st.write(f"- {lang}: {count}개 게시글")
+
+            # 주요 키워드
+            st.write("\n### 주요 키워드")
+            keywords = discussion_analysis['keywords']
+            for word, count in keywords:
+                st.write(f"- {word}: {count}회 등장")
+
+            # 텍스트 감성 점수 (-1 부정 ~ 1 긍정)
+            discussion_polarity = discussions_df['polarity'].mean() if 'polarity' in discussions_df else None
+            comment_polarity = comments_df['polarity'].mean() if 'polarity' in comments_df else None
+            if pd.notna(discussion_polarity) or pd.notna(comment_polarity):
+                st.write("\n### 텍스트 감성")
+                if pd.notna(discussion_polarity):
+                    st.write(f"- 게시글 평균: {discussion_polarity:.3f}")
+                if pd.notna(comment_polarity):
+                    st.write(f"- 댓글 평균: {comment_polarity:.3f}")
+
+        if collect_reviews:
+            st.write("### 리뷰 분석")
+
+            # 추천 현황을 시각���으로 표시
+            rec_data = review_analysis['recommendations']
+            st.write("#### 추천 현황")
+
+            # 추천 비율을 프로그레스 바로 표시
+            st.progress(rec_data['recommend_percent'] / 100)
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("긍정적 리뷰", f"{rec_data['recommended']}개")
+            with col2:
+                st.metric("부정적 리뷰", f"{rec_data['not_recommended']}개")
+            with col3:
+                st.metric("긍정적 리뷰 비율", f"{rec_data['recommend_percent']}%")
+
+            # 차트 표시
+            st.write("#### 리뷰 추이 분석")
+
+            # 데이터 테이블 생성
+            daily_counts_table, daily_sentiment_table, lang_sentiment_table = cached_review_tables(cube_key, review_cube)
+
+            # 1. 일별 리뷰 등록 추이
+            st.write("##### 일별 리뷰 등록 추이")
+            st.plotly_chart(cached_review_chart('daily', cube_key, review_cube, review_anomalies,
+                                                review_anomalies is not None),
+                            use_container_width=True)
+            with st.expander("일별 리뷰 수 상세 데이터"):
+                st.dataframe(
+                    daily_counts_table.style.format({'날짜': lambda x: x.strftime('%Y-%m-%d')}),
+                    hide_index=True
+                )
+
+            # 2. 일별 긍정/부정 비율 추이
+            st.write("##### 일별 긍정/부정 리뷰 비율 추이")
+            st.plotly_chart(cached_review_chart('sentiment', cube_key, review_cube, review_anomalies,
+                                                review_anomalies is not None),
+                            use_container_width=True)
+            with st.expander("일별 긍정/부정 비율 상세 데이터"):
+                st.dataframe(
+                    daily_sentiment_table.style.format({'날짜': lambda x: x.strftime('%Y-%m-%d')}),
+                    hide_index=True
+                )
+
+            # 3. 언어별 리뷰 분석
+            st.write("##### 언어별 긍정/부정 리뷰 분포")
+            st.plotly_chart(cached_review_chart('language', cube_key, review_cube), use_container_width=True)
+            with st.expander("언어별 리뷰 분포 상세 데이터"):
+                st.dataframe(
+                    lang_sentiment_table,
+                    hide_index=True
+                )
+
+            # 4. 리뷰 폭탄/평가 급변 감지 결과 (차트의 음영 구간과 언어별 경보)
+            st.write("##### 이상 징후")
+            render_review_anomalies(review_anomalies)
+
+            # 5. 기간별 키워드 추이
+            st.write("#### 키워드 추이")
+            render_keyword_trends(keyword_trends)
+
+            # 기존 분석 결과도 표시
+            st.write(f"총 리뷰 수: {review_analysis['total_reviews']}개")
+            st.write(f"평균 플레이 시간: {review_analysis['avg_playtime']:.1f}시간")
+            st.write(f"평균 추천 수: {review_analysis['avg_votes']:.1f}")
+            if review_analysis['avg_polarity'] is not None:
+                st.write(f"평균 텍스트 감성 점수: {review_analysis['avg_polarity']:.3f} (-1 부정 ~ 1 긍정)")
+
+            st.write("\n**언어별 리뷰 수:**")
+            for lang, count in review_analysis['languages'].items():
+                st.write(f"- {lang}: {count}개")
+
+    # CSV 다운로드 버튼들
+    if collect_discussions:
+        st.download_button(
+            label="토론 데이터 CSV 다운로드",
+            data=results['discussions_csv'],
+            file_name=f'steam_discussions_{app_id}_{collected_on}.csv',
+            mime='text/csv'
+        )
+        st.download_button(
+            label="댓글 데이터 CSV 다운로드",
+            data=results['comments_csv'],
+            file_name=f'steam_comments_{app_id}_{collected_on}.csv',
+            mime='text/csv'
+        )
+
+    if collect_reviews:
+        st.download_button(
+            label="리뷰 데이터 CSV 다운로드",
+            data=results['reviews_csv'],
+            file_name=f'steam_reviews_{app_id}_{collected_on}.csv',
+            mime='text/csv'
+        )
+
 def main():
     if not check_password():
         st.stop()  # 비밀번호가 맞지 않으면 여기서 실행 중단
@@ -258,6 +932,27 @@ def main():
         
         collect_discussions = st.checkbox("토론 데이터 수집", value=True)
         collect_reviews = st.checkbox("리뷰 데이터 수집", value=False)
+        save_to_dataset = st.checkbox(
+            "수집 결과를 로컬 데이터셋에 저장",
+            value=True,
+            help="data/dataset 아래에 게임/날짜별 Parquet 파일로 저장해 다시 수집하지 않고 불러올 수 있습니다"
+        )
+        
+        if collect_discussions:
+            st.markdown("##### 토론 수집 조건")
+            max_pages_discussions = st.number_input(
+                "수집할 토론 목록 페이지 수",
+                min_value=1,
+                value=5,
+                help="토론 목록 1페이지당 약 15개의 토론이 수집됩니다"
+            )
+            discussion_concurrency = st.number_input(
+                "동시 요청 수",
+                min_value=1,
+                max_value=16,
+                value=4,
+                help="토론 상세 페이지를 동시에 가져올 개수입니다 (1이면 순차 수집)"
+            )
         
         if collect_reviews:
             st.markdown("##### 리뷰 검색 조건")
@@ -267,6 +962,12 @@ def main():
                 value=2,
                 help="지정한 시간 이상 플레이한 유저의 리뷰만 수집합니다"
             )
+            max_pages_reviews = st.number_input(
+                "수집할 리뷰 페이지 수",
+                min_value=0,
+                value=0,
+                help="리뷰 1페이지당 약 100개의 리뷰가 수집됩니다 (0이면 검색 시작일에 도달할 때까지 수집)"
+            )
             
             date_option = st.radio(
                 "검색 기간 설정",
@@ -319,167 +1020,53 @@ def main():
             )
 
     # 메인 컨텐츠
+    manager = get_job_manager()
+
     if st.button("데이터 수집 및 분석 시작", type="primary"):
-        with st.spinner("데이터 수집 및 분석 중..."):
-            try:
-                # 토론 데이터 수집
-                if collect_discussions:
-                    discussion_scraper = SteamDiscussionScraper(app_id)
-                    discussions_df = discussion_scraper.scrape_discussions(
-                        max_pages=max_pages_discussions)
-                    discussion_analysis = discussion_scraper.analyze_keywords(discussions_df)
-                
-                # 리뷰 데이터 수집
-                if collect_reviews:
-                    review_scraper = SteamReviewScraper(app_id)
-                    reviews_df = review_scraper.get_reviews(
-                        min_playtime=min_playtime,
-                        start_date=start_date,
-                        end_date=end_date,
-                        max_pages=10
-                    )
-                    review_analysis = review_scraper.analyze_reviews(reviews_df)
-                    
-                    # 수집 결과 요약 표시
-                    period_text = f"{date_range}" if date_option == "기간 선택" else "직접 입력 기간"
-                    st.info(f"""
-                    📊 리뷰 수집 결과:
-                    - 검색 기간: {period_text} ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})
-                    - 최소 플레이 시간: {min_playtime}시간 이상
-                    - 수집된 리뷰 수: {len(reviews_df)}개
-                    """)
-                
-                # 결과 표시
-                st.markdown('<h2 class="sub-header">분석 결과</h2>', unsafe_allow_html=True)
-                
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    if collect_discussions:
-                        st.subheader("수집된 토론 목록")
-                        for idx, row in discussions_df.iterrows():
-                            with st.expander(f"📝 {row['title']} (댓글 {len(row['comments'])}개)"):
-                                st.write("**작성자:** " + row['author'])
-                                st.write("**작성일:** " + row['date'])
-                                st.write("\n**📌 본문 내용:**")
-                                st.write(row['content'] if row['content'] else "본문 내용 없음")
-                                
-                                if row['comments']:
-                                    st.write("\n**💬 댓글:**")
-                                    for comment in row['comments']:
-                                        st.write(f"- **{comment['author']}** ({comment['date']})")
-                                        st.write(f"  {comment['content']}")
-                                
-                                st.write("\n**🔗 URL:**")
-                                st.write(row['url'])
-                    
-                    if collect_reviews:
-                        st.subheader("수집된 리뷰 목록")
-                        for idx, row in reviews_df.iterrows():
-                            with st.expander(f"💭 리뷰 (작성자: {row['author']})"):
-                                st.write(f"**작성일:** {row['timestamp']}")
-                                st.write(f"**플레이 시간:** {row['playtime']/60:.1f}시간")
-                                st.write(f"**언어:** {row['language']}")
-                                st.write("\n**리뷰 내용:**")
-                                st.write(row['content'])
-                                st.write(f"👍 {row['votes_up']} | 😄 {row['votes_funny']}")
-                
-                with col2:
-                    st.subheader("분석 결과")
-                    
-                    if collect_discussions:
-                        st.write("### 토론 분석")
-                        # 언어 분포
-                        st.write("### 언어 분포")
-                        languages = discussion_analysis['languages']
-                        for lang, count in languages.items():
-                            st.write(f"- {lang}: {count}개 게시글")
-                        
-                        # 주요 키워드
-                        st.write("\n### 주요 키워드")
-                        keywords = discussion_analysis['keywords']
-                        for word, count in keywords:
-                            st.write(f"- {word}: {count}회 등장")
-                    
-                    if collect_reviews:
-                        st.write("### 리뷰 분석")
-                        
-                        # 추천 현황을 시각���으로 표시
-                        rec_data = review_analysis['recommendations']
-                        st.write("#### 추천 현황")
-                        
-                        # 추천 비율을 프로그레스 바로 표시
-                        st.progress(rec_data['recommend_percent'] / 100)
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("긍정적 리뷰", f"{rec_data['recommended']}개")
-                        with col2:
-                            st.metric("부정적 리뷰", f"{rec_data['not_recommended']}개")
-                        with col3:
-                            st.metric("긍정적 리뷰 비율", f"{rec_data['recommend_percent']}%")
-                        
-                        # 차트 표시
-                        st.write("#### 리뷰 추이 분석")
-                        
-                        # 데이터 테이블 생성
-                        daily_counts_table, daily_sentiment_table, lang_sentiment_table = create_daily_review_tables(reviews_df)
-                        
-                        # 1. 일별 리뷰 등록 추이
-                        st.write("##### 일별 리뷰 등록 추이")
-                        st.plotly_chart(create_daily_review_chart(reviews_df), use_container_width=True)
-                        with st.expander("일별 리뷰 수 상세 데이터"):
-                            st.dataframe(
-                                daily_counts_table.style.format({'날짜': lambda x: x.strftime('%Y-%m-%d')}),
-                                hide_index=True
-                            )
-                        
-                        # 2. 일별 긍정/부정 비율 추이
-                        st.write("##### 일별 긍정/부정 리뷰 비율 추이")
-                        st.plotly_chart(create_daily_sentiment_chart(reviews_df), use_container_width=True)
-                        with st.expander("일별 긍정/부정 비율 상세 데이터"):
-                            st.dataframe(
-                                daily_sentiment_table.style.format({'날짜': lambda x: x.strftime('%Y-%m-%d')}),
-                                hide_index=True
-                            )
-                        
-                        # 3. 언어별 리뷰 분석
-                        st.write("##### 언어별 긍정/부정 리뷰 분포")
-                        st.plotly_chart(create_language_sentiment_chart(reviews_df), use_container_width=True)
-                        with st.expander("언어별 리뷰 분포 상세 데이터"):
-                            st.dataframe(
-                                lang_sentiment_table,
-                                hide_index=True
-                            )
-                        
-                        # 기존 분석 결과도 표시
-                        st.write(f"총 리뷰 수: {review_analysis['total_reviews']}개")
-                        st.write(f"평균 플레이 시간: {review_analysis['avg_playtime']:.1f}시간")
-                        st.write(f"평균 추천 수: {review_analysis['avg_votes']:.1f}")
-                        
-                        st.write("\n**언어별 리뷰 수:**")
-                        for lang, count in review_analysis['languages'].items():
-                            st.write(f"- {lang}: {count}개")
-                
-                # CSV 다운로드 버튼들
-                if collect_discussions:
-                    st.download_button(
-                        label="토론 데이터 CSV 다운로드",
-                        data=discussions_df.to_csv(index=False).encode('utf-8-sig'),
-                        file_name=f'steam_discussions_{app_id}_{datetime.now().strftime("%Y%m%d")}.csv',
-                        mime='text/csv'
-                    )
-                
-                if collect_reviews:
-                    st.download_button(
-                        label="리뷰 데이터 CSV 다운로드",
-                        data=reviews_df.to_csv(index=False).encode('utf-8-sig'),
-                        file_name=f'steam_reviews_{app_id}_{datetime.now().strftime("%Y%m%d")}.csv',
-                        mime='text/csv'
-                    )
+        try:
+            # 수집은 백그라운드 작업으로 넘기고 화면은 진행 상황만 주기적으로 확인
+            job_ids = {}
+            if collect_discussions:
+                job_ids['discussions'] = manager.submit_discussions(
+                    app_id,
+                    max_pages=max_pages_discussions,
+                    concurrency=discussion_concurrency,
+                    save_to_dataset=save_to_dataset
+                )
             
-            except Exception as e:
-                st.error(f"오류 발생: {e}")
+            if collect_reviews:
+                job_ids['reviews'] = manager.submit_reviews(
+                    app_id,
+                    min_playtime=min_playtime,
+                    start_date=start_date,
+                    end_date=end_date,
+                    max_pages=max_pages_reviews or None,
+                    save_to_dataset=save_to_dataset
+                )
+
+            st.session_state['active_jobs'] = {
+                'job_ids': job_ids,
+                'period_text': f"{date_range}" if collect_reviews and date_option == "기간 선택" else "직접 입력 기간"
+            }
+        
+        except Exception as e:
+            st.error(f"오류 발생: {e}")
+
+    render_job_history(manager)
+    render_search(app_id)
+    render_crawl_stats()
+
+    # 선택된 작업은 세션에 보관해 위젯을 조작해 다시 실행돼도 다시 수집하지 않고 표시
+    if st.session_state.get('active_jobs', {}).get('job_ids'):
+        active_jobs = st.session_state['active_jobs']
+        try:
+            jobs = [manager.get(job_id) for job_id in active_jobs['job_ids'].values()]
+            if any(job and job['status'] in ACTIVE_STATUSES for job in jobs):
+                poll_jobs(manager, active_jobs)
+            else:
+                render_jobs(manager, active_jobs)
+        except Exception as e:
+            st.error(f"오류 발생: {e}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
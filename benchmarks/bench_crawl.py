@@ -0,0 +1,317 @@
+"""수집/집계 전체 경로 벤치마크 (로컬 Steam 대역 서버 사용)
+
+benchmarks.fake_steam 서버를 띄우고 SteamReviewScraper, SteamDiscussionScraper(순차/동시)로
+실제 HTTP 클라이언트·속도 제한·파싱 경로를 그대로 거쳐 수집한 뒤, app.py의 리뷰 집계/차트
+함수와 키워드 분석 시간을 잰다. 경우마다 새 프로세스에서 실행해 최대 RSS가 섞이지 않게 하고,
+결과는 --output으로 JSON에 저장해 --compare로 이전 실행과 비교할 수 있다.
+
+    python -m benchmarks.bench_crawl [--latency 0.02] [--rate-429 0.02] [--output result.json]
+    python -m benchmarks.bench_crawl --output new.json --compare baseline.json
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.fake_steam import FakeSteamServer, load_fixture
+
+CASES = ['reviews', 'discussions_serial', 'discussions_concurrent', 'aggregation']
+
+# 비교할 때 값이 클수록 좋은 지표 (시간(seconds, _ms)과 메모리(_mb) 지표는 작을수록 좋음)
+HIGHER_IS_BETTER = ('pages_per_second', 'rows_per_second')
+
+
+def lower_is_better(metric):
+    return metric.endswith(('seconds', '_mb')) or '_ms' in metric
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB) (측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / 1024 / (1024 if sys.platform == 'darwin' else 1), 1)
+
+
+def histogram_total(snapshot, name, **labels):
+    """지표 스냅샷에서 레이블이 일치하는 히스토그램의 (합계, 개수)"""
+    total, count = 0.0, 0
+    for series in snapshot['histograms'].get(name, []):
+        if all(series['labels'].get(key) == value for key, value in labels.items()):
+            total += series['sum']
+            count += series['count']
+    return total, count
+
+
+def counter_total(snapshot, name):
+    return sum(series['value'] for series in snapshot['counters'].get(name, []))
+
+
+def per_page_ms(snapshot, name, **labels):
+    total, count = histogram_total(snapshot, name, **labels)
+    return round(total / count * 1000, 3) if count else None
+
+
+def request_stats(snapshot):
+    return {
+        'requests': counter_total(snapshot, 'steam_http_requests_total'),
+        'retries': counter_total(snapshot, 'steam_http_retries_total'),
+        'network_seconds': round(histogram_total(snapshot, 'steam_http_request_seconds')[0], 3)
+    }
+
+
+def bench_reviews(config, metrics):
+    from scraper.http_client import SteamHttpClient
+    from scraper.rate_limiter import HostRateLimiter
+    from scraper.review_scraper import SteamReviewScraper
+
+    scraper = SteamReviewScraper(config['app_id'], client=SteamHttpClient(metrics=metrics), metrics=metrics,
+                                 rate_limiter=HostRateLimiter(requests_per_second=config['rps'], metrics=metrics))
+    scraper.base_url = config['review_url']
+    started = time.perf_counter()
+    rows = 0
+    stats = {}
+    for batch in scraper.iter_reviews(max_pages=config['review_pages'], stats=stats):
+        rows += len(batch)
+    elapsed = time.perf_counter() - started
+    pages = stats['pages_fetched']
+    snapshot = metrics.snapshot()
+    return {
+        'pages': pages,
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 2),
+        'rows_per_second': round(rows / elapsed, 1),
+        'parse_ms_per_page': per_page_ms(snapshot, 'steam_parse_seconds', kind='review_json'),
+        'table_ms_per_page': per_page_ms(snapshot, 'steam_transform_seconds', step='review_table'),
+        **request_stats(snapshot)
+    }
+
+
+def bench_discussions(config, metrics, concurrency):
+    from scraper.discussion_scraper import SteamDiscussionScraper
+    from scraper.http_client import SteamHttpClient
+    from scraper.rate_limiter import HostRateLimiter
+    from scraper.thread_store import DiscussionThreadStore
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 빈 게시글 저장소로 시작해 모든 상세 페이지를 실제로 받게 함
+        scraper = SteamDiscussionScraper(
+            config['app_id'], client=SteamHttpClient(metrics=metrics), metrics=metrics,
+            rate_limiter=HostRateLimiter(requests_per_second=config['rps'], metrics=metrics),
+            thread_store=DiscussionThreadStore(os.path.join(directory, 'threads.sqlite'))
+        )
+        scraper.base_url = config['discussions_url']
+        started = time.perf_counter()
+        rows = pages = 0
+        for tables in scraper.iter_discussion_tables(max_pages=config['discussion_pages'], concurrency=concurrency,
+                                                     parse_workers=config['parse_workers']):
+            rows += len(tables['discussions'])
+            pages += 1
+        elapsed = time.perf_counter() - started
+        scraper.close()
+        scraper.thread_store._conn.close()
+
+    snapshot = metrics.snapshot()
+    return {
+        'pages': pages,
+        'rows': rows,
+        'threads_failed': scraper.last_crawl_stats['threads_failed'],
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 2),
+        'list_parse_ms_per_page': per_page_ms(snapshot, 'steam_parse_seconds', kind='topics_html'),
+        'thread_parse_ms_per_page': per_page_ms(snapshot, 'steam_parse_seconds', kind='thread_html'),
+        **request_stats(snapshot)
+    }
+
+
+def make_reviews(size):
+    """fixture 리뷰를 날짜를 밀어 가며 반복해 size개짜리 리뷰 테이블 생성"""
+    from scraper.review_scraper import SteamReviewScraper
+    from scraper.schema import make_table
+
+    fixture = json.loads(load_fixture('appreviews.json'))['reviews']
+    scraper = SteamReviewScraper(0, client=object())
+    rows = []
+    for index in range(size):
+        review = fixture[index % len(fixture)]
+        timestamp = review['timestamp_created'] - (index // len(fixture)) * 3600
+        rows.append(scraper._parse_review({**review, 'recommendationid': str(index)},
+                                          datetime.fromtimestamp(timestamp)))
+    return make_table('reviews', rows)
+
+
+def best_ms(func, repeat):
+    """repeat번 실행한 것 중 가장 빠른 시간(ms)과 마지막 결과"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2), result
+
+
+def bench_aggregation(config, metrics):
+    import app
+    from benchmarks.bench_keywords import make_posts
+    from scraper.discussion_scraper import SteamDiscussionScraper
+    from scraper.review_cube import ReviewCube
+
+    reviews = make_reviews(config['reviews'])
+    posts, _ = make_posts(config['posts'])
+    repeat = config['repeat']
+    result = {'reviews': len(reviews), 'posts': len(posts)}
+
+    result['review_cube_ms'], cube = best_ms(lambda: ReviewCube.from_reviews(reviews), repeat)
+    result['summary_ms'], _ = best_ms(cube.summary, repeat)
+    for name in ('create_daily_review_chart', 'create_daily_sentiment_chart', 'create_language_sentiment_chart',
+                 'create_daily_review_tables'):
+        result[f"{name}_ms"], _ = best_ms(lambda: getattr(app, name)(cube), repeat)
+    scraper = SteamDiscussionScraper(0, client=object(), metrics=metrics)
+    result['analyze_keywords_ms'], _ = best_ms(lambda: scraper.analyze_keywords(posts), repeat)
+    return result
+
+
+def run_case(case, config):
+    """새 프로세스에서 경우 하나를 실행하고 결과 dict 반환 (최대 RSS 포함)"""
+    from scraper.metrics import MetricsRegistry
+
+    metrics = MetricsRegistry()
+    # 스크래퍼의 페이지별 진행 로그는 --verbose일 때만 출력
+    log_target = contextlib.nullcontext(sys.stdout) if config['verbose'] else open(os.devnull, 'w')
+    with log_target as log, contextlib.redirect_stdout(log):
+        if case == 'reviews':
+            result = bench_reviews(config, metrics)
+        elif case == 'discussions_serial':
+            result = bench_discussions(config, metrics, concurrency=1)
+        elif case == 'discussions_concurrent':
+            result = bench_discussions(config, metrics, concurrency=config['concurrency'])
+        else:
+            result = bench_aggregation(config, metrics)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit or None
+    }
+
+
+def compare(results, baseline, threshold):
+    """이전 결과와 비교해 변화율을 출력하고 threshold(%)보다 나빠진 지표 목록 반환"""
+    regressions = []
+    print(f"\n{'경우':<24} {'지표':<34} {'이전':>10} {'현재':>10} {'변화':>8}")
+    for case, values in results.items():
+        old_values = baseline.get('results', {}).get(case, {})
+        for metric, value in values.items():
+            old = old_values.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                change = (value - old) / old * 100
+                worse = -change
+            elif lower_is_better(metric):
+                change = (value - old) / old * 100
+                worse = change
+            else:
+                continue
+            flag = ' !' if worse > threshold else ''
+            print(f"{case:<24} {metric:<34} {old:>10} {value:>10} {change:>+7.1f}%{flag}")
+            if worse > threshold:
+                regressions.append((case, metric, old, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=CASES)
+    parser.add_argument('--latency', type=float, default=0.02, help="대역 서버 응답 지연(초)")
+    parser.add_argument('--jitter', type=float, default=0.01, help="지연에 더할 ±무작위 폭(초)")
+    parser.add_argument('--rate-429', type=float, default=0.02, help="429로 응답할 요청 비율 (0~1)")
+    parser.add_argument('--rps', type=float, default=0, help="호스트별 초당 요청 수 제한 (0이면 제한 없음)")
+    parser.add_argument('--review-pages', type=int, default=20)
+    parser.add_argument('--discussion-pages', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=8, help="동시 수집 모드의 상세 페이지 동시 요청 수")
+    parser.add_argument('--parse-workers', type=int, default=None)
+    parser.add_argument('--reviews', type=int, default=200000, help="집계 벤치마크의 리뷰 수")
+    parser.add_argument('--posts', type=int, default=10000, help="키워드 분석 벤치마크의 게시글 수")
+    parser.add_argument('--repeat', type=int, default=3, help="집계 함수 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument('--verbose', action='store_true', help="스크래퍼 진행 로그 출력")
+    parser.add_argument('--output', help="결과를 저장할 JSON 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 경로")
+    parser.add_argument('--threshold', type=float, default=10.0, help="이 비율(%%)보다 나빠지면 회귀로 보고 종료 코드 1")
+    args = parser.parse_args()
+
+    app_id = 413150
+    results = {}
+    with FakeSteamServer(latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                         review_pages=args.review_pages) as server:
+        config = {
+            'app_id': app_id,
+            'review_url': server.review_url(app_id),
+            'discussions_url': server.discussions_url(app_id),
+            'rps': args.rps,
+            'review_pages': args.review_pages,
+            'discussion_pages': args.discussion_pages,
+            'concurrency': args.concurrency,
+            'parse_workers': args.parse_workers,
+            'reviews': args.reviews,
+            'posts': args.posts,
+            'repeat': args.repeat,
+            'verbose': args.verbose
+        }
+        for case in args.cases:
+            # 경우마다 새 프로세스를 써야 최대 RSS가 앞선 경우의 영향을 받지 않음
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                results[case] = executor.submit(run_case, case, config).result()
+            print(f"{case}: {json.dumps(results[case], ensure_ascii=False)}")
+        server_stats = dict(server.stats)
+
+    report = {
+        'benchmark': 'bench_crawl',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'server': server_stats,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 지표가 {args.threshold}% 넘게 나빠졌습니다.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""토론 키워드 분석 벤치마크
+
+analyze_keywords의 토큰화·불용어 제거·빈도 집계 단계를 기존 행 단위
+반복문(iterrows)과 현재 청크 단위 Arrow 벡터 연산으로 비교한다. 언어 감지는
+두 방식에 같은 결과를 넣어 측정에서 제외한다.
+
+    python -m benchmarks.bench_keywords [--sizes 1000 10000 100000]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+import pandas as pd
+
+from scraper.discussion_scraper import SteamDiscussionScraper
+from scraper.tokenizers import STOP_WORDS
+
+VOCABULARY = {
+    'en': "the game is great but server lag and crash after update was bad for performance".split(),
+    'ko': "게임 은 는 서버 이 가 렉 업데이트 을 를 버그 재밌어요 최적화 에서 으로".split(),
+    'zh': "游戏 的 了 服务器 更新 是 优化 就 卡顿 都 崩溃 好玩".split(),
+    'ru': "игра и в сервер не обновление что лаги на я оптимизация".split(),
+}
+
+
+def make_posts(size, seed=0):
+    random.seed(seed)
+    langs = random.choices(list(VOCABULARY), weights=[6, 2, 1, 1], k=size)
+    titles = [' '.join(random.choices(VOCABULARY[lang], k=6)) for lang in langs]
+    contents = [' '.join(random.choices(VOCABULARY[lang], k=40)) for lang in langs]
+    return pd.DataFrame({'title': titles, 'content': contents}), pd.Series(langs)
+
+
+def legacy_count(df, languages):
+    """기존 analyze_keywords의 반복문 방식"""
+    keywords = []
+    for (_, row), lang in zip(df.iterrows(), languages):
+        text = f"{row['title']} {row['content']}"
+        words = text.lower().split()
+        keywords.extend(w for w in words if len(w) > 2 and w not in STOP_WORDS.get(lang, set()))
+    return Counter(keywords)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    scraper = SteamDiscussionScraper(0, client=object())
+    print(f"{'게시글 수':>10} {'기존(초)':>10} {'벡터화(초)':>10} {'배속':>8}")
+    for size in args.sizes:
+        df, languages = make_posts(size)
+        texts = df['title'] + ' ' + df['content']
+
+        start = time.perf_counter()
+        expected = legacy_count(df, languages).most_common(20)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = scraper._count_keywords(texts, languages).most_common(20)
+        vectorized_seconds = time.perf_counter() - start
+
+        assert result == expected, "상위 20개 키워드가 기존 방식과 다름"
+        print(f"{size:>10} {legacy_seconds:>10.3f} {vectorized_seconds:>10.3f} "
+              f"{legacy_seconds / vectorized_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""토론 페이지 파싱 속도 벤치마크
+
+저장된 fixture HTML로 기존 방식(html.parser로 페이지 전체 파싱)과
+BeautifulSoup + SoupStrainer(필요한 하위 트리만 파싱), 그리고 기본 경로인
+lxml 직접 파싱의 초당 처리 페이지 수를 비교한다.
+
+    python -m benchmarks.bench_parsing [--repeat 50]
+"""
+import argparse
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from scraper.discussion_parser import (HTML_PARSER, THREAD_STRAINER, extract_thread_details, extract_topics,
+                                      make_topics_soup, parse_thread_html, parse_topics_html)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def pages_per_second(func, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(html)
+    elapsed = time.perf_counter() - start
+    return repeat / elapsed, elapsed / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    list_html = load_fixture('discussion_list.html')
+    thread_html = load_fixture('discussion_thread.html')
+
+    def legacy_list(html):
+        return extract_topics(BeautifulSoup(html, 'html.parser'))
+
+    def strained_list(html):
+        return extract_topics(make_topics_soup(html))
+
+    def legacy_thread(html):
+        return extract_thread_details(BeautifulSoup(html, 'html.parser'))
+
+    def strained_thread(html):
+        return extract_thread_details(BeautifulSoup(html, HTML_PARSER, parse_only=THREAD_STRAINER))
+
+    # 모든 방식의 결과가 같아야 비교가 의미 있음
+    assert legacy_list(list_html) == strained_list(list_html) == parse_topics_html(list_html)
+    assert legacy_thread(thread_html) == strained_thread(thread_html) == parse_thread_html(thread_html)
+
+    cases = [
+        ('목록 페이지', 'html.parser 전체', legacy_list, list_html),
+        ('목록 페이지', f'{HTML_PARSER} + SoupStrainer', strained_list, list_html),
+        ('목록 페이지', '기본 경로 (parse_topics_html)', parse_topics_html, list_html),
+        ('게시글 페이지', 'html.parser 전체', legacy_thread, thread_html),
+        ('게시글 페이지', f'{HTML_PARSER} + SoupStrainer', strained_thread, thread_html),
+        ('게시글 페이지', '기본 경로 (parse_thread_html)', parse_thread_html, thread_html),
+    ]
+
+    print(f"{'페이지':<10} {'방식':<30} {'페이지/초':>10} {'ms/페이지':>10}")
+    for page_type, label, func, html in cases:
+        rate, ms = pages_per_second(func, html, args.repeat)
+        print(f"{page_type:<10} {label:<30} {rate:>10.1f} {ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""벤치마크용 로컬 Steam 대역 서버
+
+저장된 fixture(appreviews JSON, 토론 목록/게시글 HTML)를 Steam과 같은 경로로 내려주고,
+응답마다 지연(latency ± jitter)과 일정 비율의 429 응답을 넣을 수 있다.
+리뷰는 페이지마다 ID/작성 시각을 바꾸고, 토론 목록은 페이지마다 게시글 URL을 바꿔
+여러 페이지를 받아도 서로 다른 리뷰·게시글이 되게 한다.
+
+    python -m benchmarks.fake_steam [--port 8765] [--latency 0.05] [--jitter 0.02] [--rate-429 0.05]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# 목록 fixture 안의 게시글 링크 (페이지마다 서버 주소와 고유 ID로 바꿔 내려줌)
+TOPIC_LINK = re.compile(r'https?://steamcommunity\.com/app/\d+/discussions/(\d+)/(\d+)/')
+REVIEWS_PATH = re.compile(r'^/appreviews/(\d+)$')
+LIST_PATH = re.compile(r'^/app/(\d+)/discussions/$')
+THREAD_PATH = re.compile(r'^/app/(\d+)/discussions/\d+/(\d+)/$')
+
+# 한 목록 페이지 안의 게시글 ID 간격보다 훨씬 크므로 페이지 번호에 곱해 더해도 ID가 겹치지 않음
+TOPIC_ID_STRIDE = 10**9
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class FakeSteamServer:
+    """appreviews API와 토론 목록/게시글 페이지를 흉내 내는 스레드 HTTP 서버
+
+    review_pages 페이지까지 리뷰를 주고 그 뒤로는 빈 목록을 준다. rate_429 비율의
+    요청에는 본문 없이 429와 Retry-After(retry_after초)를 돌려준다. 요청/429 수는
+    stats에 쌓인다.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, rate_429=0.0, retry_after=0,
+                 review_pages=50, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.review_pages = review_pages
+        self.stats = {'requests': 0, 'throttled': 0, 'bytes': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._reviews = json.loads(load_fixture('appreviews.json'))['reviews']
+        self._list_html = load_fixture('discussion_list.html')
+        self._thread_html = load_fixture('discussion_thread.html').encode('utf-8')
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def review_url(self, app_id):
+        """SteamReviewScraper.base_url 대신 쓸 주소"""
+        return f"{self.base_url}/appreviews/{app_id}"
+
+    def discussions_url(self, app_id):
+        """SteamDiscussionScraper.base_url 대신 쓸 주소"""
+        return f"{self.base_url}/app/{app_id}/discussions/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 서버 실행 (명령행에서 단독으로 띄울 때)"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _plan(self):
+        """이번 요청의 (지연 시간, 429 여부)"""
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            throttled = self._random.random() < self.rate_429
+            if throttled:
+                self.stats['throttled'] += 1
+        return delay, throttled
+
+    def _reviews_page(self, cursor):
+        """커서(cursor=*이면 0페이지)에 해당하는 appreviews 응답 본문"""
+        page = 0 if cursor in ('', '*') else int(cursor.removeprefix('page'))
+        reviews = []
+        if page < self.review_pages:
+            # 페이지가 뒤로 갈수록 오래된 리뷰가 되도록 ID와 작성 시각을 밀어냄
+            offset = page * len(self._reviews)
+            for index, review in enumerate(self._reviews):
+                reviews.append({
+                    **review,
+                    'recommendationid': str(int(self._reviews[0]['recommendationid']) - offset - index),
+                    'timestamp_created': review['timestamp_created'] - page * 86400
+                })
+        body = {'success': 1, 'query_summary': {'num_reviews': len(reviews)}, 'reviews': reviews,
+                'cursor': f"page{page + 1}"}
+        return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+    def _list_page(self, app_id, page):
+        base = self.base_url
+        return TOPIC_LINK.sub(
+            lambda match: (f"{base}/app/{app_id}/discussions/{match.group(1)}/"
+                           f"{int(match.group(2)) + page * TOPIC_ID_STRIDE}/"),
+            self._list_html
+        ).encode('utf-8')
+
+    def _respond(self, path, query):
+        """(상태 코드, Content-Type, 본문)"""
+        if REVIEWS_PATH.match(path):
+            return 200, 'application/json; charset=utf-8', self._reviews_page(query.get('cursor', ['*'])[0])
+        match = LIST_PATH.match(path)
+        if match:
+            page = int(query.get('fp', ['1'])[0])
+            return 200, 'text/html; charset=utf-8', self._list_page(match.group(1), page)
+        if THREAD_PATH.match(path):
+            return 200, 'text/html; charset=utf-8', self._thread_html
+        return 404, 'text/plain; charset=utf-8', b'not found'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                delay, throttled = server._plan()
+                if delay:
+                    time.sleep(delay)
+                if throttled:
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(server.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                parts = urlsplit(self.path)
+                status, content_type, body = server._respond(parts.path, parse_qs(parts.query))
+                with server._lock:
+                    server.stats['bytes'] += len(body)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help="응답 지연(초)")
+    parser.add_argument('--jitter', type=float, default=0.02, help="지연에 더할 ±무작위 폭(초)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="429로 응답할 요청 비율 (0~1)")
+    parser.add_argument('--review-pages', type=int, default=50, help="리뷰를 내려줄 페이지 수")
+    args = parser.parse_args()
+
+    server = FakeSteamServer(port=args.port, latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                             review_pages=args.review_pages)
+    print(f"리뷰: {server.review_url(413150)}")
+    print(f"토론: {server.discussions_url(413150)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""여러 게임의 리뷰/토론을 브라우저 없이 한 번에 수집하는 명령행 도구
+
+사용 예:
+    python crawl.py 413150 1145360
+    python crawl.py --file app_ids.txt --workers 16 --rps 4 --summary-file summary.json
+
+모든 게임이 하나의 호스트별 요청 속도 제한을 함께 쓰므로, 동시에 수집하는
+게임 수를 늘려도 Steam 서버로 가는 전체 요청 속도는 --rps를 넘지 않는다.
+수집 위치는 페이지마다 저널에 기록되므로, 중간에 죽은 수집을 같은 명령으로
+다시 실행하면 멈춘 페이지부터 이어서 받는다 (--restart로 처음부터).
+요청/파싱/변환 단계별 지표는 --metrics-file로 Prometheus 텍스트(.prom) 또는 JSON(.json)으로 저장한다.
+리뷰를 동기화한 게임은 일별 리뷰 수/긍정 비율 이상 징후 감지 상태를 저널에 이어 쓰고, 새 경보를 요약에 담는다.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from scraper.crawl_journal import CrawlJournal
+from scraper.dataset_store import SteamDatasetStore
+from scraper.discussion_scraper import SteamDiscussionScraper
+from scraper.metrics import get_default_metrics
+from scraper.rate_limiter import HostRateLimiter
+from scraper.review_anomaly import ReviewAnomalyDetector
+from scraper.review_scraper import SteamReviewScraper
+from scraper.review_store import ReviewStore
+from scraper.search_index import TextSearchIndex
+from scraper.sentiment import SentimentScorer
+
+
+def read_app_ids(args):
+    """명령행과 파일(한 줄에 하나, # 뒤는 주석)에서 app_id를 중복 없이 순서대로 모음"""
+    app_ids = list(args.app_ids)
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    app_ids.append(line)
+    return list(dict.fromkeys(app_ids))
+
+
+def open_checkpoint(journal, kind, app_id, params, restart):
+    """수집 하나의 체크포인트 (--restart면 남아 있던 위치를 지우고 처음부터)"""
+    checkpoint = journal.checkpoint(kind, app_id, params)
+    if restart:
+        checkpoint.clear()
+    return checkpoint
+
+
+def monitor_reviews(app_id, review_store, journal):
+    """저장된 감지기 상태에 아직 반영하지 않은 날짜의 리뷰만 더해 이상 징후를 갱신하고 새 경보 목록 반환
+
+    상태는 게임마다 저널에 남으므로, 매번 전체 기록이 아니라 새로 늘어난 날짜만 읽는다.
+    """
+    key = journal.make_key('review_anomaly', app_id)
+    state = journal.load(key)
+    detector = ReviewAnomalyDetector.from_state(state) if state else ReviewAnomalyDetector()
+    known = len(detector.flagged)
+    reviews = review_store.load(app_id, start_date=detector.resume_date(),
+                                columns=['timestamp', 'language', 'recommended'])
+    detector.add(ReviewAnomalyDetector.daily_counts(reviews))
+    journal.save(key, detector.to_state())
+    return [{**record, 'date': record['date'].strftime('%Y-%m-%d')}
+            for record in detector.flagged[known:] + detector.provisional()]
+
+
+def crawl_reviews(app_id, args, review_store, rate_limiter, journal, search_index=None, scorer=None):
+    """워터마크 이후의 새 리뷰만 받아 데이터셋에 병합 (페이지마다 병합하고 커서를 기록)"""
+    scraper = SteamReviewScraper(app_id, rate_limiter=rate_limiter, sentiment_scorer=scorer)
+    checkpoint = open_checkpoint(journal, 'review_sync', app_id, None, args.restart)
+    added = scraper.sync_new_reviews(review_store, max_pages=args.review_pages, search_index=search_index,
+                                     checkpoint=checkpoint)
+    stats = scraper.last_crawl_stats
+    # 받은 페이지는 이미 병합됐으므로, 오류로 멈췄으면 실패로 집계하고 다음 실행에서 이어 받음
+    if stats.get('error'):
+        raise RuntimeError(f"{stats['error']} (새 리뷰 {added}개는 병합됨)")
+    if stats.get('pages_fetched', 0) == 0:
+        raise RuntimeError("리뷰 페이지를 하나도 받지 못했습니다")
+    result = {'rows': added, 'pages': stats['pages_fetched']}
+    if added:
+        result['anomalies'] = monitor_reviews(app_id, review_store, journal)
+    return result
+
+
+def crawl_discussions(app_id, args, dataset, rate_limiter, journal, search_index=None, scorer=None):
+    """토론 목록 페이지마다 토론/댓글/미디어 테이블을 데이터셋에 추가하고 다음 페이지 번호를 기록"""
+    scraper = SteamDiscussionScraper(app_id, rate_limiter=rate_limiter, sentiment_scorer=scorer)
+    checkpoint = open_checkpoint(journal, 'discussions', app_id, {'max_pages': args.discussion_pages},
+                                 args.restart)
+    collected_at = datetime.now()
+    rows = pages = 0
+    try:
+        for tables in scraper.iter_discussion_tables(max_pages=args.discussion_pages,
+                                                     concurrency=args.discussion_concurrency,
+                                                     collected_at=collected_at,
+                                                     checkpoint=checkpoint):
+            dataset.append_discussion_tables(app_id, tables, collected_at)
+            if search_index is not None:
+                search_index.add_discussion_tables(app_id, tables, collected_at)
+            rows += len(tables['discussions'])
+            pages += 1
+    finally:
+        scraper.close()
+    if scraper.last_crawl_stats.get('error'):
+        raise RuntimeError(f"{scraper.last_crawl_stats['error']} (토론 {rows}개는 저장됨)")
+    return {'rows': rows, 'pages': pages, **scraper.last_crawl_stats}
+
+
+def run_task(kind, app_id, crawl):
+    """작업 하나를 실행하고 결과/소요 시간/오류를 dict로 반환 (예외는 밖으로 내보내지 않음)"""
+    started = time.perf_counter()
+    result = {'app_id': app_id, 'kind': kind, 'rows': 0, 'pages': 0, 'error': None}
+    try:
+        result.update(crawl())
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def summarize(results, elapsed):
+    failures = [r for r in results if r['error']]
+    rows = sum(r['rows'] for r in results)
+    pages = sum(r['pages'] for r in results)
+    return {
+        'games': len({r['app_id'] for r in results}),
+        'tasks': len(results),
+        'failed': len(failures),
+        'rows': rows,
+        'pages': pages,
+        'elapsed_seconds': round(elapsed, 2),
+        'rows_per_second': round(rows / elapsed, 2) if elapsed else 0,
+        'pages_per_second': round(pages / elapsed, 2) if elapsed else 0,
+        'failures': [{'app_id': r['app_id'], 'kind': r['kind'], 'error': r['error']} for r in failures],
+        'anomalies': [{'app_id': r['app_id'], **anomaly} for r in results for anomaly in r.get('anomalies', [])]
+    }
+
+
+def print_summary(summary):
+    print("\n=== 수집 요약 ===")
+    print(f"- 게임 수: {summary['games']}개 (작업 {summary['tasks']}개, 실패 {summary['failed']}개)")
+    print(f"- 수집 행 수: {summary['rows']}개 / 요청 페이지 수: {summary['pages']}개")
+    print(f"- 소요 시간: {summary['elapsed_seconds']}초 "
+          f"({summary['rows_per_second']}행/초, {summary['pages_per_second']}페이지/초)")
+    for failure in summary['failures']:
+        print(f"- 실패: {failure['app_id']} {failure['kind']} - {failure['error']}")
+    for anomaly in summary['anomalies']:
+        label = '리뷰 수' if anomaly['metric'] == 'count' else '긍정 비율'
+        provisional = ' (잠정)' if anomaly['provisional'] else ''
+        print(f"- 이상 징후{provisional}: {anomaly['app_id']} {anomaly['date']} {anomaly['language']} {label} "
+              f"{anomaly['value']:.3g} (예상 {anomaly['expected']:.3g}, z={anomaly['z']:+.1f}, {anomaly['rule']})")
+
+
+def print_metrics(overview):
+    """요청 상태/재시도/지연과 단계별 누적 시간 요약 출력"""
+    print("\n=== 요청/처리 지표 ===")
+    status = ', '.join(f"{code}: {count}" for code, count in sorted(overview['status'].items())) or '없음'
+    print(f"- 네트워크 요청: {overview['requests']}개 ({status}), 받은 크기 {overview['bytes'] / 1024 / 1024:.1f}MB")
+    if overview['retries']:
+        print(f"- 재시도: {', '.join(f'{reason}: {count}' for reason, count in sorted(overview['retries'].items()))}")
+    if overview['errors']:
+        print(f"- 요청 오류: {', '.join(f'{error}: {count}' for error, count in sorted(overview['errors'].items()))}")
+    if overview['cache']:
+        print(f"- 캐시: {', '.join(f'{result}: {count}' for result, count in sorted(overview['cache'].items()))}")
+    if overview['latency']:
+        latency = overview['latency']
+        print(f"- 요청 지연: 평균 {latency['mean']:.3f}초, p50 {latency['p50']:.3f}초, p95 {latency['p95']:.3f}초")
+    for stage in sorted(overview['stages'], key=lambda stage: stage['seconds'], reverse=True):
+        print(f"- {stage['stage']}: {stage['seconds']:.2f}초 ({stage['count']}회)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="여러 Steam 게임의 리뷰/토론을 로컬 데이터셋으로 수집")
+    parser.add_argument('app_ids', nargs='*', help="수집할 Steam 게임 ID")
+    parser.add_argument('--file', help="게임 ID 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--dataset', default='data/dataset', help="데이터셋 저장 경로")
+    parser.add_argument('--no-reviews', action='store_true', help="리뷰는 수집하지 않음")
+    parser.add_argument('--no-discussions', action='store_true', help="토론은 수집하지 않음")
+    parser.add_argument('--review-pages', type=int, default=50, help="게임당 최대 리뷰 페이지 수 (페이지당 100개)")
+    parser.add_argument('--discussion-pages', type=int, default=5, help="게임당 토론 목록 페이지 수")
+    parser.add_argument('--discussion-concurrency', type=int, default=1,
+                        help="게임 하나 안에서 토론 상세 페이지를 동시에 가져올 개수")
+    parser.add_argument('--workers', type=int, default=8, help="동시에 수집할 작업(게임×종류) 수")
+    parser.add_argument('--rps', type=float, default=2.0, help="호스트별 전체 초당 요청 수")
+    parser.add_argument('--burst', type=int, default=2, help="호스트별로 한 번에 몰아 보낼 수 있는 요청 수")
+    parser.add_argument('--search-index', default='data/search/index.sqlite',
+                        help="수집한 텍스트를 넣을 전문 검색 색인 경로")
+    parser.add_argument('--no-index', action='store_true', help="전문 검색 색인을 갱신하지 않음")
+    parser.add_argument('--no-sentiment', action='store_true', help="텍스트 감성 점수를 계산하지 않음")
+    parser.add_argument('--restart', action='store_true', help="저장된 체크포인트를 무시하고 처음부터 수집")
+    parser.add_argument('--summary-file', help="수집 요약을 JSON으로 저장할 경로")
+    parser.add_argument('--metrics-file',
+                        help="요청/파싱/변환 지표를 저장할 경로 (.json이면 JSON, 그 밖에는 Prometheus 텍스트 형식)")
+    parser.add_argument('--quiet', action='store_true', help="게임별 상세 진행 로그를 출력하지 않음")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app_ids = read_app_ids(args)
+    if not app_ids:
+        print("수집할 게임 ID가 없습니다.", file=sys.stderr)
+        return 2
+
+    rate_limiter = HostRateLimiter(requests_per_second=args.rps, burst=args.burst)
+    dataset = SteamDatasetStore(args.dataset)
+    review_store = ReviewStore(dataset=dataset)
+    # 체크포인트는 데이터셋마다 따로 (워터마크와 같은 위치)
+    journal = CrawlJournal(os.path.join(args.dataset, 'crawl_journal.sqlite'))
+    search_index = None if args.no_index else TextSearchIndex(args.search_index)
+    # 모든 게임이 하나의 채점기(프로세스 풀, 점수 캐시)를 함께 사용
+    scorer = None if args.no_sentiment else SentimentScorer()
+
+    tasks = []
+    for app_id in app_ids:
+        if not args.no_reviews:
+            tasks.append(('reviews', app_id, lambda app_id=app_id: crawl_reviews(
+                app_id, args, review_store, rate_limiter, journal, search_index, scorer)))
+        if not args.no_discussions:
+            tasks.append(('discussions', app_id, lambda app_id=app_id: crawl_discussions(
+                app_id, args, dataset, rate_limiter, journal, search_index, scorer)))
+
+    print(f"{len(app_ids)}개 게임, 작업 {len(tasks)}개 수집 시작 (동시 작업 {args.workers}개, 호스트별 {args.rps}회/초)",
+          file=sys.stderr)
+    started = time.perf_counter()
+    results = []
+
+    # --quiet이면 스크래퍼의 상세 로그를 버리고 작업 단위 진행 상황만 stderr로 출력
+    log_target = open(os.devnull, 'w') if args.quiet else contextlib.nullcontext()
+    with log_target as devnull, contextlib.redirect_stdout(devnull or sys.stdout):
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(run_task, kind, app_id, crawl) for kind, app_id, crawl in tasks]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results.append(result)
+                status = f"실패 ({result['error']})" if result['error'] else f"{result['rows']}개"
+                print(f"[{done}/{len(tasks)}] {result['app_id']} {result['kind']}: {status}, {result['seconds']}초",
+                      file=sys.stderr)
+    if scorer is not None:
+        scorer.close()
+
+    summary = summarize(results, time.perf_counter() - started)
+    metrics = get_default_metrics()
+    overview = metrics.overview()
+    print_summary(summary)
+    print_metrics(overview)
+    if args.summary_file:
+        with open(args.summary_file, 'w', encoding='utf-8') as f:
+            json.dump({'finished_at': datetime.now().isoformat(timespec='seconds'), **summary, 'results': results,
+                       'metrics': overview},
+                      f, ensure_ascii=False, indent=2)
+    if args.metrics_file:
+        metrics.write(args.metrics_file)
+
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CrawlJournal:
+    """수집 위치(리뷰 커서, 토론 목록 페이지)를 페이지마다 기록하는 SQLite 저널
+
+    체크포인트는 (종류, app_id, 수집 조건)으로 구분하므로, 같은 조건으로 다시 실행한
+    수집은 중간에 죽었던 위치에서 이어서 시작한다. 수집이 끝까지 가면 체크포인트를 지운다.
+    """
+
+    def __init__(self, path='data/cache/crawl_journal.sqlite'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "key TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(kind, app_id, params=None):
+        """체크포인트 키 (수집 조건 dict는 키 순서와 무관하게 같은 문자열이 됨)"""
+        return json.dumps([kind, str(app_id), params or {}], sort_keys=True, default=str, ensure_ascii=False)
+
+    def load(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM checkpoints WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key, state):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)",
+                               (key, json.dumps(state, default=str), time.time()))
+            self._conn.commit()
+
+    def clear(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def checkpoint(self, kind, app_id, params=None):
+        """수집 하나에 쓸 체크포인트 (이전 실행이 남긴 상태가 있으면 state에 담김)"""
+        return CrawlCheckpoint(self, self.make_key(kind, app_id, params))
+
+
+class CrawlCheckpoint:
+    """저널의 체크포인트 하나 (state가 None이면 처음부터 수집)"""
+
+    def __init__(self, journal, key):
+        self.journal = journal
+        self.key = key
+        self.state = journal.load(key)
+
+    def save(self, state):
+        self.state = state
+        self.journal.save(self.key, state)
+
+    def clear(self):
+        self.state = None
+        self.journal.clear(self.key)
+
+
+_default_journal = None
+_default_journal_lock = threading.Lock()
+
+
+def get_default_journal():
+    """프로세스 전체에서 함께 쓰는 기본 수집 저널 반환"""
+    global _default_journal
+    with _default_journal_lock:
+        if _default_journal is None:
+            _default_journal = CrawlJournal()
+        return _default_journal
@@ -0,0 +1,202 @@
+import os
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .schema import normalize_discussions
+
+# 테이블별 중복 제거 기준 키 (댓글 순번은 새 댓글이 달리면 밀리므로 키로 쓰지 않음)
+TABLE_KEYS = {
+    'reviews': ['review_id'],
+    'discussions': ['discussion_id'],
+    'comments': ['discussion_id', 'comment_id'],
+    'media': ['discussion_id', 'url']
+}
+
+# 같은 키의 행이 여러 번 저장됐을 때 이 컬럼 순으로 가장 나중 것을 남김 (date는 파티션 날짜,
+# 수집 시각이 없는 예전 행은 가장 먼저 수집된 것으로 봄)
+RECENCY_COLUMNS = ['date', 'collected_at']
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('app_id', pa.string()), ('date', pa.string())]),
+    flavor='hive'
+)
+
+
+def row_keys(table, df):
+    """중복 판단용 키 컬럼 DataFrame (댓글 ID를 읽지 못한 댓글은 순번으로 대신 구분)"""
+    keys = pd.DataFrame({column: df[column].astype(object) for column in TABLE_KEYS[table]}, index=df.index)
+    if table == 'comments':
+        comment_ids = keys['comment_id'].fillna('').astype(str)
+        missing = comment_ids == ''
+        keys['comment_id'] = comment_ids.where(~missing, '#' + df['comment_index'].astype(str))
+    return keys
+
+
+def drop_duplicate_rows(table, df):
+    """TABLE_KEYS 기준 중복 행 중 가장 나중에 수집된 것만 남김 (행 순서는 유지)"""
+    keys = TABLE_KEYS.get(table)
+    if not keys or df.empty or not set(keys) <= set(df.columns):
+        return df
+    recency = [column for column in RECENCY_COLUMNS if column in df.columns]
+    ordered = df.sort_values(recency, kind='stable', na_position='first') if recency else df
+    key_columns = row_keys(table, ordered)
+    if 'app_id' in ordered.columns:
+        key_columns['app_id'] = ordered['app_id'].astype(str)
+    kept = ordered.index[~key_columns.duplicated(keep='last').to_numpy()]
+    return df[df.index.isin(kept)]
+
+
+class SteamDatasetStore:
+    """app_id와 날짜로 파티션된 Parquet 데이터셋 저장소
+
+    디렉토리 구조: {root}/{table}/app_id=.../date=YYYY-MM-DD/part-*.parquet
+
+    추가는 항상 새 파일로 하므로 같은 리뷰/게시글이 여러 번 저장될 수 있다(토론은 수집일
+    파티션이라 다른 날 다시 수집한 게시글은 다른 파티션에 들어감). load()가 TABLE_KEYS로
+    중복을 걸러 가장 나중에 수집된 행만 돌려준다.
+    """
+
+    def __init__(self, root='data/dataset'):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _table_path(self, table):
+        return os.path.join(self.root, table)
+
+    def append(self, table, df, app_id, dates):
+        """행마다 파티션 날짜(dates)를 붙여 새 파일로 추가 (기존 파일은 건드리지 않음)"""
+        if df.empty:
+            return 0
+        df = df.copy()
+        df['app_id'] = str(app_id)
+        df['date'] = pd.Series(dates, index=df.index).astype(str)
+
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            self._table_path(table),
+            format='parquet',
+            partitioning=PARTITIONING,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        return len(df)
+
+    def append_reviews(self, app_id, reviews_df, collected_at=None):
+        """리뷰를 작성일 기준 파티션으로 추가
+
+        같은 리뷰가 여러 번 저장돼도 load/compact가 가장 나중에 받은 행을 고를 수 있도록
+        수집 시각(collected_at)을 함께 기록한다.
+        """
+        if reviews_df.empty:
+            return 0
+        reviews_df = reviews_df.assign(collected_at=pd.Timestamp(collected_at or datetime.now()))
+        reviews_df['collected_at'] = reviews_df['collected_at'].astype('datetime64[us]')
+        return self.append('reviews', reviews_df, app_id, reviews_df['timestamp'].dt.strftime('%Y-%m-%d'))
+
+    def append_discussions(self, app_id, discussions_df, collected_at=None):
+        """토론 DataFrame을 정규화해 토론/댓글/미디어 테이블에 수집일 기준 파티션으로 추가"""
+        collected_at = collected_at or datetime.now()
+        return self.append_discussion_tables(app_id, normalize_discussions(discussions_df, collected_at),
+                                             collected_at)
+
+    def append_discussion_tables(self, app_id, tables, collected_at=None):
+        """이미 평면화된 토론/댓글/미디어 테이블을 수집일 기준 파티션으로 추가"""
+        date = (collected_at or datetime.now()).strftime('%Y-%m-%d')
+        return {
+            table: self.append(table, df, app_id, [date] * len(df))
+            for table, df in tables.items()
+        }
+
+    def _dataset(self, table):
+        path = self._table_path(table)
+        if not os.path.exists(path):
+            return None
+        dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+        # 나중에 추가된 컬럼(감성 점수 등)이 있으면 파일마다 스키마가 달라지는데, 기본값인
+        # 첫 파일 스키마만 쓰면 그 컬럼이 빠지므로 모든 파일의 스키마를 합쳐서 읽음
+        schemas = {fragment.physical_schema for fragment in dataset.get_fragments()}
+        if len(schemas) <= 1:
+            return dataset
+        schema = pa.unify_schemas([*schemas, PARTITIONING.schema])
+        return ds.dataset(path, format='parquet', partitioning=PARTITIONING, schema=schema)
+
+    def load(self, table, app_ids=None, start_date=None, end_date=None, columns=None, filter=None):
+        """필요한 파티션과 컬럼만 읽어오기 (TABLE_KEYS 기준 중복은 가장 나중에 수집된 행만 남김)
+
+        app_ids/start_date/end_date는 파티션 디렉토리 단위로 걸러지고,
+        filter(pyarrow.dataset 표현식)는 Parquet 통계를 이용해 행 그룹 단위로 적용된다.
+        columns를 주면 중복 판단에 필요한 키/수집 시각 컬럼도 함께 읽은 뒤 돌려줄 때 뺀다.
+        """
+        dataset = self._dataset(table)
+        if dataset is None:
+            return pd.DataFrame(columns=columns)
+
+        expression = None
+        conditions = []
+        if app_ids is not None:
+            if isinstance(app_ids, (str, int)):
+                app_ids = [app_ids]
+            conditions.append(ds.field('app_id').isin([str(a) for a in app_ids]))
+        if start_date is not None:
+            conditions.append(ds.field('date') >= pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+        if end_date is not None:
+            conditions.append(ds.field('date') <= pd.Timestamp(end_date).strftime('%Y-%m-%d'))
+        if filter is not None:
+            conditions.append(filter)
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        read_columns = columns
+        if columns is not None and table in TABLE_KEYS:
+            extra = [column for column in ['app_id', *TABLE_KEYS[table], *RECENCY_COLUMNS]
+                     if column in dataset.schema.names]
+            if table == 'comments' and 'comment_index' in dataset.schema.names:
+                extra.append('comment_index')
+            read_columns = list(dict.fromkeys([*columns, *extra]))
+
+        df = drop_duplicate_rows(table, dataset.to_table(columns=read_columns, filter=expression).to_pandas())
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+    def compact(self, table, app_id=None):
+        """파티션마다 여러 조각 파일을 중복 제거 후 하나의 파일로 합치기"""
+        table_path = self._table_path(table)
+        if not os.path.exists(table_path):
+            return 0
+
+        tmp_dir = os.path.join(self.root, '.tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        compacted = 0
+        for app_dir in sorted(os.listdir(table_path)):
+            if app_id is not None and app_dir != f"app_id={app_id}":
+                continue
+            app_path = os.path.join(table_path, app_dir)
+            for date_dir in sorted(os.listdir(app_path)):
+                partition_path = os.path.join(app_path, date_dir)
+                files = [f for f in os.listdir(partition_path) if f.endswith('.parquet')]
+                if len(files) < 2:
+                    continue
+
+                # 수집 시각이 같거나 없는 행은 나중에 쓴 파일의 것이 남도록 수정 시각 순으로 읽음
+                files.sort(key=lambda f: os.path.getmtime(os.path.join(partition_path, f)))
+                df = drop_duplicate_rows(table, pd.concat(
+                    [pq.read_table(os.path.join(partition_path, f)).to_pandas() for f in files],
+                    ignore_index=True
+                ))
+
+                # 임시 파일은 테이블 디렉토리 밖에 써서 동시에 도는 스캔이 읽지 않게 하고, 합친 파일을
+                # 파티션에 옮겨 놓은 뒤에야 기존 조각을 지움 (그 사이에 죽어도 중복만 남고 load가 거름)
+                tmp_path = os.path.join(tmp_dir, f"compact-{uuid.uuid4().hex}.parquet")
+                pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+                os.replace(tmp_path, os.path.join(partition_path, f"part-{uuid.uuid4().hex}-0.parquet"))
+                for f in files:
+                    os.remove(os.path.join(partition_path, f))
+                compacted += 1
+
+        return compacted
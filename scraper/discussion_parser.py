@@ -0,0 +1,367 @@
+import re
+import time
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    HTML_PARSER = 'lxml'
+except ImportError:
+    lxml = None
+    HTML_PARSER = 'html.parser'
+
+IMAGE_EXTENSIONS = ('.gif', '.png', '.jpg', '.jpeg')
+
+# 페이지 전체 대신 필요한 하위 트리만 파싱
+# (SoupStrainer는 여러 클래스가 붙은 class 속성을 문자열 그대로 비교하므로 정규식으로 매칭)
+TOPIC_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)forum_topic(\s|$)'))
+THREAD_STRAINER = SoupStrainer(['div', 'span'],
+                               class_=re.compile(r'(^|\s)(forum_op|commentthread_comment|commentthread_pagelinks)(\s|$)'))
+
+COMMENT_ID_PREFIX = 'comment_'
+
+
+def empty_thread_details():
+    return {'content': "", 'media': {'image_count': 0, 'video_count': 0, 'media_links': []}, 'comments': [],
+            'comment_pages': 1}
+
+
+def _comment_id(element_id):
+    """댓글 div의 id(comment_<숫자>)에서 댓글 ID 추출"""
+    if element_id and element_id.startswith(COMMENT_ID_PREFIX):
+        return element_id[len(COMMENT_ID_PREFIX):]
+    return ""
+
+
+def _max_page_number(texts):
+    """댓글 페이지 링크 텍스트 중 가장 큰 숫자 (링크가 없으면 1)"""
+    numbers = [int(text.strip()) for text in texts if text.strip().isdigit()]
+    return max(numbers, default=1)
+
+
+def merge_comment_pages(pages):
+    """페이지별 댓글 목록을 순서대로 합치고 댓글 ID로 중복 제거
+
+    댓글 페이지를 받는 사이에 새 댓글이 달리면 앞 페이지의 마지막 댓글이
+    다음 페이지에도 나타날 수 있으므로, 먼저 나온 것만 남긴다.
+    """
+    merged = []
+    seen = set()
+    for comments in pages:
+        for comment in comments:
+            comment_id = comment.get('comment_id')
+            if comment_id:
+                if comment_id in seen:
+                    continue
+                seen.add(comment_id)
+            merged.append(comment)
+    return merged
+
+
+def make_topics_soup(html):
+    """토론 목록 페이지에서 forum_topic 영역만 파싱"""
+    return BeautifulSoup(html, HTML_PARSER, parse_only=TOPIC_STRAINER)
+
+
+def extract_topics(soup):
+    """파싱된 목록 페이지 soup에서 토픽 정보 추출"""
+    discussions = []
+    topics = soup.find_all('div', class_='forum_topic')
+
+    for topic in topics:
+        try:
+            # 제목 찾기
+            title_div = topic.find('div', class_='forum_topic_name')
+            title = title_div.text.strip() if title_div else ""
+
+            # URL 찾기
+            link = topic.find('a', class_='forum_topic_overlay')
+            url = link.get('href', '') if link else ""
+
+            # 댓글 수 찾기
+            reply_count = 0
+            reply_div = topic.find('div', class_='forum_topic_reply_count')
+            if reply_div:
+                reply_text = reply_div.text.strip()
+                numbers = re.findall(r'\d+', reply_text)
+                if numbers:
+                    reply_count = int(numbers[0])
+
+            # 작성자 찾기
+            author_div = topic.find('div', class_='forum_topic_op')
+            author = author_div.text.strip() if author_div else ""
+
+            # 날짜 찾기
+            date = ""
+            lastpost_div = topic.find('div', class_='forum_topic_lastpost')
+            if lastpost_div:
+                date = lastpost_div.get('title', '')
+
+            discussions.append({
+                'title': title,
+                'url': url,
+                'reply_count': reply_count,
+                'author': author,
+                'date': date,
+                'content': '',  # 본문은 나중에 채워질 예정
+                'comments': []  # 댓글은 나중에 채워질 예정
+            })
+
+        except Exception as e:
+            print(f"토픽 파싱 중 오류 발생: {e}")
+            continue
+
+    return discussions
+
+
+def parse_topics_html(html):
+    """토론 목록 페이지 HTML에서 토픽 정보 추출 (lxml이 있으면 lxml로 직접 파싱)"""
+    if lxml is None:
+        return extract_topics(make_topics_soup(html))
+
+    discussions = []
+    root = lxml.html.fromstring(html)
+    for topic in root.xpath(_has_class('div', 'forum_topic', descendant=False)):
+        try:
+            title_div = _first(topic, 'div', 'forum_topic_name')
+            title = _text(title_div).strip() if title_div is not None else ""
+
+            link = _first(topic, 'a', 'forum_topic_overlay')
+            url = link.get('href', '') if link is not None else ""
+
+            reply_count = 0
+            reply_div = _first(topic, 'div', 'forum_topic_reply_count')
+            if reply_div is not None:
+                numbers = re.findall(r'\d+', _text(reply_div).strip())
+                if numbers:
+                    reply_count = int(numbers[0])
+
+            author_div = _first(topic, 'div', 'forum_topic_op')
+            author = _text(author_div).strip() if author_div is not None else ""
+
+            lastpost_div = _first(topic, 'div', 'forum_topic_lastpost')
+            date = lastpost_div.get('title', '') if lastpost_div is not None else ""
+
+            discussions.append({
+                'title': title,
+                'url': url,
+                'reply_count': reply_count,
+                'author': author,
+                'date': date,
+                'content': '',
+                'comments': []
+            })
+        except Exception as e:
+            print(f"토픽 파싱 중 오류 발생: {e}")
+            continue
+
+    return discussions
+
+
+def parse_thread_html(html):
+    """토론 게시글 HTML에서 본문, 미디어, 댓글 추출
+
+    네트워크 스레드와 분리된 프로세스에서도 실행할 수 있도록 문자열을
+    받아 평범한 dict만 반환한다.
+    """
+    if lxml is None:
+        return extract_thread_details(BeautifulSoup(html, HTML_PARSER, parse_only=THREAD_STRAINER))
+    return _lxml_thread_details(lxml.html.fromstring(html))
+
+
+def parse_thread_html_timed(html):
+    """프로세스 풀 작업 단위: parse_thread_html 결과와 파싱에 걸린 시간(초)
+
+    부모 프로세스에서 재면 풀 대기 시간까지 섞이므로 워커 안에서 잰 값을 함께 돌려준다.
+    워커가 무거운 수집 모듈(pandas 등)을 불러오지 않도록 파서 모듈에 둔다.
+    """
+    started = time.perf_counter()
+    return parse_thread_html(html), time.perf_counter() - started
+
+
+def extract_thread_details(soup):
+    """파싱된 게시글 soup에서 본문, 미디어, 댓글 추출"""
+    # 본문 내용 찾기
+    content = ""
+    media_info = {
+        'image_count': 0,
+        'video_count': 0,
+        'media_links': []
+    }
+
+    forum_op = soup.find('div', class_='forum_op')
+    if forum_op:
+        # 텍스트 내용
+        content_div = forum_op.find('div', class_='content')
+        if content_div:
+            content = content_div.get_text(strip=True)
+
+        # 이미지 수 카운트
+        images = forum_op.find_all('img')
+        media_info['image_count'] = len([img for img in images 
+                                       if img.get('src', '').endswith(('.gif', '.png', '.jpg', '.jpeg'))])
+
+        # 동영상 수 카운트
+        videos = forum_op.find_all(['video', 'iframe'])
+        media_info['video_count'] = len(videos)
+
+        # 미디어 링크 수집
+        for media in images + videos:
+            src = media.get('src', '')
+            if src:
+                media_type = 'video' if media.name in ['video', 'iframe'] else 'image'
+                media_info['media_links'].append({
+                    'type': media_type,
+                    'url': src
+                })
+
+    # 댓글 찾기
+    comments = []
+    comment_divs = soup.find_all('div', class_='commentthread_comment responsive_body_text')
+
+    for comment in comment_divs:
+        try:
+            author_div = comment.find('div', class_='commentthread_comment_author')
+            author = author_div.find('a', class_='commentthread_author_link').text.strip() if author_div else "Unknown"
+
+            content_div = comment.find('div', class_='commentthread_comment_text')
+            comment_content = content_div.get_text(strip=True) if content_div else ""
+
+            date_div = comment.find('span', class_='commentthread_comment_timestamp')
+            date = date_div.text.strip() if date_div else ""
+
+            # 댓글의 미디어 수 카운트
+            comment_media = {
+                'image_count': 0,
+                'video_count': 0,
+                'media_links': []
+            }
+
+            if content_div:
+                comment_images = content_div.find_all('img')
+                comment_videos = content_div.find_all(['video', 'iframe'])
+
+                comment_media['image_count'] = len([img for img in comment_images 
+                                                  if img.get('src', '').endswith(('.gif', '.png', '.jpg', '.jpeg'))])
+                comment_media['video_count'] = len(comment_videos)
+
+                # 미디어 링크 수집
+                for media in comment_images + comment_videos:
+                    src = media.get('src', '')
+                    if src:
+                        media_type = 'video' if media.name in ['video', 'iframe'] else 'image'
+                        comment_media['media_links'].append({
+                            'type': media_type,
+                            'url': src
+                        })
+
+            comments.append({
+                'comment_id': _comment_id(comment.get('id')),
+                'author': author,
+                'content': comment_content,
+                'date': date,
+                'media': comment_media
+            })
+
+        except Exception as e:
+            print(f"댓글 파싱 중 오류: {e}")
+            continue
+
+    # 댓글 페이지 수 (위/아래 페이지 링크 중 가장 큰 번호)
+    page_links = soup.find_all('span', class_='commentthread_pagelinks')
+    comment_pages = _max_page_number([link.get_text() for span in page_links
+                                      for link in span.find_all(['a', 'span'])])
+
+    return {
+        'content': content,
+        'media': media_info,
+        'comments': comments,
+        'comment_pages': comment_pages
+    }
+
+
+# ---- lxml 전용 빠른 경로 (BeautifulSoup 경로와 같은 결과를 반환) ----
+
+def _has_class(tag, class_name, descendant=True):
+    """BeautifulSoup의 class_ 매칭과 같은 의미의 XPath"""
+    prefix = './/' if descendant else '//'
+    return f"{prefix}{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def _first(element, tag, class_name):
+    found = element.xpath(_has_class(tag, class_name))
+    return found[0] if found else None
+
+
+def _text(element, strip=False):
+    """BeautifulSoup get_text()와 같은 방식으로 하위 텍스트 결합"""
+    texts = element.xpath('.//text()')
+    if strip:
+        return ''.join(text.strip() for text in texts if text.strip())
+    return ''.join(texts)
+
+
+def _collect_media(element):
+    images = element.xpath('.//img')
+    videos = element.xpath('.//video | .//iframe')
+    media_info = {
+        'image_count': len([img for img in images if img.get('src', '').endswith(IMAGE_EXTENSIONS)]),
+        'video_count': len(videos),
+        'media_links': []
+    }
+    for media in images + videos:
+        src = media.get('src', '')
+        if src:
+            media_type = 'video' if media.tag in ['video', 'iframe'] else 'image'
+            media_info['media_links'].append({'type': media_type, 'url': src})
+    return media_info
+
+
+def _lxml_thread_details(root):
+    content = ""
+    media_info = {'image_count': 0, 'video_count': 0, 'media_links': []}
+
+    forum_op = _first(root, 'div', 'forum_op')
+    if forum_op is not None:
+        content_div = _first(forum_op, 'div', 'content')
+        if content_div is not None:
+            content = _text(content_div, strip=True)
+        media_info = _collect_media(forum_op)
+
+    comments = []
+    comment_divs = root.xpath(".//div[normalize-space(@class)='commentthread_comment responsive_body_text']")
+    for comment in comment_divs:
+        try:
+            author_div = _first(comment, 'div', 'commentthread_comment_author')
+            author = _text(_first(author_div, 'a', 'commentthread_author_link')).strip() if author_div is not None else "Unknown"
+
+            content_div = _first(comment, 'div', 'commentthread_comment_text')
+            comment_content = _text(content_div, strip=True) if content_div is not None else ""
+
+            date_div = _first(comment, 'span', 'commentthread_comment_timestamp')
+            date = _text(date_div).strip() if date_div is not None else ""
+
+            if content_div is not None:
+                comment_media = _collect_media(content_div)
+            else:
+                comment_media = {'image_count': 0, 'video_count': 0, 'media_links': []}
+
+            comments.append({
+                'comment_id': _comment_id(comment.get('id')),
+                'author': author,
+                'content': comment_content,
+                'date': date,
+                'media': comment_media
+            })
+        except Exception as e:
+            print(f"댓글 파싱 중 오류: {e}")
+            continue
+
+    page_links = root.xpath(_has_class('span', 'commentthread_pagelinks') + '/*')
+    comment_pages = _max_page_number([_text(link) for link in page_links])
+
+    return {
+        'content': content,
+        'media': media_info,
+        'comments': comments,
+        'comment_pages': comment_pages
+    }
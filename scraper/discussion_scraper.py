@@ -1,22 +1,65 @@
 import os
-import re
-import requests
-from bs4 import BeautifulSoup
+import threading
 import pandas as pd
+import pyarrow.compute as pc
 from datetime import datetime
-import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
-from collections import Counter
-import re
-from langdetect import detect
-from textblob import TextBlob
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from collections import Counter, deque
+from .discussion_parser import (empty_thread_details, extract_topics, make_topics_soup, merge_comment_pages,
+                                parse_thread_html, parse_thread_html_timed, parse_topics_html)
+from .http_client import get_default_client
+from .language_detect import get_default_detector
+from .metrics import get_default_metrics, timed
+from .process_pool import MP_CONTEXT, get_default_process_pool
+from .rate_limiter import get_default_rate_limiter
+from .schema import normalize_discussions
+from .thread_store import get_default_thread_store
+from .tokenizers import get_tokenizer
 
 # .env 파일 로드
 load_dotenv()
 
+# 디스크 캐시 유효 시간(초): 목록은 자주 바뀌고 게시글 본문은 덜 바뀜
+LIST_PAGE_CACHE_TTL = 10 * 60
+THREAD_PAGE_CACHE_TTL = 60 * 60
+
+# 순차 수집 모드에서 게시글 하나의 나머지 댓글 페이지를 동시에 가져올 최대 개수
+COMMENT_PAGE_WORKERS = 8
+
+# 키워드 집계 시 한 번에 토큰화할 게시글 수
+KEYWORD_CHUNK_SIZE = 10000
+
+def comment_page_url(url, page):
+    """게시글 URL에 댓글 페이지 번호(ctp)를 붙인 URL"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query['ctp'] = str(page)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
 class SteamDiscussionScraper:
-    def __init__(self, app_id):
+    def __init__(self, app_id, rate_limiter=None, client=None, language_detector=None, thread_store=None,
+                 sentiment_scorer=None, metrics=None, tokenizer=None):
         self.app_id = app_id
+        self.client = client or get_default_client()
+        # 파싱·변환 시간과 페이지/게시글 수를 기록할 지표 저장소 (요청 지표는 클라이언트가 기록)
+        self.metrics = metrics or get_default_metrics()
+        self.language_detector = language_detector or get_default_detector()
+        # 목록 지문이 그대로인 게시글은 상세 페이지를 다시 받지 않고 저장된 내용을 재사용
+        self.thread_store = thread_store or get_default_thread_store()
+        # 지정하면 iter_discussion_tables가 토론/댓글 테이블에 감성 점수 컬럼을 채움
+        self.sentiment_scorer = sentiment_scorer
+        # 키워드 분석에 쓸 토크나이저 (이름 'whitespace'/'cjk'/'morph' 또는 tokenize()를 가진 객체)
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.last_crawl_stats = {}
+        # 상세/댓글 페이지 요청용 스레드 풀과 (parse_workers를 지정했을 때의) 파싱 프로세스 풀: (크기, 풀)
+        self._fetch_pool = None
+        self._parse_pool = None
+        self._pool_lock = threading.Lock()
+        # 실제 네트워크 요청에만 적용되는 호스트별 요청 속도 제한 (캐시 적중 시에는 대기하지 않음,
+        # 주지 않으면 프로세스 전체의 기본 제한기를 다른 스크래퍼와 함께 씀)
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
         self.api_key = os.getenv('STEAM_API_KEY')
         self.base_url = f"https://steamcommunity.com/app/{app_id}/discussions/"
         self.headers = {
@@ -27,239 +70,380 @@ class SteamDiscussionScraper:
     def get_discussion_page(self, page=1):
         try:
             url = f"{self.base_url}?l=korean&fp={page}"
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url, headers=self.headers, cache_ttl=LIST_PAGE_CACHE_TTL,
+                                       rate_limiter=self.rate_limiter)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            return make_topics_soup(response.text)
         except Exception as e:
             print(f"페이지 요청 중 오류: {e}")
             return None
 
     def parse_discussion_topics(self, soup):
-        discussions = []
         if not soup:
-            return discussions
-
-        topics = soup.find_all('div', class_='forum_topic')
-        print(f"찾은 토픽 수: {len(topics)}")
+            return []
 
-        for topic in topics:
-            try:
-                # 제목 찾기
-                title_div = topic.find('div', class_='forum_topic_name')
-                title = title_div.text.strip() if title_div else ""
-
-                # URL 찾기
-                link = topic.find('a', class_='forum_topic_overlay')
-                url = link.get('href', '') if link else ""
-
-                # 댓글 수 찾기
-                reply_count = 0
-                reply_div = topic.find('div', class_='forum_topic_reply_count')
-                if reply_div:
-                    reply_text = reply_div.text.strip()
-                    numbers = re.findall(r'\d+', reply_text)
-                    if numbers:
-                        reply_count = int(numbers[0])
-
-                # 작성자 찾기
-                author_div = topic.find('div', class_='forum_topic_op')
-                author = author_div.text.strip() if author_div else ""
-
-                # 날짜 찾기
-                date = ""
-                lastpost_div = topic.find('div', class_='forum_topic_lastpost')
-                if lastpost_div:
-                    date = lastpost_div.get('title', '')
-
-                discussions.append({
-                    'title': title,
-                    'url': url,
-                    'reply_count': reply_count,
-                    'author': author,
-                    'date': date,
-                    'content': '',  # 본문은 나중에 채워질 예정
-                    'comments': []  # 댓글은 나중에 채워질 예정
-                })
+        discussions = extract_topics(soup)
+        print(f"찾은 토픽 수: {len(discussions)}")
+        return discussions
 
-            except Exception as e:
-                print(f"토픽 파싱 중 오류 발생: {e}")
-                continue
+    def fetch_discussion_topics(self, page=1):
+        """토론 목록 페이지를 받아 토픽 목록으로 변환 (빠른 파싱 경로 사용, 요청 실패 시 예외)"""
+        url = f"{self.base_url}?l=korean&fp={page}"
+        response = self.client.get(url, headers=self.headers, cache_ttl=LIST_PAGE_CACHE_TTL,
+                                   rate_limiter=self.rate_limiter)
+        response.raise_for_status()
 
+        with self.metrics.timer('steam_parse_seconds', kind='topics_html'):
+            discussions = parse_topics_html(response.text)
+        self.metrics.inc('steam_pages_total', kind='discussion_list')
+        print(f"찾은 토픽 수: {len(discussions)}")
         return discussions
 
+    def get_discussion_topics(self, page=1):
+        """fetch_discussion_topics와 같지만 요청이 실패하면 빈 목록 반환"""
+        try:
+            return self.fetch_discussion_topics(page)
+        except Exception as e:
+            print(f"페이지 요청 중 오류: {e}")
+            return []
+
+    def _list_page_topics(self, page):
+        """수집 중 목록 페이지 요청 (실패하면 오류를 통계에 남기고 None 반환 → 수집을 멈춤)"""
+        try:
+            return self.fetch_discussion_topics(page)
+        except Exception as e:
+            print(f"페이지 {page} 요청 중 오류로 수집을 멈춤: {e}")
+            self.last_crawl_stats['error'] = str(e)
+            return None
+
+    def fetch_discussion_html(self, url):
+        """토론 게시글 HTML 가져오기 (파싱은 하지 않음)"""
+        response = self.client.get(url, headers=self.headers, cache_ttl=THREAD_PAGE_CACHE_TTL,
+                                   rate_limiter=self.rate_limiter)
+        response.raise_for_status()
+        return response.text
+
     def get_discussion_content(self, url):
         """토론 게시글의 본문 내용과 미디어 정보 가져오기"""
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 본문 내용 찾기
-            content = ""
-            media_info = {
-                'image_count': 0,
-                'video_count': 0,
-                'media_links': []
-            }
-            
-            forum_op = soup.find('div', class_='forum_op')
-            if forum_op:
-                # 텍스트 내용
-                content_div = forum_op.find('div', class_='content')
-                if content_div:
-                    content = content_div.get_text(strip=True)
-                
-                # 이미지 수 카운트
-                images = forum_op.find_all('img')
-                media_info['image_count'] = len([img for img in images 
-                                               if img.get('src', '').endswith(('.gif', '.png', '.jpg', '.jpeg'))])
-                
-                # 동영상 수 카운트
-                videos = forum_op.find_all(['video', 'iframe'])
-                media_info['video_count'] = len(videos)
-                
-                # 미디어 링크 수집
-                for media in images + videos:
-                    src = media.get('src', '')
-                    if src:
-                        media_type = 'video' if media.name in ['video', 'iframe'] else 'image'
-                        media_info['media_links'].append({
-                            'type': media_type,
-                            'url': src
-                        })
-            
-            # 댓글 찾기
-            comments = []
-            comment_divs = soup.find_all('div', class_='commentthread_comment responsive_body_text')
-            
-            for comment in comment_divs:
-                try:
-                    author_div = comment.find('div', class_='commentthread_comment_author')
-                    author = author_div.find('a', class_='commentthread_author_link').text.strip() if author_div else "Unknown"
-                    
-                    content_div = comment.find('div', class_='commentthread_comment_text')
-                    comment_content = content_div.get_text(strip=True) if content_div else ""
-                    
-                    date_div = comment.find('span', class_='commentthread_comment_timestamp')
-                    date = date_div.text.strip() if date_div else ""
-                    
-                    # 댓글의 미디어 수 카운트
-                    comment_media = {
-                        'image_count': 0,
-                        'video_count': 0,
-                        'media_links': []
-                    }
-                    
-                    if content_div:
-                        comment_images = content_div.find_all('img')
-                        comment_videos = content_div.find_all(['video', 'iframe'])
-                        
-                        comment_media['image_count'] = len([img for img in comment_images 
-                                                          if img.get('src', '').endswith(('.gif', '.png', '.jpg', '.jpeg'))])
-                        comment_media['video_count'] = len(comment_videos)
-                        
-                        # 미디어 링크 수집
-                        for media in comment_images + comment_videos:
-                            src = media.get('src', '')
-                            if src:
-                                media_type = 'video' if media.name in ['video', 'iframe'] else 'image'
-                                comment_media['media_links'].append({
-                                    'type': media_type,
-                                    'url': src
-                                })
-                    
-                    comments.append({
-                        'author': author,
-                        'content': comment_content,
-                        'date': date,
-                        'media': comment_media
-                    })
-                    
-                except Exception as e:
-                    print(f"댓글 파싱 중 오류: {e}")
-                    continue
-            
-            return {
-                'content': content,
-                'media': media_info,
-                'comments': comments
-            }
-            
+            return self.fetch_thread_details(url)
         except Exception as e:
             print(f"본문/댓글 조회 중 오류: {e}")
-            return {'content': "", 'media': {'image_count': 0, 'video_count': 0, 'media_links': []}, 'comments': []}
+            return empty_thread_details()
 
-    def analyze_keywords(self, df):
-        """기본 키워드 분석 함수"""
-        # 언어별 불용어 정의
-        stop_words = {
-            'en': set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-                      'is', 'are', 'was', 'were', 'will', 'be', 'has', 'have', 'had']),
-            'ko': set(['은', '는', '이', '가', '을', '를', '의', '에', '에서', '으로']),
-            'zh': set(['的', '了', '和', '是', '就', '都', '而', '及', '與', '或']),
-            'ru': set(['и', 'в', 'во', 'не', 'что', 'он', 'на', 'я', 'с', 'со'])
-        }
+    def _parse_thread_html(self, html):
+        with self.metrics.timer('steam_parse_seconds', kind='thread_html'):
+            return parse_thread_html(html)
 
-        keywords = []
-        language_stats = Counter()
+    def _fetch_executor(self, workers):
+        """상세/댓글 페이지 요청에 함께 쓰는 스레드 풀 (크기가 같으면 호출 사이에도 재사용)"""
+        with self._pool_lock:
+            if self._fetch_pool is None or self._fetch_pool[0] != workers:
+                if self._fetch_pool is not None:
+                    self._fetch_pool[1].shutdown(wait=False)
+                self._fetch_pool = (workers, ThreadPoolExecutor(max_workers=workers))
+            return self._fetch_pool[1]
 
-        for _, row in df.iterrows():
-            try:
-                # 제목과 본문 결합
-                text = f"{row['title']} {row['content']}"
-                if not text.strip():
-                    continue
+    def _parse_executor(self, parse_workers=None):
+        """파싱용 프로세스 풀 (parse_workers를 주지 않으면 프로세스 전체의 기본 풀을 함께 씀)"""
+        if parse_workers is None:
+            return get_default_process_pool()
+        with self._pool_lock:
+            if self._parse_pool is None or self._parse_pool[0] != parse_workers:
+                if self._parse_pool is not None:
+                    self._parse_pool[1].shutdown(wait=False)
+                self._parse_pool = (parse_workers,
+                                    ProcessPoolExecutor(max_workers=parse_workers, mp_context=MP_CONTEXT))
+            return self._parse_pool[1]
 
-                # 언어 감지
-                try:
-                    lang = detect(text)
-                except:
-                    lang = 'en'  # 기본값
-                language_stats[lang] += 1
-
-                # 단어 분리
-                words = text.lower().split()
-                
-                # 불용어 제거 및 길이 필터링
-                filtered_words = [w for w in words 
-                                if len(w) > 2 and w not in stop_words.get(lang, set())]
-                keywords.extend(filtered_words)
+    def close(self):
+        """이 스크래퍼가 만든 스레드/프로세스 풀 정리 (프로세스 전체의 기본 풀은 그대로 둠)"""
+        with self._pool_lock:
+            for pool in (self._fetch_pool, self._parse_pool):
+                if pool is not None:
+                    pool[1].shutdown()
+            self._fetch_pool = self._parse_pool = None
+
+    def _parse_in_pool(self, parser, html):
+        """프로세스 풀에서 게시글 HTML을 파싱하고 워커가 잰 파싱 시간을 기록"""
+        details, seconds = parser.submit(parse_thread_html_timed, html).result()
+        self.metrics.observe('steam_parse_seconds', seconds, kind='thread_html')
+        return details
 
+    def fetch_thread_details(self, url, parse=None):
+        """게시글 첫 페이지에서 댓글 페이지 수를 알아낸 뒤 나머지 댓글 페이지를 동시에 받아 합치기
+
+        parse는 HTML 문자열을 받아 parse_thread_html과 같은 dict를 돌려주는 함수다.
+        댓글 페이지 중 하나라도 실패하면 받은 댓글만 합치고 details['partial']을 True로 둔다.
+        """
+        parse = parse or self._parse_thread_html
+        return self._submit_thread(self._fetch_executor(COMMENT_PAGE_WORKERS), url, parse).result()
+
+    def _submit_thread(self, executor, url, parse):
+        """게시글 첫 페이지를 받은 뒤 나머지 댓글 페이지를 같은 스레드 풀에 나눠 넣고, 다 합치면 완료되는 future 반환
+
+        작업이 다른 작업을 기다리며 스레드를 붙잡지 않도록 완료 콜백으로 이어 붙이므로, 풀 하나로
+        게시글과 댓글 페이지 요청을 함께 처리해도 교착되지 않고 동시 요청 수도 풀 크기를 넘지 않는다.
+        """
+        done = Future()
+
+        def on_first_page(future):
+            try:
+                details = future.result()
+                pages = [executor.submit(self._fetch_comment_page, url, page, parse)
+                         for page in range(2, details.get('comment_pages', 1) + 1)]
             except Exception as e:
-                print(f"텍스트 처리 중 오류: {e}")
-                continue
+                done.set_exception(e)
+                return
+            if not pages:
+                done.set_result(details)
+                return
+            remaining = [len(pages)]
+            remaining_lock = threading.Lock()
+
+            def on_comment_page(_):
+                with remaining_lock:
+                    remaining[0] -= 1
+                    if remaining[0]:
+                        return
+                done.set_result(self._merge_comment_pages(details, [page.result() for page in pages]))
+
+            for page in pages:
+                page.add_done_callback(on_comment_page)
+
+        executor.submit(lambda: parse(self.fetch_discussion_html(url))).add_done_callback(on_first_page)
+        return done
+
+    @staticmethod
+    def _merge_comment_pages(details, pages):
+        """첫 페이지 댓글 뒤에 나머지 댓글 페이지를 합치고, 실패한 페이지(None)가 있으면 partial 표시"""
+        details['partial'] = any(comments is None for comments in pages)
+        details['comments'] = merge_comment_pages([details['comments']] +
+                                                  [comments for comments in pages if comments is not None])
+        return details
+
+    def _fetch_comment_page(self, url, page, parse):
+        """댓글 페이지 하나의 댓글 목록 (실패하면 None으로 알리고 나머지 페이지는 계속 사용)"""
+        try:
+            return parse(self.fetch_discussion_html(comment_page_url(url, page)))['comments']
+        except Exception as e:
+            print(f"댓글 {page}페이지 조회 중 오류: {e}")
+            return None
+
+    @timed('steam_analysis_seconds', function='analyze_keywords')
+    def analyze_keywords(self, df):
+        """기본 키워드 분석 함수"""
+        if df.empty:
+            return {'keywords': [], 'languages': {}}
+
+        # 제목과 본문 결합
+        texts = df['title'].astype(str) + ' ' + df['content'].astype(str)
+        texts = texts[texts.str.strip() != '']
+
+        # 언어 감지 (문자 체계로 바로 판단하고, 애매한 글만 통계 모델 사용)
+        languages = pd.Series(self.language_detector.detect_many(texts.tolist()), index=texts.index)
+        language_stats = Counter(languages)
 
         # 키워드 빈도 계산
-        keyword_freq = Counter(keywords).most_common(20)
+        keyword_freq = self._count_keywords(texts, languages).most_common(20)
         
         return {
             'keywords': keyword_freq,
             'languages': dict(language_stats)
         }
 
-    def scrape_discussions(self, max_pages=5):
-        all_discussions = []
-        
-        for page in range(1, max_pages + 1):
+    def _count_keywords(self, texts, languages, chunk_size=KEYWORD_CHUNK_SIZE):
+        """게시글을 청크 단위로 토큰화해 단어 빈도를 누적
+
+        토큰화와 불용어/짧은 단어 제거는 self.tokenizer가 맡고, 청크마다 단어별
+        개수만 Counter에 더하므로 메모리는 청크 크기에만 비례한다. 처음 등장한
+        순서가 유지되어 동률 순위도 글 순서를 따른다.
+        """
+        counter = Counter()
+        for start in range(0, len(texts), chunk_size):
+            tokens, _ = self.tokenizer.tokenize(texts.iloc[start:start + chunk_size],
+                                                languages.iloc[start:start + chunk_size])
+            counts = pc.value_counts(tokens)
+            counter.update(dict(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist())))
+
+        return counter
+
+    def scrape_discussions(self, max_pages=5, concurrency=1, parse_workers=None):
+        pages = list(self.iter_discussion_pages(max_pages, concurrency, parse_workers))
+        all_discussions = [discussion for page in pages for discussion in page.to_dict('records')]
+        print(f"현재까지 수집된 토론 수: {len(all_discussions)}")
+        return pd.DataFrame(all_discussions)
+
+    def iter_discussion_pages(self, max_pages=5, concurrency=1, parse_workers=None, checkpoint=None):
+        """목록 페이지 하나의 토론(본문/댓글 포함)이 모두 모이면 DataFrame으로 바로 반환
+
+        상세 페이지를 새로 받은 게시글 수, 저장된 내용을 재사용한 게시글 수, 일부 댓글
+        페이지를 받지 못한 게시글 수(threads_partial)는 self.last_crawl_stats에 남긴다. 목록 페이지 요청이 실패하면 그 자리에서 멈추고
+        오류를 last_crawl_stats['error']에 남긴다.
+
+        checkpoint(CrawlCheckpoint)를 주면 호출한 쪽이 페이지를 처리할 때마다 다음
+        목록 페이지 번호를 기록하고, 다시 실행하면 그 페이지부터 이어서 수집한다.
+        끝까지 수집하면 체크포인트를 지운다.
+        """
+        state = checkpoint.state if checkpoint is not None else None
+        start_page = state['page'] if state else 1
+        self.last_crawl_stats = {'threads_fetched': 0, 'threads_reused': 0, 'threads_failed': 0,
+                                 'threads_partial': 0, **(state['stats'] if state else {})}
+        self.last_crawl_stats.pop('error', None)
+        if state:
+            print(f"체크포인트에서 이어서 수집 ({start_page}페이지부터)")
+
+        if concurrency > 1:
+            pages = self._iter_pages_concurrent(start_page, max_pages, concurrency, parse_workers)
+        else:
+            pages = self._iter_pages_serial(start_page, max_pages)
+        for page, page_df in pages:
+            yield page_df
+            if checkpoint is not None:
+                checkpoint.save({'page': page + 1, 'stats': self.last_crawl_stats})
+
+        if checkpoint is not None and 'error' not in self.last_crawl_stats:
+            checkpoint.clear()
+
+    def _iter_pages_serial(self, start_page, max_pages):
+        """목록 페이지를 하나씩 받아 상세 페이지를 차례로 수집하고 (페이지 번호, DataFrame) 반환"""
+        for page in range(start_page, max_pages + 1):
             print(f"\n=== 페이지 {page} 스크래핑 시작 ===")
-            soup = self.get_discussion_page(page)
-            discussions = self.parse_discussion_topics(soup)
+            discussions = self._list_page_topics(page)
+            if discussions is None:
+                return
+            reused = self._reuse_unchanged(discussions)
+            fetched = []
+            partial = 0
             
-            # 각 토론의 본문과 댓글 가져오기
+            # 새로 생겼거나 바뀐 토론만 본문과 댓글 가져오기
             for discussion in discussions:
+                if discussion['url'] in reused:
+                    continue
                 try:
-                    details = self.get_discussion_content(discussion['url'])
-                    discussion['content'] = details['content']
-                    discussion['comments'] = details['comments']
+                    details = self.fetch_thread_details(discussion['url'])
+                    self._apply_details(discussion, details)
+                    if details.get('partial'):
+                        partial += 1
+                    else:
+                        fetched.append(discussion)
                     print(f"토론 '{discussion['title']}' 처리 완료")
-                    time.sleep(1)  # 요청 간격 조절
                 except Exception as e:
                     print(f"토론 상세 정보 가져오기 실패: {e}")
-                    discussion['content'] = ""
-                    discussion['comments'] = []
+                    self._apply_details(discussion, empty_thread_details())
+                    self.last_crawl_stats['threads_failed'] += 1
+                    self.metrics.inc('steam_threads_total', result='failed')
             
-            all_discussions.extend(discussions)
-            print(f"현재까지 수집된 토론 수: {len(all_discussions)}")
-            time.sleep(2)
+            self._remember_fetched(fetched, partial)
+            yield page, pd.DataFrame(discussions)
+
+    def _reuse_unchanged(self, discussions):
+        """목록 지문이 저장된 값과 같은 토론에 저장된 본문/댓글을 채우고 그 URL 집합을 반환"""
+        unchanged = self.thread_store.find_unchanged(discussions)
+        for discussion in discussions:
+            if discussion['url'] in unchanged:
+                self._apply_details(discussion, {**empty_thread_details(), **unchanged[discussion['url']]})
+        if unchanged:
+            print(f"변경 없는 토론 {len(unchanged)}개는 저장된 내용 재사용")
+        self.last_crawl_stats['threads_reused'] += len(unchanged)
+        self.metrics.inc('steam_threads_total', len(unchanged), result='reused')
+        return set(unchanged)
+
+    def _remember_fetched(self, fetched, partial=0):
+        """상세 페이지를 새로 받은 토론의 지문과 내용을 저장
+
+        실패했거나 댓글 페이지 일부를 받지 못한 토론은 저장하지 않아, 목록 지문이 그대로여도
+        다음 수집 때 다시 받는다 (잘린 댓글이 계속 재사용되지 않도록).
+        """
+        self.thread_store.save(fetched)
+        self.last_crawl_stats['threads_fetched'] += len(fetched) + partial
+        self.last_crawl_stats['threads_partial'] += partial
+        self.metrics.inc('steam_threads_total', len(fetched), result='fetched')
+        if partial:
+            self.metrics.inc('steam_threads_total', partial, result='partial')
+
+    def iter_discussion_tables(self, max_pages=5, concurrency=1, parse_workers=None, collected_at=None,
+                               checkpoint=None):
+        """iter_discussion_pages와 같지만 페이지마다 토론/댓글/미디어 평면 테이블(dict)로 반환"""
+        collected_at = collected_at or datetime.now()
+        for page_df in self.iter_discussion_pages(max_pages, concurrency, parse_workers, checkpoint):
+            with self.metrics.timer('steam_transform_seconds', step='discussion_tables'):
+                tables = normalize_discussions(page_df, collected_at)
+            if self.sentiment_scorer is not None:
+                tables = self.sentiment_scorer.score_discussion_tables(tables)
+            yield tables
+
+    def _apply_details(self, discussion, details):
+        discussion['content'] = details['content']
+        discussion['comments'] = details['comments']
+        discussion['media'] = details['media']
+        return discussion
+
+    def _collect_page(self, page_pending):
+        """한 목록 페이지에 속한 상세 요청 결과를 목록 순서대로 모으기 (재사용한 토론은 future가 None)"""
+        discussions = []
+        fetched = []
+        partial = 0
+        for discussion, fetch_future in page_pending:
+            if fetch_future is None:
+                discussions.append(discussion)
+                continue
+            try:
+                details = fetch_future.result()
+            except Exception as e:
+                print(f"토론 상세 정보 가져오기 실패: {e}")
+                details = None
+            if details:
+                print(f"토론 '{discussion['title']}' 처리 완료")
+                self._apply_details(discussion, details)
+                if details.get('partial'):
+                    partial += 1
+                else:
+                    fetched.append(discussion)
+            else:
+                self._apply_details(discussion, empty_thread_details())
+                self.last_crawl_stats['threads_failed'] += 1
+                self.metrics.inc('steam_threads_total', result='failed')
+            discussions.append(discussion)
+        self._remember_fetched(fetched, partial)
+        return pd.DataFrame(discussions)
+
+    @staticmethod
+    def _page_ready(page_pending):
+        return all(fetch_future is None or fetch_future.done() for _, fetch_future in page_pending)
+
+    def _iter_pages_concurrent(self, start_page, max_pages, concurrency, parse_workers=None):
+        """목록 페이지와 상세 페이지를 겹쳐서 수집하는 동시 수집 모드
+
+        상세 페이지와 댓글 페이지 HTML은 동시 요청 수(concurrency) 크기의 스레드 풀 하나에서 받고,
+        파싱은 프로세스 풀에서 처리해 파싱이 GIL을 두고 네트워크 스레드와 다투지 않게 한다.
+        두 풀 모두 호출 사이에 재사용한다 (parse_workers를 주지 않으면 프로세스 전체의 기본 풀).
+        결과는 목록 페이지 순서대로, 앞 페이지가 끝나는 즉시 내보낸다.
+        """
+        executor = self._fetch_executor(concurrency)
+        parser = self._parse_executor(parse_workers)
+        parse = lambda html: self._parse_in_pool(parser, html)
+
+        pending = deque()
+        for page in range(start_page, max_pages + 1):
+            print(f"\n=== 페이지 {page} 스크래핑 시작 ===")
+            # 목록 페이지를 받는 동안에도 이전 페이지의 상세 요청은 계속 진행됨
+            discussions = self._list_page_topics(page)
+            if discussions is None:
+                break
+            reused = self._reuse_unchanged(discussions)
+            pending.append((page, [
+                (discussion, None if discussion['url'] in reused
+                 else self._submit_thread(executor, discussion['url'], parse))
+                for discussion in discussions
+            ]))
+
+            # 이미 끝난 앞쪽 페이지는 기다리지 않고 바로 반환
+            while pending and self._page_ready(pending[0][1]):
+                page_done, page_pending = pending.popleft()
+                yield page_done, self._collect_page(page_pending)
 
-        return pd.DataFrame(all_discussions) 
\ No newline at end of file
+        # 목록 요청이 실패해 멈췄더라도 이미 받은 앞쪽 페이지는 마저 반환
+        while pending:
+            page_done, page_pending = pending.popleft()
+            yield page_done, self._collect_page(page_pending)
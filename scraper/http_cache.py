@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from hashlib import sha256
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 캐시에 함께 저장할 응답 헤더
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class DiskCache:
+    """URL과 쿼리로 키를 만드는 디스크 기반 HTTP 응답 캐시 (LRU 용량 제한)"""
+
+    def __init__(self, path='data/cache/http_cache.sqlite', max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """쿼리 파라미터 순서와 무관한 캐시 키 생성"""
+        prepared = requests.Request('GET', url, params=params).prepare().url
+        parts = urlsplit(prepared)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+        return sha256(normalized.encode('utf-8')).hexdigest(), normalized
+
+    def get(self, key):
+        """캐시 항목 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, headers, encoding, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        url, body, headers, encoding, stored_at = row
+        return {
+            'url': url,
+            'body': body,
+            'headers': json.loads(headers),
+            'encoding': encoding,
+            'stored_at': stored_at
+        }
+
+    def put(self, key, url, response):
+        """성공한 응답을 저장하고 용량을 넘으면 오래 안 쓴 항목부터 삭제"""
+        body = response.content
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, body, json.dumps(headers), response.encoding, len(body), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key):
+        """304 응답을 받았을 때 저장 시각 갱신"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                (now, now, key)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return time.time() - entry['stored_at'] < ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """ETag/Last-Modified 기반 조건부 요청 헤더"""
+        headers = {}
+        if 'ETag' in entry['headers']:
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if 'Last-Modified' in entry['headers']:
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    @staticmethod
+    def to_response(entry):
+        """캐시 항목을 requests.Response 객체로 복원"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = entry['url']
+        response._content = entry['body']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry['encoding']
+        response.from_cache = True
+        return response
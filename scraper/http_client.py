@@ -0,0 +1,145 @@
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from .http_cache import DiskCache
+from .metrics import get_default_metrics
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+    # gzip/deflate에 더해 brotli/zstd 모듈이 설치되어 있으면 함께 협상
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive'
+}
+
+# 일시적인 오류로 보고 재시도할 HTTP 상태 코드와 예외
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class SteamHttpClient:
+    """커넥션 풀과 재시도 정책을 가진 공용 HTTP 클라이언트
+
+    429/5xx 응답과 연결/읽기 오류는 지수 백오프(Retry-After가 있으면 그 값)로 다시 보낸다.
+    한 번에 기다리는 시간은 max_backoff초를 넘지 않는다.
+    urllib3에 재시도를 맡기면 속도 제한을 거치지 않고 다시 보내므로 재시도 루프를 직접 돌며
+    시도마다 rate_limiter 토큰을 받는다.
+    """
+
+    def __init__(self, pool_size=16, max_retries=3, backoff_factor=0.5, max_backoff=120, timeout=(5, 30), headers=None,
+                 cache=None, metrics=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.metrics = metrics or get_default_metrics()
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        # 호스트별로 연결을 재사용해 TCP/TLS 핸드셰이크를 줄임 (재시도는 _send에서 직접 함)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, params=None, headers=None, timeout=None, cache_ttl=None, rate_limiter=None):
+        """GET 요청 (연결 재사용 및 자동 재시도)
+
+        cache_ttl(초)을 지정하면 디스크 캐시를 사용하고, 만료된 항목은
+        ETag/Last-Modified 조건부 요청으로 재검증한다. rate_limiter는
+        캐시로 응답하지 못해 실제로 네트워크 요청을 보낼 때만 (재시도마다) 적용된다.
+        """
+        host = urlparse(url).netloc
+        if self.cache is None or cache_ttl is None:
+            return self._send(host, url, params, headers, timeout, rate_limiter)
+
+        key, cache_url = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+        if entry and self.cache.is_fresh(entry, cache_ttl):
+            self.metrics.inc('steam_http_cache_total', host=host, result='fresh')
+            return self.cache.to_response(entry)
+
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        response = self._send(host, url, params, request_headers, timeout, rate_limiter)
+
+        if response.status_code == 304 and entry:
+            self.metrics.inc('steam_http_cache_total', host=host, result='revalidated')
+            self.cache.refresh(key)
+            return self.cache.to_response(entry)
+        self.metrics.inc('steam_http_cache_total', host=host, result='miss')
+        if response.status_code == 200:
+            self.cache.put(key, cache_url, response)
+        return response
+
+    def _send(self, host, url, params, headers, timeout, rate_limiter=None):
+        """실제 네트워크 요청을 (필요하면 재시도하며) 보내고 대기 시간, 상태 코드, 응답 크기, 재시도 횟수를 지표로 기록"""
+        started = time.perf_counter()
+        limited = 0.0  # 속도 제한 때문에 기다린 시간 (요청 대기 시간에서 뺌)
+        for attempt in range(self.max_retries + 1):
+            if rate_limiter:
+                waited = time.perf_counter()
+                rate_limiter.wait(url)
+                limited += time.perf_counter() - waited
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout or self.timeout
+                )
+            except requests.exceptions.RequestException as e:
+                if not isinstance(e, RETRY_EXCEPTIONS) or attempt == self.max_retries:
+                    self.metrics.observe('steam_http_request_seconds', time.perf_counter() - started - limited,
+                                         host=host)
+                    self.metrics.inc('steam_http_errors_total', host=host, error=type(e).__name__)
+                    raise
+                reason = type(e).__name__
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    break
+                reason = response.status_code
+                delay = self._retry_after(response, attempt)
+                response.close()
+            self.metrics.inc('steam_http_retries_total', host=host, reason=reason)
+            time.sleep(delay)
+
+        self.metrics.observe('steam_http_request_seconds', time.perf_counter() - started - limited, host=host)
+        self.metrics.inc('steam_http_requests_total', host=host, status=response.status_code)
+        self.metrics.observe('steam_http_response_bytes', len(response.content), host=host)
+        return response
+
+    def _backoff(self, attempt):
+        """attempt번째 실패 뒤 기다릴 시간 (첫 재시도는 바로, 이후 backoff_factor × 2^attempt초, 최대 max_backoff초)"""
+        return min(self.backoff_factor * (2 ** attempt), self.max_backoff) if attempt else 0.0
+
+    def _retry_after(self, response, attempt):
+        """Retry-After(초) 헤더가 있으면 그 값(최대 max_backoff초), 없거나 날짜 형식이면 지수 백오프"""
+        try:
+            return min(max(0.0, float(response.headers['Retry-After'])), self.max_backoff)
+        except (KeyError, ValueError):
+            return self._backoff(attempt)
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """두 스크래퍼가 함께 쓰는 기본 HTTP 클라이언트 반환"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = SteamHttpClient(cache=DiskCache())
+        return _default_client
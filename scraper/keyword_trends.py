@@ -0,0 +1,271 @@
+import re
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import scipy.sparse as sp
+
+from .metrics import timed
+from .tokenizers import CjkTokenizer, get_tokenizer
+
+# 해시 버킷 수 (밀집 벡터 하나가 2MB 남짓). 서로 다른 토큰이 같은 버킷에 들어가면 빈도가 합쳐지므로
+# 어휘가 수십만 개로 늘면 충돌한 버킷이 생기고, 그런 버킷의 키워드는 '토큰 외 N개'로 표시된다
+DEFAULT_N_FEATURES = 2 ** 18
+
+# 한 번에 토큰화/벡터화할 글 수
+TRENDS_CHUNK_SIZE = 10000
+
+# Steam 리뷰 API의 언어 이름 → 불용어/토크나이저가 쓰는 언어 코드
+STEAM_LANGUAGE_CODES = {
+    'english': 'en',
+    'koreana': 'ko',
+    'schinese': 'zh',
+    'tchinese': 'zh',
+    'japanese': 'ja',
+    'russian': 'ru',
+}
+
+# 리뷰 추이는 새 기능이라 기존 결과와 맞출 필요가 없고 중국어/일본어 리뷰가 많으므로 CJK 분리를 골라 씀
+TRENDS_TOKENIZER = CjkTokenizer.name
+
+# 기간 단위: 'D'는 하루, 'W'는 월요일에 시작하는 한 주
+PERIOD_FREQS = ('D', 'W')
+
+# 여러 토큰이 합쳐진 버킷의 표시 이름 ('토큰 외 N개', 토큰에는 공백이 없음)
+COLLIDED_LABEL = re.compile(r'^(\S+) 외 \d+개$')
+
+
+class HashingVectorizer:
+    """토큰을 해시 버킷 번호로 바꿔 (글 × 버킷) 빈도 희소 행렬을 만드는 벡터라이저
+
+    어휘 사전을 미리 만들 필요가 없어 배치가 계속 들어와도 열 번호가 바뀌지 않는다.
+    해시는 pandas의 고정 키 해시라 프로세스가 달라도 같다. 화면에 보여줄 수 있도록
+    버킷마다 처음 본 토큰을 labels에 남기고, 다른 토큰이 같은 버킷에 들어오면 collisions에
+    모아 label()이 충돌한 버킷임을 표시하게 한다.
+    """
+
+    def __init__(self, tokenizer=None, n_features=DEFAULT_N_FEATURES):
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.n_features = n_features
+        self.labels = {}  # 버킷 번호 -> 처음 본 토큰
+        self.collisions = {}  # 버킷 번호 -> 같은 버킷에 들어온 다른 토큰 집합
+
+    def bucket(self, token):
+        """토큰 하나의 버킷 번호"""
+        return int(pd.util.hash_array(np.array([token], dtype=object))[0] % self.n_features)
+
+    def _hash(self, tokens):
+        # 같은 토큰은 한 번만 해시하도록 사전 인코딩
+        encoded = pc.dictionary_encode(tokens)
+        vocabulary = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+        buckets = (pd.util.hash_array(vocabulary) % self.n_features).astype(np.int64)
+        for bucket, token in zip(buckets.tolist(), vocabulary):
+            if self.labels.setdefault(bucket, token) != token:
+                self.collisions.setdefault(bucket, set()).add(token)
+        return buckets[encoded.indices.to_numpy(zero_copy_only=False)]
+
+    def label(self, bucket):
+        """화면에 보여줄 버킷 이름 (여러 토큰이 합쳐진 버킷이면 '처음 본 토큰 외 N개')"""
+        token = self.labels.get(bucket, '')
+        others = self.collisions.get(bucket)
+        return f"{token} 외 {len(others)}개" if others else token
+
+    @staticmethod
+    def label_token(label):
+        """label()이 붙인 '외 N개' 표시를 떼어 낸 토큰 (표시 이름으로 다시 조회할 때 사용)"""
+        match = COLLIDED_LABEL.match(label)
+        return match.group(1) if match else label
+
+    def transform(self, texts, languages=None):
+        """글 목록을 (글 수 × n_features) CSR 토큰 빈도 행렬로 변환"""
+        tokens, doc_index = self.tokenizer.tokenize(texts, languages)
+        matrix = sp.csr_matrix(
+            (np.ones(len(tokens), dtype=np.int64), (doc_index, self._hash(tokens))),
+            shape=(len(texts), self.n_features)
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+
+class KeywordTrends:
+    """날짜별 키워드 빈도를 누적해 기간별 TF-IDF 상위 키워드와 급상승 키워드를 계산하는 집계기
+
+    글 배치가 들어올 때마다 그 배치만 벡터화해 (날짜 × 버킷) 토큰 빈도(tf)와 등장 글 수(df)
+    조각으로 쌓고, 조회할 때 한 번에 CSR 행렬로 합친다. 기간 조회는 해당 날짜 행만 더하므로
+    비용은 글 수가 아니라 기간 안의 날짜 수와 어휘 수에 비례한다. 주 단위는 날짜 행을 묶어 계산한다.
+    """
+
+    def __init__(self, tokenizer=TRENDS_TOKENIZER, n_features=DEFAULT_N_FEATURES):
+        self.vectorizer = HashingVectorizer(tokenizer, n_features)
+        self.day_rows = {}  # 날짜(Timestamp) -> 행 번호
+        self.day_docs = []  # 행 번호별 글 수
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self._pending = []  # 아직 행렬에 더하지 않은 (날짜 행, 버킷, 빈도) 조각
+        self._tf = None
+        self._df = None
+
+    @classmethod
+    def from_reviews(cls, reviews_df, tokenizer=TRENDS_TOKENIZER):
+        return cls(tokenizer).add_reviews(reviews_df)
+
+    @property
+    def empty(self):
+        return self.n_docs == 0
+
+    @timed('steam_analysis_seconds', function='keyword_trends_add')
+    def add(self, texts, dates, languages=None, chunk_size=TRENDS_CHUNK_SIZE):
+        """글 배치를 벡터화해 날짜별 빈도에 더함 (languages는 'en', 'ko' 같은 언어 코드, 날짜가 없는 글은 제외)"""
+        texts = pd.Series(texts, dtype=object).fillna('').astype(str).reset_index(drop=True)
+        dates = pd.to_datetime(pd.Series(dates)).dt.normalize().reset_index(drop=True)
+        if languages is not None:
+            languages = pd.Series(languages, dtype=object).reset_index(drop=True)
+        valid = dates.notna().to_numpy()
+        if not valid.all():
+            texts, dates = texts[valid].reset_index(drop=True), dates[valid].reset_index(drop=True)
+            languages = languages[valid].reset_index(drop=True) if languages is not None else None
+
+        for start in range(0, len(texts), chunk_size):
+            stop = start + chunk_size
+            chunk_langs = languages.iloc[start:stop] if languages is not None else None
+            tf = self.vectorizer.transform(texts.iloc[start:stop], chunk_langs)
+            # 글 × 버킷 칸은 하나씩이므로 열 번호가 나온 횟수가 그 토큰이 나온 글 수
+            np.add.at(self.df, tf.indices, 1)
+            self.n_docs += tf.shape[0]
+
+            # 글마다 날짜 행 번호를 붙여 두면 합칠 때 같은 날 글의 빈도가 한 행으로 더해짐
+            codes, days = pd.factorize(dates.iloc[start:stop])
+            day_rows = np.array([self._day_row(day) for day in days], dtype=np.int64)
+            for row, count in zip(day_rows.tolist(), np.bincount(codes, minlength=len(days)).tolist()):
+                self.day_docs[row] += count
+            doc_rows = day_rows[codes][np.repeat(np.arange(tf.shape[0]), np.diff(tf.indptr))]
+            self._pending.append((doc_rows, tf.indices, tf.data))
+        return self
+
+    def _day_row(self, day):
+        row = self.day_rows.get(day)
+        if row is None:
+            row = self.day_rows[day] = len(self.day_docs)
+            self.day_docs.append(0)
+        return row
+
+    def _matrices(self):
+        """쌓인 조각을 더한 (날짜 행 × 버킷) tf, df CSR 행렬"""
+        shape = (len(self.day_docs), self.vectorizer.n_features)
+        if self._tf is None:
+            self._tf = sp.csr_matrix(shape, dtype=np.int64)
+            self._df = sp.csr_matrix(shape, dtype=np.int64)
+        elif self._tf.shape != shape:
+            self._tf.resize(shape)
+            self._df.resize(shape)
+        if self._pending:
+            rows, buckets, counts = (np.concatenate(parts) for parts in zip(*self._pending))
+            self._tf = self._tf + sp.csr_matrix((counts, (rows, buckets)), shape=shape)
+            # 글 × 버킷 칸은 하나씩이므로 1을 더하면 그날 그 토큰이 나온 글 수
+            self._df = self._df + sp.csr_matrix((np.ones_like(counts), (rows, buckets)), shape=shape)
+            self._pending = []
+        return self._tf, self._df
+
+    def add_reviews(self, reviews_df):
+        """리뷰 테이블(content, timestamp, language)을 더함"""
+        if reviews_df.empty:
+            return self
+        languages = reviews_df['language'].astype(str).map(lambda name: STEAM_LANGUAGE_CODES.get(name, name))
+        return self.add(reviews_df['content'], reviews_df['timestamp'], languages)
+
+    @staticmethod
+    def _period_start(day, freq):
+        return day - pd.Timedelta(days=day.weekday()) if freq == 'W' else day
+
+    def periods(self, freq='D'):
+        """글이 있는 기간의 시작 날짜 목록 (오래된 순)"""
+        if freq not in PERIOD_FREQS:
+            raise ValueError(f"지원하지 않는 기간 단위: {freq} (가능한 값: {', '.join(PERIOD_FREQS)})")
+        return sorted({self._period_start(day, freq) for day in self.day_rows})
+
+    def _window(self, start, end):
+        """[start, end] 날짜 구간의 (tf 합, df 합, 글 수) 밀집 벡터"""
+        rows = [row for day, row in self.day_rows.items()
+                if (start is None or day >= start) and (end is None or day <= end)]
+        if not rows:
+            empty = np.zeros(self.vectorizer.n_features, dtype=np.int64)
+            return empty, empty.copy(), 0
+        tf, df = self._matrices()
+        return (np.asarray(tf[rows].sum(axis=0)).ravel(), np.asarray(df[rows].sum(axis=0)).ravel(),
+                sum(self.day_docs[row] for row in rows))
+
+    def _idf(self):
+        """평활화한 idf: log((1 + N) / (1 + df)) + 1"""
+        return np.log((1 + self.n_docs) / (1 + self.df)) + 1
+
+    def _weights(self, tf):
+        """하위선형 tf(1 + log tf) × idf, tf가 0이면 0"""
+        idf = self._idf()
+        weights = np.zeros(len(tf))
+        nonzero = tf > 0
+        weights[nonzero] = (1 + np.log(tf[nonzero])) * idf[nonzero]
+        return weights
+
+    def _frame(self, buckets, columns):
+        return pd.DataFrame({'keyword': [self.vectorizer.label(int(bucket)) for bucket in buckets], **columns})
+
+    @staticmethod
+    def _top(scores, k):
+        """점수가 양수인 버킷 중 상위 k개 (점수 내림차순)"""
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+    @staticmethod
+    def _bounds(start, end, freq):
+        start = pd.Timestamp(start).normalize() if start is not None else None
+        end = pd.Timestamp(end).normalize() if end is not None else None
+        if start is not None and end is None:
+            # 기간 시작만 주면 그 기간 하나 (하루 또는 한 주)
+            end = start + pd.Timedelta(days=6 if freq == 'W' else 0)
+        return start, end
+
+    @timed('steam_analysis_seconds', function='keyword_trends_top')
+    def top_keywords(self, start=None, end=None, k=20, freq='D'):
+        """기간 안에서 TF-IDF 점수가 높은 키워드 (keyword, count, docs, score)
+
+        start/end를 모두 생략하면 전체 기간, start만 주면 그 날(freq='W'면 그 주)이다.
+        """
+        start, end = self._bounds(start, end, freq)
+        tf, df, _ = self._window(start, end)
+        scores = self._weights(tf)
+        top = self._top(scores, k)
+        return self._frame(top, {'count': tf[top], 'docs': df[top], 'score': scores[top]})
+
+    @timed('steam_analysis_seconds', function='keyword_trends_trending')
+    def trending(self, start, end=None, k=20, freq='D', min_count=2):
+        """바로 앞 같은 길이 기간보다 글당 등장 횟수 × idf가 많이 오른 키워드
+
+        (keyword, count, previous_count, change)를 change 내림차순으로 반환한다. 두 기간의
+        글 수가 달라도(수집 중인 마지막 주 등) 비교할 수 있도록 글 수로 나눈 빈도를 쓰고,
+        우연히 한두 번 나온 단어가 올라오지 않도록 기간 안 빈도가 min_count 이상인 것만 본다.
+        """
+        start, end = self._bounds(start, end, freq)
+        length = end - start + pd.Timedelta(days=1)
+        tf, _, docs = self._window(start, end)
+        previous_tf, _, previous_docs = self._window(start - length, start - pd.Timedelta(days=1))
+        idf = self._idf()
+        rate = tf / docs if docs else np.zeros(len(tf))
+        previous_rate = previous_tf / previous_docs if previous_docs else np.zeros(len(tf))
+        change = (rate - previous_rate) * idf
+        change[tf < min_count] = 0
+        top = self._top(change, k)
+        return self._frame(top, {'count': tf[top], 'previous_count': previous_tf[top], 'change': change[top]})
+
+    def keyword_series(self, keywords, freq='D'):
+        """키워드별 기간당 등장 횟수 (index: 기간 시작 날짜, columns: 키워드, top_keywords의 표시 이름도 받음)"""
+        keywords = list(keywords)
+        if not self.day_rows:
+            return pd.DataFrame(columns=keywords, index=pd.DatetimeIndex([], name='date'), dtype='int64')
+        tf, _ = self._matrices()
+        days = list(self.day_rows)
+        buckets = [self.vectorizer.bucket(self.vectorizer.label_token(keyword).lower()) for keyword in keywords]
+        counts = tf[[self.day_rows[day] for day in days]][:, buckets].toarray()
+        frame = pd.DataFrame(counts, columns=keywords,
+                             index=pd.DatetimeIndex([self._period_start(day, freq) for day in days], name='date'))
+        return frame.groupby(level='date').sum().sort_index()
@@ -0,0 +1,174 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+
+from langdetect import DetectorFactory, detect
+
+# langdetect는 내부 난수 때문에 실행마다 결과가 달라질 수 있으므로 시드 고정
+DetectorFactory.seed = 0
+
+DEFAULT_LANGUAGE = 'en'
+
+# 문자 체계만으로 바로 판단할 수 있는 언어 (유니코드 범위, 언어 코드)
+SCRIPT_RANGES = [
+    ((0xAC00, 0xD7A3), 'ko'),   # 한글 음절
+    ((0x1100, 0x11FF), 'ko'),   # 한글 자모
+    ((0x3130, 0x318F), 'ko'),   # 한글 호환 자모
+    ((0x3040, 0x30FF), 'ja'),   # 히라가나/가타카나
+    ((0x4E00, 0x9FFF), 'zh'),   # CJK 통합 한자
+    ((0x3400, 0x4DBF), 'zh'),   # CJK 확장 A
+    ((0x0400, 0x04FF), 'ru'),   # 키릴 문자
+    ((0x0E00, 0x0E7F), 'th'),   # 태국 문자
+    ((0x0600, 0x06FF), 'ar'),   # 아랍 문자
+    ((0x0590, 0x05FF), 'he'),   # 히브리 문자
+    ((0x0370, 0x03FF), 'el'),   # 그리스 문자
+    ((0x0900, 0x097F), 'hi'),   # 데바나가리
+]
+
+# 키릴 문자 중 우크라이나어에만 쓰이는 글자
+UKRAINIAN_LETTERS = set('іїєґІЇЄҐ')
+
+# 이 비율 이상이 비라틴 문자이면 통계 모델 없이 바로 결정 (영어 단어가 섞인 한국어 글 등)
+SCRIPT_SHARE_THRESHOLD = 0.3
+# 분류에 사용할 앞부분 글자 수
+SCRIPT_SAMPLE_CHARS = 500
+
+
+def _script_language(char):
+    code = ord(char)
+    for (low, high), language in SCRIPT_RANGES:
+        if low <= code <= high:
+            return language
+    return None
+
+
+def classify_script(text):
+    """문자 체계로 언어를 바로 판단 (라틴 문자 위주이거나 글자가 없으면 None)
+
+    반환값: (언어 코드 또는 None, 글자 수)
+    """
+    counts = {}
+    letters = 0
+    has_ukrainian = False
+    for char in text[:SCRIPT_SAMPLE_CHARS]:
+        if not char.isalpha():
+            continue
+        letters += 1
+        language = _script_language(char)
+        if language:
+            counts[language] = counts.get(language, 0) + 1
+            if char in UKRAINIAN_LETTERS:
+                has_ukrainian = True
+
+    if not counts:
+        return None, letters
+
+    # 일본어 글에는 한자가 함께 쓰이므로 가나가 조금이라도 있으면 일본어로 봄
+    if counts.get('ja', 0) >= max(1, 0.05 * letters):
+        return 'ja', letters
+
+    language, count = max(counts.items(), key=lambda item: item[1])
+    if count < SCRIPT_SHARE_THRESHOLD * letters:
+        return None, letters
+    if language == 'ru' and has_ukrainian:
+        return 'uk', letters
+    return language, letters
+
+
+def normalize_language(code):
+    """langdetect의 zh-cn/zh-tw 같은 세부 코드를 기본 언어 코드로 통일"""
+    return code.split('-')[0] if code else DEFAULT_LANGUAGE
+
+
+class LanguageDetector:
+    """문자 체계 사전 분류 + 통계 모델 + 텍스트 해시 캐시로 구성된 언어 감지기
+
+    한글/한자/키릴 문자 등은 문자 범위만 보고 바로 결정하고, 라틴 문자처럼
+    애매한 텍스트만 langdetect로 판단한다. 통계 모델 결과는 텍스트 해시를
+    키로 메모리 LRU 캐시와 (지정 시) 디스크에 저장해 다음 실행에서도 재사용한다.
+    """
+
+    def __init__(self, cache_size=100_000, cache_path='data/cache/language_cache.sqlite'):
+        self.cache_size = cache_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if cache_path:
+            directory = os.path.dirname(cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS languages (hash TEXT PRIMARY KEY, language TEXT NOT NULL)")
+            self._conn.commit()
+
+    @staticmethod
+    def _hash(text):
+        return blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _remember(self, key, language):
+        self._memory[key] = language
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.cache_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self._conn is not None:
+            row = self._conn.execute("SELECT language FROM languages WHERE hash = ?", (key,)).fetchone()
+            if row:
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def detect(self, text):
+        """텍스트 하나의 언어 코드 반환"""
+        return self.detect_many([text])[0]
+
+    def detect_many(self, texts):
+        """여러 텍스트의 언어 코드를 한 번에 반환 (디스크 캐시는 마지막에 한 번만 기록)"""
+        results = []
+        new_entries = []
+        with self._lock:
+            for text in texts:
+                text = text or ''
+                language, letters = classify_script(text)
+                if language:
+                    results.append(language)
+                    continue
+                if letters == 0:
+                    results.append(DEFAULT_LANGUAGE)
+                    continue
+
+                key = self._hash(text)
+                language = self._lookup(key)
+                if language is None:
+                    try:
+                        language = normalize_language(detect(text))
+                    except Exception:
+                        language = DEFAULT_LANGUAGE
+                    self._remember(key, language)
+                    new_entries.append((key, language))
+                results.append(language)
+
+            if new_entries and self._conn is not None:
+                self._conn.executemany("INSERT OR REPLACE INTO languages VALUES (?, ?)", new_entries)
+                self._conn.commit()
+
+        return results
+
+
+_default_detector = None
+_default_detector_lock = threading.Lock()
+
+
+def get_default_detector():
+    """프로세스 전체에서 함께 쓰는 기본 언어 감지기 반환"""
+    global _default_detector
+    with _default_detector_lock:
+        if _default_detector is None:
+            _default_detector = LanguageDetector()
+        return _default_detector
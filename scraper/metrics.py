@@ -0,0 +1,290 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# 이름이 _seconds / _bytes로 끝나는 히스토그램의 구간 상한 (Prometheus 관례)
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRIC_HELP = {
+    'steam_http_requests_total': "실제로 네트워크로 보낸 HTTP 요청 수 (최종 상태 코드별)",
+    'steam_http_retries_total': "다시 보낸 요청 수 (재시도를 일으킨 상태 코드/오류별)",
+    'steam_http_errors_total': "응답을 받지 못하고 예외로 끝난 요청 수",
+    'steam_http_cache_total': "디스크 캐시 조회 결과 (fresh: 네트워크 없음, revalidated: 304, miss: 새로 받음)",
+    'steam_http_request_seconds': "네트워크 요청 대기 시간 (재시도 포함, 속도 제한 대기 제외)",
+    'steam_http_response_bytes': "응답 본문 크기 (압축 해제 후)",
+    'steam_rate_limit_wait_seconds': "호스트별 속도 제한 때문에 잠든 시간",
+    'steam_pages_total': "처리한 페이지 수",
+    'steam_threads_total': "토론 게시글 처리 결과별 개수",
+    'steam_parse_seconds': "JSON/HTML 파싱 시간",
+    'steam_transform_seconds': "pandas/Arrow 테이블 변환·채점·색인 시간",
+    'steam_analysis_seconds': "분석 함수 실행 시간",
+}
+
+# overview()에서 단계별 시간으로 보여줄 히스토그램과 세부 구분 레이블
+STAGE_HISTOGRAMS = [
+    ('steam_http_request_seconds', None),
+    ('steam_rate_limit_wait_seconds', None),
+    ('steam_parse_seconds', 'kind'),
+    ('steam_transform_seconds', 'step'),
+    ('steam_analysis_seconds', 'function'),
+]
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_number(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """구간별 누적 개수와 합계를 보관하는 히스토그램 (Prometheus histogram과 같은 구조)"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, upper in enumerate(self.buckets):
+            if value <= upper:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for upper, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            yield upper, total
+
+    def quantile(self, q):
+        """구간 안에서 선형 보간한 분위수 추정값 (histogram_quantile과 같은 방식)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, previous = 0.0, 0
+        for upper, cumulative in self.cumulative():
+            if cumulative >= rank:
+                if upper == math.inf:
+                    return lower
+                inside = cumulative - previous
+                return lower + (upper - lower) * ((rank - previous) / inside if inside else 0)
+            lower, previous = upper, cumulative
+        return lower
+
+
+class MetricsRegistry:
+    """수집/분석 단계의 카운터·타이머·히스토그램을 모으는 스레드 안전 저장소
+
+    값은 (이름, 레이블) 조합마다 따로 쌓이고, Prometheus 텍스트 형식이나 JSON으로 내보낼 수 있다.
+    타이머는 경과 시간을 같은 이름의 히스토그램에 기록한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}    # name -> {label_key: value}
+        self._histograms = {}  # name -> {label_key: Histogram}
+        self.started_at = time.time()
+
+    @staticmethod
+    def _buckets_for(name):
+        return SIZE_BUCKETS if name.endswith('_bytes') else TIME_BUCKETS
+
+    def inc(self, name, value=1, **labels):
+        """카운터 증가"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """히스토그램에 값 하나 기록"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets_for(name))
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록 실행 시간을 초 단위로 히스토그램에 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """JSON으로 바꿀 수 있는 현재 값 (히스토그램은 개수·합계·분위수 추정값과 구간별 누적 개수)"""
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+            histograms = {
+                name: [{
+                    'labels': dict(key),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'mean': histogram.sum / histogram.count if histogram.count else None,
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99),
+                    'buckets': [[_format_number(upper), count] for upper, count in histogram.cumulative()]
+                } for key, histogram in sorted(series.items())]
+                for name, series in sorted(self._histograms.items())
+            }
+        return {'started_at': self.started_at, 'collected_at': time.time(),
+                'counters': counters, 'histograms': histograms}
+
+    def _merged(self, name):
+        """이름이 같은 히스토그램을 레이블과 무관하게 합친 것 (없으면 None)"""
+        series = self._histograms.get(name)
+        if not series:
+            return None
+        merged = Histogram(self._buckets_for(name))
+        for histogram in series.values():
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.sum += histogram.sum
+            merged.count += histogram.count
+        return merged
+
+    def _counts_by(self, name, label):
+        totals = {}
+        for key, value in self._counters.get(name, {}).items():
+            label_value = dict(key).get(label, '')
+            totals[label_value] = totals.get(label_value, 0) + value
+        return totals
+
+    def overview(self):
+        """대시보드/수집 요약용 요약값
+
+        요청 수와 상태 코드·재시도 사유·캐시 결과별 개수, 받은 바이트, 요청 지연 분위수,
+        그리고 단계(네트워크 대기, 속도 제한 대기, 파싱, 변환, 분석)별 누적 시간을 담는다.
+        """
+        with self._lock:
+            latency = self._merged('steam_http_request_seconds')
+            response_bytes = self._merged('steam_http_response_bytes')
+            stages = []
+            for name, label in STAGE_HISTOGRAMS:
+                if label is None:
+                    # 호스트별로 나뉜 대기 시간은 하나로 합쳐 보여줌
+                    merged = self._merged(name)
+                    parts = [(name, merged)] if merged else []
+                else:
+                    parts = [(f"{name}:{dict(key).get(label, '')}", histogram)
+                             for key, histogram in sorted(self._histograms.get(name, {}).items())]
+                for stage, histogram in parts:
+                    stages.append({
+                        'stage': stage,
+                        'seconds': histogram.sum,
+                        'count': histogram.count,
+                        'p95': histogram.quantile(0.95)
+                    })
+            return {
+                'uptime_seconds': time.time() - self.started_at,
+                'requests': sum(self._counts_by('steam_http_requests_total', 'status').values()),
+                'status': self._counts_by('steam_http_requests_total', 'status'),
+                'retries': self._counts_by('steam_http_retries_total', 'reason'),
+                'errors': self._counts_by('steam_http_errors_total', 'error'),
+                'cache': self._counts_by('steam_http_cache_total', 'result'),
+                'bytes': int(response_bytes.sum) if response_bytes else 0,
+                'latency': {
+                    'mean': latency.sum / latency.count,
+                    'p50': latency.quantile(0.5),
+                    'p95': latency.quantile(0.95),
+                    'p99': latency.quantile(0.99)
+                } if latency and latency.count else None,
+                'pages': self._counts_by('steam_pages_total', 'kind'),
+                'threads': self._counts_by('steam_threads_total', 'result'),
+                'stages': stages
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 노출 형식 (node_exporter textfile collector 등에서 바로 읽을 수 있음)"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+            for name, series in sorted(self._histograms.items()):
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    for upper, count in histogram.cumulative():
+                        lines.append(f"{name}_bucket{_format_labels(key, [('le', _format_number(upper))])} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """확장자가 .json이면 JSON, 그 밖에는 Prometheus 텍스트 형식으로 파일에 저장"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        # 수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+
+_default_metrics = None
+_default_metrics_lock = threading.Lock()
+
+
+def get_default_metrics():
+    """프로세스 전체에서 함께 쓰는 기본 지표 저장소 반환"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = MetricsRegistry()
+        return _default_metrics
+
+
+def timed(name, **labels):
+    """함수 실행 시간을 기본 지표 저장소의 히스토그램에 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_default_metrics().timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,32 @@
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로세스 풀 시작 방식: 백그라운드 작업 스레드에서 fork하면 다른 스레드가 잡고 있던
+# 락까지 복사되어 자식 프로세스가 멈출 수 있으므로, 가능하면 forkserver를 사용
+MP_CONTEXT = (multiprocessing.get_context('forkserver')
+              if 'forkserver' in multiprocessing.get_all_start_methods() else None)
+
+# 기본 프로세스 풀의 워커 수 (HTML 파싱처럼 짧은 CPU 작업용)
+DEFAULT_POOL_WORKERS = min(4, os.cpu_count() or 1)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_process_pool():
+    """프로세스 전체에서 함께 쓰는 기본 프로세스 풀 반환
+
+    워커를 띄우고 모듈을 불러오는 데 1초 가까이 걸리므로 수집할 때마다 새로 만들지 않고
+    처음 필요할 때 만든 풀을 계속 재사용한다.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ProcessPoolExecutor(max_workers=DEFAULT_POOL_WORKERS, mp_context=MP_CONTEXT)
+            # multiprocessing 자식 프로세스는 종료할 때 풀 워커부터 join해 멈추므로, 큐 정리(우선순위 10)보다 먼저 닫음
+            multiprocessing.util.Finalize(None, _default_pool.shutdown, exitpriority=100)
+        return _default_pool
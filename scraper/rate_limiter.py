@@ -0,0 +1,59 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from .metrics import get_default_metrics
+
+
+class HostRateLimiter:
+    """호스트별 요청 속도 제한 (토큰 버킷)"""
+
+    def __init__(self, requests_per_second=2.0, burst=1, metrics=None):
+        self.requests_per_second = requests_per_second
+        self.metrics = metrics or get_default_metrics()
+        self.burst = max(1, burst)
+        self._buckets = {}  # host -> (남은 토큰, 마지막 갱신 시각)
+        self._lock = threading.Lock()
+
+    def _reserve(self, host):
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.requests_per_second)
+            tokens -= 1
+            self._buckets[host] = (tokens, now)
+
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.requests_per_second
+
+    def wait(self, url):
+        """해당 URL의 호스트에 요청을 보내도 될 때까지 대기"""
+        if not self.requests_per_second or self.requests_per_second <= 0:
+            return
+        host = urlparse(url).netloc
+        delay = self._reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        self.metrics.observe('steam_rate_limit_wait_seconds', delay, host=host)
+
+
+# 기본 제한기의 호스트별 초당 요청 수 (리뷰/토론 스크래퍼와 수집 작업이 함께 나눠 씀)
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+_default_rate_limiter = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter():
+    """프로세스 전체에서 함께 쓰는 기본 호스트별 속도 제한기 반환
+
+    스크래퍼마다 제한기를 따로 만들면 동시에 도는 수집 작업 수만큼 같은 호스트로 가는
+    요청 속도가 늘어나므로, 제한기를 따로 주지 않은 스크래퍼는 모두 이 제한기를 쓴다.
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = HostRateLimiter(requests_per_second=DEFAULT_REQUESTS_PER_SECOND)
+        return _default_rate_limiter
@@ -0,0 +1,253 @@
+import math
+
+import pandas as pd
+
+from .metrics import timed
+
+# 모든 언어를 합친 계열의 언어 이름
+ALL_LANGUAGES = 'all'
+
+# 경보 기록 열 (metric은 일별 리뷰 수 'count' 또는 긍정 리뷰 비율 'positive_ratio')
+ANOMALY_COLUMNS = ['date', 'language', 'metric', 'value', 'expected', 'z', 'direction', 'rule', 'provisional']
+
+
+class EwmaMonitor:
+    """지수 가중 이동 평균/분산과 양방향 CUSUM으로 한 계열의 급변을 찾는 감시기
+
+    값이 하나 들어올 때마다 상태(평균, 분산, CUSUM 두 개)만 고치므로 갱신 비용은 O(1)이다.
+    warmup개가 쌓이기 전에는 학습만 하고 판정하지 않는다. 판정에 쓰는 표준편차는
+    호출하는 쪽이 준 하한(표본 잡음 크기) 아래로 내려가지 않으므로, 조용하던 계열이
+    조금만 움직여도 경보가 울리지는 않는다.
+    """
+
+    def __init__(self, alpha=0.1, z_threshold=3.0, cusum_k=0.5, cusum_h=5.0, warmup=7):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.warmup = warmup
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.cusum_up = 0.0
+        self.cusum_down = 0.0
+
+    def score(self, value, std_floor=0.0):
+        """상태를 바꾸지 않고 값 하나를 판정 (z, 다음 CUSUM 값, 경보 규칙 또는 None)"""
+        if self.count < self.warmup:
+            return None, self.cusum_up, self.cusum_down, None
+        std = max(math.sqrt(self.var), std_floor, 1e-9)
+        z = (value - self.mean) / std
+        cusum_up = max(0.0, self.cusum_up + z - self.cusum_k)
+        cusum_down = max(0.0, self.cusum_down - z - self.cusum_k)
+        if abs(z) >= self.z_threshold:
+            rule = 'zscore'
+        elif cusum_up >= self.cusum_h or cusum_down >= self.cusum_h:
+            rule = 'cusum'
+        else:
+            rule = None
+        return z, cusum_up, cusum_down, rule
+
+    def update(self, value, std_floor=0.0):
+        """값 하나를 판정한 뒤 상태에 반영 (경보가 울린 CUSUM은 0으로 되돌림)
+
+        며칠 이어지는 리뷰 폭탄이 첫날 바로 기준선에 섞여 다음 날부터 정상으로 보이지 않도록,
+        기준선에는 평균 ± z_threshold 표준편차로 자른 값을 반영한다.
+        """
+        z, cusum_up, cusum_down, rule = self.score(value, std_floor)
+        self.cusum_up, self.cusum_down = (0.0, 0.0) if rule else (cusum_up, cusum_down)
+        if z is not None:
+            limit = self.z_threshold * max(math.sqrt(self.var), std_floor, 1e-9)
+            value = min(max(value, self.mean - limit), self.mean + limit)
+        if self.count == 0:
+            self.mean = float(value)
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.var = (1 - self.alpha) * (self.var + diff * increment)
+        self.count += 1
+        return z, rule
+
+    def to_state(self):
+        return [self.mean, self.var, self.count, self.cusum_up, self.cusum_down]
+
+    def load_state(self, state):
+        self.mean, self.var, self.count, self.cusum_up, self.cusum_down = state
+        return self
+
+
+class ReviewAnomalyDetector:
+    """언어별(및 전체) 일별 리뷰 수와 긍정 비율을 날짜 순서대로 따라가며 리뷰 폭탄/평가 급변을 찾는 감지기
+
+    계열마다 EwmaMonitor 하나만 두므로 하루치가 들어올 때 드는 비용은 전체 기간 길이와
+    무관하다(언어 수에만 비례). 가장 최근 날짜는 아직 리뷰가 더 들어올 수 있으므로
+    상태에 반영하지 않고 잠정 판정만 하다가, 더 늦은 날짜가 들어오면 확정한다. 확정된
+    날짜보다 이른 리뷰는 반영할 수 없으므로 late_rows에 개수만 센다(처음부터 다시 계산하려면
+    from_daily/from_cube 사용). 상태는 to_state()로 JSON에 저장했다가 from_state()로 이어 쓸 수 있다.
+    """
+
+    def __init__(self, alpha=0.1, z_threshold=3.0, cusum_k=0.5, cusum_h=5.0, warmup=7, min_reviews=5):
+        self.params = {'alpha': alpha, 'z_threshold': z_threshold, 'cusum_k': cusum_k, 'cusum_h': cusum_h,
+                       'warmup': warmup}
+        # 긍정 비율은 그날 리뷰가 이 수 이상일 때만 판정/학습 (몇 개짜리 날의 0%/100%는 무시)
+        self.min_reviews = min_reviews
+        self.monitors = {}  # (언어, 지표) -> EwmaMonitor
+        self.committed_through = None  # 상태에 반영된 마지막 날짜
+        self.pending_date = None  # 잠정 판정 중인 가장 최근 날짜
+        self.pending = {}  # 언어 -> [전체, 긍정] (pending_date의 누적 리뷰 수)
+        self.flagged = []  # 확정된 날짜의 경보 기록
+        self.late_rows = 0
+
+    @classmethod
+    def from_daily(cls, daily, **params):
+        return cls(**params).add(daily)
+
+    @classmethod
+    def from_cube(cls, cube, **params):
+        """ReviewCube의 (날짜, 언어)별 집계로 처음부터 계산 (비용은 날짜 수 × 언어 수)"""
+        return cls.from_daily(cube.daily_languages(), **params)
+
+    @staticmethod
+    def daily_counts(reviews_df):
+        """리뷰 테이블(timestamp, language, recommended)을 (date, language, total, positive) 일별 집계로 변환"""
+        if reviews_df.empty:
+            return pd.DataFrame(columns=['date', 'language', 'total', 'positive'])
+        keys = [reviews_df['timestamp'].dt.normalize().rename('date'), reviews_df['language'].astype(str)]
+        grouped = reviews_df['recommended'].astype(bool).groupby(keys)
+        return pd.DataFrame({'total': grouped.size(), 'positive': grouped.sum()}).reset_index()
+
+    def _monitor(self, language, metric):
+        monitor = self.monitors.get((language, metric))
+        if monitor is None:
+            monitor = self.monitors[(language, metric)] = EwmaMonitor(**self.params)
+        return monitor
+
+    def _observations(self, day_totals):
+        """하루치 언어별 [전체, 긍정]을 (언어, 지표, 값, 표준편차 하한) 목록으로 변환
+
+        리뷰 수는 포아송 잡음(√평균), 긍정 비율은 그날 리뷰 수로 본 이항 잡음(√(p(1-p)/n))을 하한으로 둔다.
+        """
+        totals = dict(day_totals)
+        totals[ALL_LANGUAGES] = [sum(t for t, _ in day_totals.values()), sum(p for _, p in day_totals.values())]
+        # 전에 본 언어가 그날 리뷰가 없으면 리뷰 수 0으로 관측
+        for language, metric in self.monitors:
+            if metric == 'count':
+                totals.setdefault(language, [0, 0])
+        observations = []
+        for language, (total, positive) in totals.items():
+            count_monitor = self._monitor(language, 'count')
+            observations.append((language, 'count', float(total), math.sqrt(max(count_monitor.mean, 1.0))))
+            if total >= self.min_reviews:
+                ratio = positive / total
+                ratio_monitor = self._monitor(language, 'positive_ratio')
+                expected = min(max(ratio_monitor.mean, 0.01), 0.99)
+                observations.append((language, 'positive_ratio', ratio, math.sqrt(expected * (1 - expected) / total)))
+        return observations
+
+    def _record(self, date, language, metric, value, expected, z, rule, provisional):
+        return {'date': date, 'language': language, 'metric': metric, 'value': value, 'expected': expected,
+                'z': z, 'direction': 'up' if z > 0 else 'down', 'rule': rule, 'provisional': provisional}
+
+    def _commit(self, date, day_totals):
+        """하루치를 판정하고 상태에 반영"""
+        for language, metric, value, std_floor in self._observations(day_totals):
+            monitor = self.monitors[(language, metric)]
+            expected = monitor.mean
+            z, rule = monitor.update(value, std_floor)
+            if rule:
+                self.flagged.append(self._record(date, language, metric, value, expected, z, rule, False))
+        self.committed_through = date
+
+    @timed('steam_analysis_seconds', function='review_anomaly_add')
+    def add(self, daily):
+        """(date, language, total, positive) 일별 집계 배치를 반영 (같은 날짜가 여러 배치로 나뉘어도 됨)"""
+        if daily.empty:
+            return self
+        batch = daily.assign(date=pd.to_datetime(daily['date']).dt.normalize())
+        batch = batch.groupby(['date', 'language'])[['total', 'positive']].sum().sort_index()
+        for (date, language), (total, positive) in zip(batch.index, batch.itertuples(index=False)):
+            if self.committed_through is not None and date <= self.committed_through:
+                self.late_rows += int(total)
+                continue
+            if self.pending_date is not None and date > self.pending_date:
+                self._advance(date)
+            if self.pending_date is None:
+                self.pending_date = date
+            counts = self.pending.setdefault(language, [0, 0])
+            counts[0] += int(total)
+            counts[1] += int(positive)
+        return self
+
+    def _advance(self, date):
+        """잠정 날짜를 확정하고, date 전까지 리뷰가 없던 날은 리뷰 수 0으로 확정"""
+        self._commit(self.pending_date, self.pending)
+        day = self.pending_date + pd.Timedelta(days=1)
+        while day < date:
+            self._commit(day, {})
+            day += pd.Timedelta(days=1)
+        self.pending_date = date
+        self.pending = {}
+
+    def provisional(self):
+        """아직 확정하지 않은 가장 최근 날짜의 잠정 경보 (상태는 바꾸지 않음)
+
+        하루가 다 지나기 전의 리뷰 수는 늘어날 일만 남았으므로 리뷰 수 급감은 잠정 경보로 내지 않는다.
+        """
+        if self.pending_date is None:
+            return []
+        records = []
+        for language, metric, value, std_floor in self._observations(self.pending):
+            monitor = self.monitors[(language, metric)]
+            z, _, _, rule = monitor.score(value, std_floor)
+            if rule and not (metric == 'count' and z < 0):
+                records.append(self._record(self.pending_date, language, metric, value, monitor.mean, z, rule, True))
+        return records
+
+    def anomalies(self, language=None, metric=None, since=None):
+        """경보 목록 DataFrame (확정 + 잠정, 날짜순). language/metric/since(이 날짜 이후)로 거를 수 있음"""
+        frame = pd.DataFrame(self.flagged + self.provisional(), columns=ANOMALY_COLUMNS)
+        if language is not None:
+            frame = frame[frame['language'] == language]
+        if metric is not None:
+            frame = frame[frame['metric'] == metric]
+        if since is not None:
+            frame = frame[frame['date'] >= pd.Timestamp(since)]
+        return frame.sort_values('date', kind='stable').reset_index(drop=True)
+
+    def windows(self, metric, language=ALL_LANGUAGES):
+        """연속된 경보 날짜를 묶은 구간 목록 [(시작일, 끝일, 방향)] (차트 음영용)"""
+        windows = []
+        for record in self.anomalies(language, metric).itertuples(index=False):
+            if windows and windows[-1][2] == record.direction and record.date - windows[-1][1] <= pd.Timedelta(days=1):
+                windows[-1] = (windows[-1][0], record.date, record.direction)
+            else:
+                windows.append((record.date, record.date, record.direction))
+        return windows
+
+    def resume_date(self):
+        """이어서 반영할 첫 날짜 (잠정 날짜는 저장하지 않으므로 확정된 다음 날부터 다시 넣어야 함)"""
+        return self.committed_through + pd.Timedelta(days=1) if self.committed_through is not None else None
+
+    def to_state(self):
+        """JSON으로 저장할 수 있는 확정 상태 (잠정 날짜의 누적분은 빼므로 resume_date()부터 다시 넣어야 함)"""
+        return {
+            'params': self.params,
+            'min_reviews': self.min_reviews,
+            'committed_through': self.committed_through.isoformat() if self.committed_through is not None else None,
+            'monitors': [[language, metric, monitor.to_state()]
+                         for (language, metric), monitor in self.monitors.items()],
+            'flagged': [{**record, 'date': record['date'].isoformat()} for record in self.flagged],
+            'late_rows': self.late_rows
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        detector = cls(min_reviews=state['min_reviews'], **state['params'])
+        if state['committed_through']:
+            detector.committed_through = pd.Timestamp(state['committed_through'])
+        for language, metric, monitor_state in state['monitors']:
+            detector._monitor(language, metric).load_state(monitor_state)
+        detector.flagged = [{**record, 'date': pd.Timestamp(record['date'])} for record in state['flagged']]
+        detector.late_rows = state['late_rows']
+        return detector
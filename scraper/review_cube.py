@@ -0,0 +1,142 @@
+import hashlib
+
+import pandas as pd
+
+from .metrics import timed
+
+CUBE_DIMENSIONS = ['date', 'language', 'recommended']
+CUBE_MEASURES = ['count', 'playtime_sum', 'votes_up_sum', 'comment_sum', 'scored', 'polarity_sum']
+
+# 감성 점수 합만 실수이고 나머지 집계값은 정수
+CUBE_DTYPES = {measure: 'int64' for measure in CUBE_MEASURES} | {'polarity_sum': 'float64'}
+
+
+class ReviewCube:
+    """(날짜 × 언어 × 추천 여부)별 리뷰 수/플레이타임 합/추천 수 합/댓글 수 합/감성 점수 합을 미리 집계한 큐브
+
+    리뷰 배치가 들어올 때마다 그 배치만 한 번 묶어 기존 셀에 더하므로,
+    차트·표·요약을 만드는 비용은 리뷰 수가 아니라 날짜 수 × 언어 수에 비례한다.
+    """
+
+    def __init__(self):
+        self.cells = pd.DataFrame(
+            columns=CUBE_MEASURES,
+            index=pd.MultiIndex.from_tuples([], names=CUBE_DIMENSIONS)
+        ).astype(CUBE_DTYPES)
+
+    @classmethod
+    def from_reviews(cls, reviews_df):
+        return cls().add(reviews_df)
+
+    @property
+    def empty(self):
+        return self.cells.empty
+
+    @timed('steam_analysis_seconds', function='review_cube_add')
+    def add(self, reviews_df):
+        """리뷰 배치를 집계해 큐브에 더함"""
+        if reviews_df.empty:
+            return self
+
+        keys = [
+            reviews_df['timestamp'].dt.normalize().rename('date'),
+            reviews_df['language'].astype(str),
+            reviews_df['recommended'].astype(bool)
+        ]
+        # 감성 점수가 없는(채점 전) 리뷰는 scored에 세지 않아 평균에서 빠짐
+        polarity = reviews_df['polarity'] if 'polarity' in reviews_df else pd.Series(float('nan'), index=reviews_df.index)
+        batch = reviews_df.assign(polarity=polarity).groupby(keys, sort=False, dropna=False).agg(
+            count=('review_id', 'size'),
+            playtime_sum=('playtime', 'sum'),
+            votes_up_sum=('votes_up', 'sum'),
+            comment_sum=('comment_count', 'sum'),
+            scored=('polarity', 'count'),
+            polarity_sum=('polarity', 'sum')
+        ).astype(CUBE_DTYPES)
+
+        if self.cells.empty:
+            self.cells = batch.sort_index()
+        else:
+            self.cells = pd.concat([self.cells, batch]).groupby(level=CUBE_DIMENSIONS).sum()
+        return self
+
+    def fingerprint(self):
+        """셀 내용 기반 해시 (캐시 키로 사용)"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(self.cells, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _by(self, level):
+        """level별 전체/긍정 리뷰 수와 평균 감성 점수 (level, total, positive, avg_polarity)"""
+        if self.cells.empty:
+            return pd.DataFrame(columns=[level, 'total', 'positive', 'avg_polarity'])
+        counts = self.cells['count'].groupby(level=[level, 'recommended']).sum()
+        counts = counts.unstack('recommended', fill_value=0).reindex(columns=[False, True], fill_value=0)
+        polarity = self.cells[['scored', 'polarity_sum']].groupby(level=level).sum().reindex(counts.index)
+        return pd.DataFrame({
+            level: counts.index,
+            'total': counts[False].to_numpy() + counts[True].to_numpy(),
+            'positive': counts[True].to_numpy(),
+            # 채점된 리뷰가 없으면 NaN
+            'avg_polarity': (polarity['polarity_sum'] / polarity['scored'].where(polarity['scored'] > 0)).to_numpy()
+        })
+
+    @timed('steam_analysis_seconds', function='review_cube_daily')
+    def daily(self):
+        """날짜별 전체/긍정 리뷰 수 (date는 datetime.date)"""
+        frame = self._by('date')
+        frame['date'] = pd.to_datetime(frame['date']).dt.date
+        return frame
+
+    def daily_languages(self):
+        """(날짜, 언어)별 전체/긍정 리뷰 수 (date, language, total, positive), 날짜순"""
+        if self.cells.empty:
+            return pd.DataFrame(columns=['date', 'language', 'total', 'positive'])
+        counts = self.cells['count'].groupby(level=['date', 'language', 'recommended']).sum()
+        counts = counts.unstack('recommended', fill_value=0).reindex(columns=[False, True], fill_value=0)
+        return pd.DataFrame({
+            'total': counts[False] + counts[True],
+            'positive': counts[True]
+        }).reset_index().sort_values(['date', 'language'], kind='stable').reset_index(drop=True)
+
+    @timed('steam_analysis_seconds', function='review_cube_languages')
+    def languages(self):
+        """언어별 전체/긍정 리뷰 수 (리뷰가 많은 언어 순)"""
+        return self._by('language').sort_values('total', ascending=False, kind='stable').reset_index(drop=True)
+
+    @timed('steam_analysis_seconds', function='review_cube_summary')
+    def summary(self):
+        """analyze_reviews와 같은 형식의 요약"""
+        if self.cells.empty:
+            return {
+                'total_reviews': 0,
+                'languages': {},
+                'avg_playtime': 0,
+                'avg_votes': 0,
+                'total_comments': 0,
+                'avg_polarity': None,
+                'recommendations': {
+                    'recommended': 0,
+                    'not_recommended': 0,
+                    'recommend_percent': 0
+                }
+            }
+
+        totals = self.cells.sum()
+        total_reviews = int(totals['count'])
+        languages = self.languages()
+        recommended_count = int(languages['positive'].sum())
+
+        return {
+            'total_reviews': total_reviews,
+            'languages': dict(zip(languages['language'], languages['total'].astype(int))),
+            'avg_playtime': totals['playtime_sum'] / total_reviews / 60,  # 시간 단위로 변환
+            'avg_votes': totals['votes_up_sum'] / total_reviews,
+            'total_comments': int(totals['comment_sum']),
+            'avg_polarity': totals['polarity_sum'] / totals['scored'] if totals['scored'] else None,
+            'recommendations': {
+                'recommended': recommended_count,
+                'not_recommended': total_reviews - recommended_count,
+                'recommend_percent': round(recommended_count / total_reviews * 100, 1)
+            }
+        }
@@ -1,147 +1,324 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
-import time
+import pyarrow as pa
+from .http_client import get_default_client
+from .metrics import get_default_metrics, timed
+from .rate_limiter import get_default_rate_limiter
+from .review_cube import ReviewCube
+from .review_store import ReviewStore
+from .schema import INT32_MAX, concat_tables, make_table
 
 class SteamReviewScraper:
-    def __init__(self, app_id):
+    def __init__(self, app_id, client=None, rate_limiter=None, sentiment_scorer=None, metrics=None):
         self.app_id = app_id
+        self.client = client or get_default_client()
+        # 파싱·변환 시간과 페이지 수를 기록할 지표 저장소 (요청 지표는 클라이언트가 기록)
+        self.metrics = metrics or get_default_metrics()
+        # 여러 게임을 함께 수집할 때 공유하는 호스트별 요청 속도 제한 (주지 않으면 프로세스 전체의 기본 제한기)
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        # 지정하면 리뷰 배치마다 polarity/subjectivity 컬럼을 채움
+        self.sentiment_scorer = sentiment_scorer
         self.base_url = f"https://store.steampowered.com/appreviews/{app_id}"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
         }
 
-    def get_reviews(self, min_playtime=0, start_date=None, end_date=None, max_pages=5):
-        reviews = []
-        cursor = "*"
-        min_playtime_minutes = min_playtime * 60
-        
-        print(f"검색 시작 - 게임 ID: {self.app_id}")
-        print(f"검색 기간: {start_date} ~ {end_date}")
-        print(f"최소 플레이타임: {min_playtime}시간")
-        
-        for page in range(max_pages):
+    def _parse_review(self, review, review_date):
+        """API 응답의 리뷰 하나를 행(dict)으로 변환"""
+        return {
+            'review_id': str(review['recommendationid']),
+            'author': int(review['author'].get('steamid') or 0),
+            'playtime': review['author'].get('playtime_forever', 0),
+            'content': review.get('review', ''),
+            'language': review.get('language', 'unknown'),
+            'timestamp': review_date,
+            'votes_up': min(review.get('votes_up', 0), INT32_MAX),
+            'votes_funny': min(review.get('votes_funny', 0), INT32_MAX),
+            'recommended': review.get('voted_up', False),
+            'comment_count': review.get('comment_count', 0)
+        }
+
+    def _iter_review_pages(self, max_pages, stats, position=None):
+        """작성 시각 역순(filter=recent)으로 리뷰 페이지를 차례로 반환
+
+        stats에 요청한 페이지 수를 기록하고, 피드 끝까지 읽었으면
+        stats['exhausted']를 True로 설정한다. 요청이 실패해 중간에 멈추면
+        stats['error']에 오류를 남긴다. position({'cursor', 'page'})을 주면 그 위치부터
+        읽고, 페이지를 내보낼 때마다 "이 페이지를 처리한 뒤 이어 읽을 위치"로 갱신한다.
+        """
+        if position is None:
+            position = {}
+        cursor = position.setdefault('cursor', "*")
+        page = position.setdefault('page', 0)
+        stats.setdefault('pages_fetched', 0)
+        stats['exhausted'] = False
+        stats.pop('error', None)
+
+        while max_pages is None or page < max_pages:
             try:
                 params = {
                     'json': 1,
                     'cursor': cursor,
                     'num_per_page': 100,
-                    'filter': 'all',
+                    'filter': 'recent',
                     'language': 'all',
                     'review_type': 'all',
-                    'purchase_type': 'all',
-                    'day_range': (end_date - start_date).days
+                    'purchase_type': 'all'
                 }
-                
-                response = requests.get(self.base_url, params=params, headers=self.headers)
+
+                response = self.client.get(self.base_url, params=params, headers=self.headers,
+                                           rate_limiter=self.rate_limiter)
                 response.raise_for_status()
-                data = response.json()
-                
-                if not data.get('success') or not data.get('reviews'):
-                    print(f"페이지 {page+1}: 데이터 없음 또는 API 응답 실패")
-                    break
-                
+                with self.metrics.timer('steam_parse_seconds', kind='review_json'):
+                    data = response.json()
+                stats['pages_fetched'] += 1
+                self.metrics.inc('steam_pages_total', kind='reviews')
+
+                if not data.get('success'):
+                    print(f"페이지 {page+1}: API 응답 실패")
+                    stats['error'] = "API 응답 실패"
+                    return
+                if not data.get('reviews'):
+                    print(f"페이지 {page+1}: 더 이상 리뷰가 없음")
+                    stats['exhausted'] = True
+                    return
+
                 print(f"페이지 {page+1}: {len(data['reviews'])}개 리뷰 발견")
-                
-                for review in data['reviews']:
-                    try:
-                        timestamp = review.get('timestamp_created')
-                        if not timestamp:
-                            continue
-                            
-                        review_date = datetime.fromtimestamp(timestamp)
-                        playtime = review['author'].get('playtime_forever', 0)
-                        
-                        if (start_date <= review_date <= end_date and 
-                            playtime >= min_playtime_minutes):
-                            
-                            reviews.append({
-                                'author': review['author'].get('steamid', 'Unknown'),
-                                'playtime': playtime,
-                                'content': review.get('review', ''),
-                                'language': review.get('language', 'unknown'),
-                                'timestamp': review_date,
-                                'votes_up': review.get('votes_up', 0),
-                                'votes_funny': review.get('votes_funny', 0),
-                                'recommended': review.get('voted_up', False),
-                                'comment_count': review.get('comment_count', 0)
-                            })
-                            
-                    except Exception as e:
-                        print(f"리뷰 처리 중 오류: {e}")
-                        continue
-                
                 cursor = data.get('cursor', '')
+                page += 1
+                position.update(cursor=cursor, page=page)
+                yield data['reviews']
+
                 if not cursor:
                     print("더 이상 페이지가 없음")
-                    break
-                    
-                time.sleep(1)
-                
+                    stats['exhausted'] = True
+                    return
+
             except requests.exceptions.RequestException as e:
                 print(f"API 요청 중 오류: {e}")
-                break
+                stats['error'] = str(e)
+                return
             except Exception as e:
                 print(f"처리 중 오류: {e}")
+                stats['error'] = str(e)
+                return
+
+    def iter_reviews(self, min_playtime=0, start_date=None, end_date=None, max_pages=None,
+                     batch_size=1000, as_arrow=False, stats=None, checkpoint=None):
+        """기간 내 리뷰를 batch_size개씩 나눠 순차적으로 반환
+
+        페이지를 받는 대로 배치를 채워 내보내므로 메모리 사용량은 전체
+        수집량이 아니라 배치 크기에 비례한다. max_pages=None이면 기간을
+        벗어나거나 피드가 끝날 때까지 계속 읽는다. 리뷰를 작성 시각
+        역순으로 읽으므로 end_date보다 새로운 페이지는 건너뛰고,
+        start_date보다 오래된 리뷰가 나오면 바로 멈춘다.
+        as_arrow=True이면 DataFrame 대신 pyarrow RecordBatch를 반환한다.
+
+        checkpoint(CrawlCheckpoint)를 주면 페이지가 끝날 때마다 남은 리뷰를 배치로
+        내보내고, 호출한 쪽이 그 배치를 처리한 뒤 커서와 통계를 기록한다. 같은 조건으로
+        다시 실행하면 마지막으로 처리한 페이지 다음부터 이어 읽고, 끝까지 읽으면
+        체크포인트를 지운다.
+        """
+        min_playtime_minutes = min_playtime * 60
+        if stats is None:
+            stats = {}
+        stats.update({
+            'pages_fetched': 0,
+            'pages_skipped': 0,      # 기간보다 새로운 리뷰만 있어 건너뛴 페이지
+            'rows_discarded': 0,     # 기간 밖이거나 플레이타임이 부족해 버린 리뷰
+            'rows_collected': 0,
+            'stopped_early': False   # start_date를 지나 조기 종료했는지 여부
+        })
+        state = checkpoint.state if checkpoint is not None else None
+        position = dict(state['position']) if state else {}
+        if state:
+            stats.update(state['stats'])
+            print(f"체크포인트에서 이어서 수집 ({position['page'] + 1}페이지부터)")
+        batch = []
+
+        for page_reviews in self._iter_review_pages(max_pages, stats, position):
+            in_range_on_page = 0
+            newer_on_page = 0
+
+            for review in page_reviews:
+                try:
+                    timestamp = review.get('timestamp_created')
+                    if not timestamp:
+                        continue
+                    # ID가 없는 리뷰는 저장소에서 서로 같은 키('')로 합쳐지므로 버림
+                    if not review.get('recommendationid'):
+                        stats['rows_discarded'] += 1
+                        continue
+                        
+                    review_date = datetime.fromtimestamp(timestamp)
+                    if end_date and review_date > end_date:
+                        newer_on_page += 1
+                        stats['rows_discarded'] += 1
+                        continue
+                    if start_date and review_date < start_date:
+                        stats['stopped_early'] = True
+                        break
+
+                    in_range_on_page += 1
+                    playtime = review['author'].get('playtime_forever', 0)
+                    if playtime >= min_playtime_minutes:
+                        batch.append(self._parse_review(review, review_date))
+                    else:
+                        stats['rows_discarded'] += 1
+                        
+                except Exception as e:
+                    print(f"리뷰 처리 중 오류: {e}")
+                    continue
+
+            while len(batch) >= batch_size:
+                stats['rows_collected'] += batch_size
+                yield self._make_batch(batch[:batch_size], as_arrow)
+                batch = batch[batch_size:]
+
+            if in_range_on_page == 0 and newer_on_page > 0 and not stats['stopped_early']:
+                stats['pages_skipped'] += 1
+            if checkpoint is not None:
+                # 기록한 위치 앞의 리뷰는 모두 호출한 쪽에 넘어간 상태여야 하므로 남은 리뷰도 내보냄
+                if batch:
+                    stats['rows_collected'] += len(batch)
+                    yield self._make_batch(batch, as_arrow)
+                    batch = []
+                checkpoint.save({'position': position, 'stats': stats})
+            if stats['stopped_early']:
+                print("검색 시작일 이전 리뷰에 도달해 수집 종료")
                 break
+
+        if batch:
+            stats['rows_collected'] += len(batch)
+            yield self._make_batch(batch, as_arrow)
+        # 요청 오류로 멈췄으면 체크포인트를 남겨 다음 실행이 그 페이지부터 다시 받게 함
+        if checkpoint is not None and 'error' not in stats:
+            checkpoint.clear()
+
+    def _make_batch(self, rows, as_arrow=False):
+        """행 목록을 타입이 고정된 DataFrame (또는 RecordBatch)으로 변환"""
+        with self.metrics.timer('steam_transform_seconds', step='review_table'):
+            df = make_table('reviews', rows)
+        if self.sentiment_scorer is not None:
+            df = self.sentiment_scorer.score_reviews(df)
+        if as_arrow:
+            return pa.RecordBatch.from_pandas(df, preserve_index=False)
+        return df
+
+    def get_reviews(self, min_playtime=0, start_date=None, end_date=None, max_pages=5):
+        """기간 내 리뷰를 모두 모아 하나의 DataFrame으로 반환
+
+        수집 통계는 self.last_crawl_stats에 남긴다.
+        """
+        stats = {}
+        self.last_crawl_stats = stats
+        
+        print(f"검색 시작 - 게임 ID: {self.app_id}")
+        print(f"검색 기간: {start_date} ~ {end_date}")
+        print(f"최소 플레이타임: {min_playtime}시간")
         
-        df = pd.DataFrame(reviews)
+        batches = list(self.iter_reviews(
+            min_playtime=min_playtime,
+            start_date=start_date,
+            end_date=end_date,
+            max_pages=max_pages,
+            stats=stats
+        ))
+        df = concat_tables('reviews', batches)
         
+        print(f"\n최종 수집 결과:")
+        print(f"- 요청한 페이지 수: {stats['pages_fetched']}개 (기간 밖이라 건너뛴 페이지 {stats['pages_skipped']}개)")
+        print(f"- 제외된 리뷰 수: {stats['rows_discarded']}개")
+
         if df.empty:
             print("수집된 리뷰가 없습니다.")
-            return pd.DataFrame(columns=[
-                'author', 'playtime', 'content', 'language', 
-                'timestamp', 'votes_up', 'votes_funny', 
-                'recommended', 'comment_count'
-            ])
+            return df
         
-        # 날짜 범위로 한 번 더 필터링
-        df = df[
-            (df['timestamp'] >= start_date) & 
-            (df['timestamp'] <= end_date)
-        ]
-        
-        print(f"\n최종 수집 결과:")
         print(f"- 총 리뷰 수: {len(df)}개")
         print(f"- 기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
         print(f"- 언어: {df['language'].unique().tolist()}")
         
         return df
 
-    def analyze_reviews(self, df):
-        """리뷰 분석 결과 반환"""
-        if df.empty:
-            return {
-                'total_reviews': 0,
-                'languages': {},
-                'avg_playtime': 0,
-                'avg_votes': 0,
-                'total_comments': 0,
-                'recommendations': {
-                    'recommended': 0,
-                    'not_recommended': 0,
-                    'recommend_percent': 0
-                }
-            }
-            
-        # 추천 분석
-        recommended_count = df['recommended'].sum()
-        total_reviews = len(df)
-        not_recommended_count = total_reviews - recommended_count
-        recommend_percent = (recommended_count / total_reviews * 100) if total_reviews > 0 else 0
-            
-        analysis = {
-            'total_reviews': total_reviews,
-            'languages': df['language'].value_counts().to_dict(),
-            'avg_playtime': df['playtime'].mean() / 60,  # 시간 단위로 변환
-            'avg_votes': df['votes_up'].mean(),
-            'total_comments': df['comment_count'].sum(),
-            'recommendations': {
-                'recommended': int(recommended_count),
-                'not_recommended': int(not_recommended_count),
-                'recommend_percent': round(recommend_percent, 1)
-            }
-        }
-        return analysis 
\ No newline at end of file
+    @staticmethod
+    @timed('steam_analysis_seconds', function='analyze_reviews')
+    def analyze_reviews(df):
+        """리뷰 분석 결과 반환 (이미 집계된 ReviewCube가 있으면 cube.summary()를 바로 사용)"""
+        return ReviewCube.from_reviews(df).summary()
+
+    def sync_new_reviews(self, store=None, max_pages=50, search_index=None, checkpoint=None):
+        """저장된 워터마크 이후에 작성된 리뷰만 받아 로컬 저장소에 병합하고 이번 실행에서 추가된 리뷰 수 반환
+
+        작성 시각 역순(filter=recent)으로 페이지를 넘기다가 이미 가진
+        리뷰에 도달하면 즉시 멈춘다. 수집 통계는 self.last_crawl_stats에 남긴다.
+        search_index를 주면 새 리뷰를 전문 검색 색인에도 넣는다.
+
+        새 리뷰는 페이지마다 바로 병합하므로 중간에 실패해도 받은 페이지는 남는다.
+        checkpoint를 주면 페이지마다 커서를 기록해, 다시 실행하면 멈춘 페이지 다음부터
+        최대 max_pages페이지를 더 받고, 워터마크는 기존 리뷰까지 이어졌을 때만 옮긴다.
+        checkpoint 없이 max_pages페이지를 다 받으면 그보다 오래된 빈 구간은 포기하고 워터마크를
+        옮긴다 (그러지 않으면 다음 실행도 같은 최신 구간만 다시 받아 워터마크가 영영 생기지 않음).
+        """
+        store = store or ReviewStore()
+        watermark = store.get_watermark(self.app_id)
+        state = checkpoint.state if checkpoint is not None else None
+        position = dict(state['position']) if state else {}
+        stats = dict(state['stats']) if state else {}
+        added = 0
+        # 이번 동기화에서 본 가장 최근 리뷰 (끝까지 이어지면 새 워터마크가 됨)
+        newest = state['newest'] if state else None
+        reached_known = False
+        self.last_crawl_stats = stats
+
+        if state:
+            print(f"체크포인트에서 이어서 동기화 - 게임 ID: {self.app_id} ({position['page'] + 1}페이지부터)")
+        elif watermark:
+            print(f"증분 동기화 시작 - 게임 ID: {self.app_id} (기준 리뷰: {watermark['recommendationid']})")
+        else:
+            print(f"전체 동기화 시작 - 게임 ID: {self.app_id}")
+
+        for page_reviews in self._iter_review_pages(position.get('page', 0) + max_pages, stats, position):
+            new_reviews = []
+            for review in page_reviews:
+                timestamp = review.get('timestamp_created')
+                if not timestamp or not review.get('recommendationid'):
+                    continue
+                if watermark and (
+                    str(review.get('recommendationid')) == watermark['recommendationid'] or
+                    timestamp < watermark['timestamp_created']
+                ):
+                    reached_known = True
+                    break
+                new_reviews.append(self._parse_review(review, datetime.fromtimestamp(timestamp)))
+                if newest is None or timestamp > newest['timestamp_created']:
+                    newest = {'timestamp_created': timestamp, 'recommendationid': str(review['recommendationid'])}
+
+            new_df = self._make_batch(new_reviews)
+            added += store.merge(self.app_id, new_df, update_watermark=False)
+            if search_index is not None:
+                search_index.add_reviews(self.app_id, new_df)
+            print(f"새 리뷰 누적 {added}개")
+            if checkpoint is not None:
+                checkpoint.save({'position': position, 'stats': stats, 'newest': newest})
+            if reached_known:
+                break
+
+        completed = reached_known or stats['exhausted']
+        # 체크포인트가 있으면 기존 데이터까지 이어질 때까지 워터마크를 두고 다음 실행이 빈 구간을 이어 받음
+        if completed or (checkpoint is None and 'error' not in stats):
+            if not completed:
+                print(f"최근 {stats['pages_fetched']}페이지까지만 동기화 (그 이전 리뷰는 받지 않음)")
+            if newest:
+                store.set_watermark(self.app_id, newest)
+            if checkpoint is not None:
+                checkpoint.clear()
+        return added
+
+    def sync_reviews(self, store=None, max_pages=50):
+        """sync_new_reviews로 새 리뷰를 병합한 뒤 저장된 전체 리뷰를 반환"""
+        store = store or ReviewStore()
+        added = self.sync_new_reviews(store, max_pages)
+        merged = store.load(self.app_id)
+        print(f"새 리뷰 {added}개 병합 완료 (저장된 리뷰 총 {len(merged)}개)")
+        return merged
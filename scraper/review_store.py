@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+from .dataset_store import SteamDatasetStore
+from .schema import REVIEW_DTYPES
+
+
+class ReviewStore:
+    """게임별 리뷰 데이터와 증분 동기화 워터마크를 보관하는 로컬 저장소
+
+    리뷰 행은 SteamDatasetStore의 reviews 테이블(app_id/작성일 파티션)에 저장된다.
+    """
+
+    def __init__(self, root='data/dataset', dataset=None):
+        self.dataset = dataset or SteamDatasetStore(root)
+        self.watermark_path = os.path.join(self.dataset.root, 'review_watermarks.json')
+        self._lock = threading.Lock()
+        # 게임별로 저장된 review_id 집합 (처음 병합할 때 한 번만 읽고 이후에는 추가분만 반영)
+        self._known_ids = {}
+
+    def _load_watermarks(self):
+        if not os.path.exists(self.watermark_path):
+            return {}
+        with open(self.watermark_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def get_watermark(self, app_id):
+        """가장 최근에 본 리뷰의 작성 시각과 recommendationid (없으면 None)"""
+        with self._lock:
+            return self._load_watermarks().get(str(app_id))
+
+    def load(self, app_id, start_date=None, end_date=None, columns=None):
+        """저장된 리뷰 로드 (최신순)"""
+        df = self.dataset.load('reviews', app_ids=app_id, start_date=start_date,
+                               end_date=end_date, columns=columns)
+        df = df.astype({column: dtype for column, dtype in REVIEW_DTYPES.items() if column in df.columns})
+        if df.empty or 'timestamp' not in df.columns:
+            return df
+        return df.sort_values('timestamp', ascending=False).reset_index(drop=True)
+
+    def set_watermark(self, app_id, watermark):
+        """가장 최근에 본 리뷰({'timestamp_created', 'recommendationid'})를 워터마크로 기록"""
+        with self._lock:
+            self._write_watermark(app_id, watermark)
+
+    def _write_watermark(self, app_id, watermark):
+        watermarks = self._load_watermarks()
+        watermarks[str(app_id)] = {
+            'timestamp_created': int(watermark['timestamp_created']),
+            'recommendationid': str(watermark['recommendationid'])
+        }
+        with open(self.watermark_path, 'w', encoding='utf-8') as f:
+            json.dump(watermarks, f, ensure_ascii=False, indent=2)
+
+    def _known_review_ids(self, app_id):
+        key = str(app_id)
+        if key not in self._known_ids:
+            # review_id 컬럼만 읽어 이미 저장된 리뷰 집합을 만듦
+            self._known_ids[key] = set(self.dataset.load('reviews', app_ids=app_id, columns=['review_id'])['review_id'])
+        return self._known_ids[key]
+
+    def merge(self, app_id, new_reviews, update_watermark=True):
+        """새 리뷰 중 아직 없는 것만 추가하고 워터마크 갱신
+
+        수집이 중간에 끊겨 기존 워터마크까지 도달하지 못했다면
+        update_watermark=False로 호출해 그 사이 리뷰가 누락되지 않게 한다.
+        겹치는 구간을 여러 번 받아도 review_id로 걸러 한 번만 저장한다.
+        추가된 리뷰 수를 반환한다.
+        """
+        with self._lock:
+            if new_reviews.empty:
+                return 0
+
+            known_ids = self._known_review_ids(app_id)
+            unseen = new_reviews.drop_duplicates(subset='review_id')
+            unseen = unseen[~unseen['review_id'].isin(known_ids)]
+            added = self.dataset.append_reviews(app_id, unseen)
+            known_ids.update(unseen['review_id'])
+
+            if not update_watermark:
+                return added
+
+            # 이전에 저장만 하고 워터마크는 못 옮긴 리뷰도 있을 수 있으므로 받은 리뷰 전체에서 최신을 고름
+            newest = new_reviews.sort_values('timestamp', ascending=False).iloc[0]
+            self._write_watermark(app_id, {
+                # timestamp는 datetime.fromtimestamp로 만든 로컬 시각이므로 같은 방식으로 되돌림
+                'timestamp_created': newest['timestamp'].to_pydatetime().timestamp(),
+                'recommendationid': newest['review_id']
+            })
+
+            return added
@@ -0,0 +1,147 @@
+from datetime import datetime
+from urllib.parse import urlparse
+
+import pandas as pd
+
+# 문자열 컬럼은 파이썬 객체 대신 Arrow 버퍼에 저장 (메모리 절약, Parquet 변환 시 복사 없음)
+ARROW_STRING = pd.StringDtype('pyarrow')
+
+# Steam API가 가끔 votes_funny 등에 4294967295 같은 비정상 값을 주므로 int32 범위로 자름
+INT32_MAX = 2**31 - 1
+
+REVIEW_COLUMNS = [
+    'review_id', 'author', 'playtime', 'content', 'language',
+    'timestamp', 'votes_up', 'votes_funny',
+    'recommended', 'comment_count'
+]
+
+REVIEW_DTYPES = {
+    'review_id': ARROW_STRING,
+    'author': 'uint64',           # steamid (64비트 숫자)
+    'playtime': 'int32',          # 분 단위
+    'content': ARROW_STRING,
+    'language': 'category',
+    'timestamp': 'datetime64[us]',
+    'votes_up': 'int32',
+    'votes_funny': 'int32',
+    'recommended': 'bool',
+    'comment_count': 'int32',
+    # 텍스트 감성 점수 (SentimentScorer로 채점하기 전에는 NaN)
+    'polarity': 'float32',        # -1(부정) ~ 1(긍정)
+    'subjectivity': 'float32'     # 0(객관) ~ 1(주관)
+}
+
+DISCUSSION_DTYPES = {
+    'discussion_id': ARROW_STRING,
+    'title': ARROW_STRING,
+    'url': ARROW_STRING,
+    'reply_count': 'int32',
+    'author': ARROW_STRING,
+    # 'date'는 파티션 컬럼 이름이므로 마지막 글 시각은 last_post로 저장
+    'last_post': ARROW_STRING,
+    'content': ARROW_STRING,
+    'comment_count': 'int32',
+    'collected_at': 'datetime64[us]',
+    'polarity': 'float32',
+    'subjectivity': 'float32'
+}
+
+COMMENT_DTYPES = {
+    'discussion_id': ARROW_STRING,
+    'comment_index': 'int32',
+    'comment_id': ARROW_STRING,
+    'author': ARROW_STRING,
+    'content': ARROW_STRING,
+    'posted_at': ARROW_STRING,
+    'polarity': 'float32',
+    'subjectivity': 'float32'
+}
+
+MEDIA_DTYPES = {
+    'discussion_id': ARROW_STRING,
+    'comment_index': 'int32',     # 본문 미디어는 -1
+    'type': 'category',
+    'url': ARROW_STRING
+}
+
+TABLE_DTYPES = {
+    'reviews': REVIEW_DTYPES,
+    'discussions': DISCUSSION_DTYPES,
+    'comments': COMMENT_DTYPES,
+    'media': MEDIA_DTYPES
+}
+
+
+def make_table(table, rows):
+    """행 목록을 테이블 스키마에 맞는 타입의 DataFrame으로 변환"""
+    dtypes = TABLE_DTYPES[table]
+    return pd.DataFrame(rows, columns=list(dtypes)).astype(dtypes)
+
+
+def concat_tables(table, frames):
+    """같은 테이블의 조각들을 합치고 스키마 타입을 다시 적용
+
+    범주형 컬럼은 조각마다 범주 목록이 달라 그냥 합치면 object로 바뀌므로
+    합친 뒤 다시 범주형으로 되돌린다.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return make_table(table, [])
+    return pd.concat(frames, ignore_index=True).astype(TABLE_DTYPES[table])
+
+
+def discussion_id_from_url(url):
+    """토론 URL의 마지막 숫자 구간을 토론 ID로 사용"""
+    segments = [segment for segment in urlparse(url or '').path.split('/') if segment.isdigit()]
+    return segments[-1] if segments else url
+
+
+def comment_key(discussion_id, comment_id, comment_index):
+    """검색 색인/감성 캐시에서 쓰는 댓글 문서 키 (댓글 ID가 없으면 순번 사용)"""
+    return f"comment:{discussion_id}:{comment_id if isinstance(comment_id, str) and comment_id else comment_index}"
+
+
+def normalize_discussions(discussions_df, collected_at=None):
+    """중첩된 댓글/미디어 목록을 토론·댓글·미디어 세 개의 평면 테이블로 분리"""
+    collected_at = collected_at or datetime.now()
+    discussions, comments, media = [], [], []
+
+    for row in discussions_df.to_dict('records'):
+        discussion_id = discussion_id_from_url(row.get('url', ''))
+        row_comments = row.get('comments') or []
+        discussions.append({
+            'discussion_id': discussion_id,
+            'title': row.get('title', ''),
+            'url': row.get('url', ''),
+            'reply_count': row.get('reply_count', 0),
+            'author': row.get('author', ''),
+            'last_post': row.get('date', ''),
+            'content': row.get('content', ''),
+            'comment_count': len(row_comments),
+            'collected_at': collected_at
+        })
+
+        # 본문 미디어는 comment_index -1로 저장
+        op_media = row.get('media') or {}
+        for link in op_media.get('media_links', []):
+            media.append({'discussion_id': discussion_id, 'comment_index': -1,
+                          'type': link['type'], 'url': link['url']})
+
+        for index, comment in enumerate(row_comments):
+            comments.append({
+                'discussion_id': discussion_id,
+                'comment_index': index,
+                'comment_id': comment.get('comment_id', ''),
+                'author': comment.get('author', ''),
+                'content': comment.get('content', ''),
+                'posted_at': comment.get('date', '')
+            })
+            for link in (comment.get('media') or {}).get('media_links', []):
+                media.append({'discussion_id': discussion_id, 'comment_index': index,
+                              'type': link['type'], 'url': link['url']})
+
+    return {
+        'discussions': make_table('discussions', discussions),
+        'comments': make_table('comments', comments),
+        'media': make_table('media', media)
+    }
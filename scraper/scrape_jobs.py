@@ -0,0 +1,326 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from .crawl_journal import get_default_journal
+from .dataset_store import SteamDatasetStore, row_keys
+from .discussion_scraper import SteamDiscussionScraper
+from .keyword_trends import KeywordTrends
+from .review_anomaly import ReviewAnomalyDetector
+from .review_cube import ReviewCube
+from .review_scraper import SteamReviewScraper
+from .review_store import ReviewStore
+from .schema import concat_tables, make_table
+from .search_index import get_default_search_index
+from .sentiment import get_default_scorer
+
+# 작업 상태: 대기 → 실행 중 → 완료/실패 (서버가 재시작되면 실행 중이던 작업은 중단됨)
+# 실패하거나 중단된 작업은 resume()으로 마지막 체크포인트부터 이어서 실행할 수 있음
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_INTERRUPTED = 'interrupted'
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+RESUMABLE_STATUSES = (JOB_FAILED, JOB_INTERRUPTED)
+
+# 작업 종류별로 배치에 담기는 테이블
+JOB_TABLES = {
+    'reviews': ['reviews'],
+    'discussions': ['discussions', 'comments', 'media']
+}
+
+# 리뷰 작업에서 중간 결과를 저장하는 단위 (API 한 페이지 = 최대 100개)
+REVIEW_JOB_BATCH_SIZE = 100
+
+JOB_COLUMNS = [
+    'job_id', 'kind', 'app_id', 'params', 'status', 'pages_done', 'pages_total',
+    'rows_done', 'stats', 'error', 'created_at', 'started_at', 'updated_at', 'finished_at'
+]
+
+
+class ScrapeJobManager:
+    """수집 작업을 백그라운드 워커 풀에서 실행하고 진행 상황을 SQLite 작업 테이블에 기록
+
+    작업마다 받은 배치(테이블 dict)를 {root}/{job_id}/batch-*.pkl로 바로 저장하므로,
+    화면이 새로고침되거나 다시 실행돼도 진행 중인 작업과 중간 결과를 그대로 볼 수 있다.
+    받은 배치는 감성 점수를 채운 뒤 저장하고 전문 검색 색인에도 바로 넣는다.
+    """
+
+    def __init__(self, root='data/jobs', max_workers=2, dataset_store=None, search_index=None,
+                 sentiment_scorer=None, journal=None, review_store=None):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.dataset_store = dataset_store
+        self.review_store = review_store
+        self.journal = journal or get_default_journal()
+        self.search_index = search_index or get_default_search_index()
+        self.sentiment_scorer = sentiment_scorer or get_default_scorer()
+        self._lock = threading.Lock()
+        self._results = {}
+        self._results_lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, 'jobs.sqlite'), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, app_id TEXT NOT NULL, params TEXT NOT NULL, "
+            "status TEXT NOT NULL, pages_done INTEGER NOT NULL DEFAULT 0, pages_total INTEGER, "
+            "rows_done INTEGER NOT NULL DEFAULT 0, stats TEXT, error TEXT, created_at REAL NOT NULL, "
+            "started_at REAL, updated_at REAL, finished_at REAL)"
+        )
+        # 이전 프로세스에서 끝나지 못한 작업은 더 이상 실행되지 않으므로 중단으로 표시
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE status IN (?, ?)",
+            (JOB_INTERRUPTED, time.time(), *ACTIVE_STATUSES)
+        )
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape-job')
+
+    def _job_dir(self, job_id):
+        return os.path.join(self.root, job_id)
+
+    def _create(self, kind, app_id, params, pages_total):
+        job_id = uuid.uuid4().hex[:12]
+        os.makedirs(self._job_dir(job_id), exist_ok=True)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, app_id, params, status, pages_total, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, str(app_id), json.dumps(params), JOB_QUEUED, pages_total, time.time())
+            )
+            self._conn.commit()
+        return job_id
+
+    def _update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        if 'stats' in fields:
+            fields['stats'] = json.dumps(fields['stats'])
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def _row_to_job(self, row):
+        job = dict(zip(JOB_COLUMNS, row))
+        job['params'] = json.loads(job['params'])
+        job['stats'] = json.loads(job['stats']) if job['stats'] else {}
+        job['eta_seconds'] = self.estimate_eta(job)
+        return job
+
+    def get(self, job_id):
+        """작업 하나의 상태 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, limit=20):
+        """최근 작업 목록 (최신순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    @staticmethod
+    def estimate_eta(job):
+        """지금까지의 페이지당 처리 속도로 남은 시간(초) 추정 (알 수 없으면 None)"""
+        if job['status'] != JOB_RUNNING or not job['pages_total'] or not job['pages_done']:
+            return None
+        elapsed = time.time() - job['started_at']
+        remaining = max(job['pages_total'] - job['pages_done'], 0)
+        return elapsed / job['pages_done'] * remaining
+
+    def submit_reviews(self, app_id, min_playtime=0, start_date=None, end_date=None,
+                       max_pages=None, save_to_dataset=False):
+        """리뷰 수집 작업 등록 후 작업 ID 반환"""
+        params = {
+            'min_playtime': min_playtime,
+            'start_date': start_date.isoformat() if start_date else None,
+            'end_date': end_date.isoformat() if end_date else None,
+            'max_pages': max_pages,
+            'save_to_dataset': save_to_dataset
+        }
+        job_id = self._create('reviews', app_id, params, max_pages)
+        self._executor.submit(self._run, job_id, self._run_reviews, app_id, params)
+        return job_id
+
+    def submit_discussions(self, app_id, max_pages=5, concurrency=1, save_to_dataset=False):
+        """토론 수집 작업 등록 후 작업 ID 반환"""
+        params = {'max_pages': max_pages, 'concurrency': concurrency, 'save_to_dataset': save_to_dataset}
+        job_id = self._create('discussions', app_id, params, max_pages)
+        self._executor.submit(self._run, job_id, self._run_discussions, app_id, params)
+        return job_id
+
+    def resume(self, job_id):
+        """실패하거나 중단된 작업을 마지막 체크포인트부터 이어서 실행 (배치는 같은 작업에 이어 붙음)"""
+        job = self.get(job_id)
+        if job is None or job['status'] not in RESUMABLE_STATUSES:
+            return False
+        runner = self._run_reviews if job['kind'] == 'reviews' else self._run_discussions
+        self._update(job_id, status=JOB_QUEUED, error=None, finished_at=None)
+        self._executor.submit(self._run, job_id, runner, job['app_id'], job['params'])
+        return True
+
+    def _checkpoint(self, job_id, kind, app_id, params):
+        """작업별 체크포인트 (같은 조건의 다른 작업과 섞이지 않도록 작업 ID도 키에 포함)"""
+        return self.journal.checkpoint(kind, app_id, {**params, 'job_id': job_id})
+
+    def _batch_count(self, job_id):
+        directory = self._job_dir(job_id)
+        return sum(1 for f in os.listdir(directory) if f.endswith('.pkl')) if os.path.isdir(directory) else 0
+
+    def _run(self, job_id, runner, app_id, params):
+        self._update(job_id, status=JOB_RUNNING, started_at=time.time())
+        try:
+            runner(job_id, app_id, params)
+            self._update(job_id, status=JOB_DONE, finished_at=time.time())
+        except Exception as e:
+            print(f"수집 작업 {job_id} 실패: {e}")
+            self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+
+    def _save_batch(self, job_id, index, tables):
+        """테이블 dict 배치를 임시 파일에 쓴 뒤 이름을 바꿔, 읽는 쪽이 쓰다 만 파일을 보지 않게 함"""
+        path = os.path.join(self._job_dir(job_id), f"batch-{index:05d}.pkl")
+        pd.to_pickle(tables, path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def _dataset(self):
+        if self.dataset_store is None:
+            self.dataset_store = SteamDatasetStore()
+        return self.dataset_store
+
+    def _reviews(self):
+        if self.review_store is None:
+            self.review_store = ReviewStore(dataset=self._dataset())
+        return self.review_store
+
+    def _run_reviews(self, job_id, app_id, params):
+        scraper = SteamReviewScraper(app_id, sentiment_scorer=self.sentiment_scorer)
+        checkpoint = self._checkpoint(job_id, 'reviews', app_id, params)
+        stats = {}
+        batches = scraper.iter_reviews(
+            min_playtime=params['min_playtime'],
+            start_date=datetime.fromisoformat(params['start_date']) if params['start_date'] else None,
+            end_date=datetime.fromisoformat(params['end_date']) if params['end_date'] else None,
+            max_pages=params['max_pages'],
+            batch_size=REVIEW_JOB_BATCH_SIZE,
+            stats=stats,
+            checkpoint=checkpoint
+        )
+        # 이어서 실행하면 이전 실행이 남긴 배치 뒤에 붙임
+        for index, batch in enumerate(batches, start=self._batch_count(job_id)):
+            self._save_batch(job_id, index, {'reviews': batch})
+            self.search_index.add_reviews(app_id, batch)
+            if params['save_to_dataset']:
+                # 같은 리뷰를 다시 받는 재실행/이어서 실행에서도 한 번만 저장되도록 review_id로 걸러 병합
+                # (기간/플레이 시간 조건으로 거른 리뷰라 증분 동기화 워터마크는 옮기지 않음)
+                self._reviews().merge(app_id, batch, update_watermark=False)
+            self._update(job_id, pages_done=stats['pages_fetched'], rows_done=stats['rows_collected'], stats=stats)
+        self._update(job_id, pages_done=stats.get('pages_fetched', 0), stats=stats)
+        if stats.get('error'):
+            raise RuntimeError(f"리뷰 요청 실패 (이어서 수집 가능): {stats['error']}")
+
+    def _run_discussions(self, job_id, app_id, params):
+        scraper = SteamDiscussionScraper(app_id, sentiment_scorer=self.sentiment_scorer)
+        checkpoint = self._checkpoint(job_id, 'discussions', app_id, params)
+        collected_at = datetime.now()
+        pages_done = checkpoint.state['page'] - 1 if checkpoint.state else 0
+        rows_done = self.get(job_id)['rows_done'] if checkpoint.state else 0
+        pages = scraper.iter_discussion_tables(max_pages=params['max_pages'], concurrency=params['concurrency'],
+                                               collected_at=collected_at, checkpoint=checkpoint)
+        try:
+            for index, tables in enumerate(pages, start=self._batch_count(job_id)):
+                self._save_batch(job_id, index, tables)
+                self.search_index.add_discussion_tables(app_id, tables, collected_at)
+                if params['save_to_dataset']:
+                    self._dataset().append_discussion_tables(app_id, tables, collected_at)
+                pages_done += 1
+                rows_done += len(tables['discussions'])
+                self._update(job_id, pages_done=pages_done, rows_done=rows_done, stats=scraper.last_crawl_stats)
+        finally:
+            scraper.close()
+        if scraper.last_crawl_stats.get('error'):
+            raise RuntimeError(f"토론 목록 요청 실패 (이어서 수집 가능): {scraper.last_crawl_stats['error']}")
+
+    def _load(self, job_id):
+        """새로 생긴 배치만 읽어 테이블별 누적 DataFrame (리뷰 작업이면 ReviewCube, KeywordTrends도)을 갱신
+
+        리뷰 작업은 최신 리뷰부터 받아 이상 징후 감지기에 날짜 오름차순으로 넣을 수 없으므로,
+        작업이 멈춘 뒤(완료/실패/중단) 큐브 집계로 한 번만 계산하고 그 전에는 None으로 둔다.
+        """
+        # 여러 세션이 동시에 읽어도 같은 배치가 큐브에 두 번 더해지지 않도록 직렬화
+        with self._results_lock:
+            entry = self._results.get(job_id)
+            if entry is None:
+                job = self.get(job_id)
+                kind = job['kind'] if job else 'reviews'
+                entry = {'loaded': 0,
+                         'tables': {table: make_table(table, []) for table in JOB_TABLES[kind]},
+                         'seen': {table: set() for table in JOB_TABLES[kind]},
+                         'cube': ReviewCube() if kind == 'reviews' else None,
+                         'trends': KeywordTrends() if kind == 'reviews' else None,
+                         'anomalies': None}
+                self._results[job_id] = entry
+
+            # 상태를 먼저 읽어야 멈춘 작업이면 아래에서 읽는 배치가 마지막 배치까지 포함됨
+            stopped = False
+            if entry['cube'] is not None and entry['anomalies'] is None:
+                job = self.get(job_id)
+                stopped = job is not None and job['status'] not in ACTIVE_STATUSES
+
+            directory = self._job_dir(job_id)
+            files = sorted(f for f in os.listdir(directory) if f.endswith('.pkl')) if os.path.isdir(directory) else []
+            if entry['loaded'] == len(files):
+                if stopped:
+                    entry['anomalies'] = ReviewAnomalyDetector.from_cube(entry['cube'])
+                return entry
+
+            batches = [pd.read_pickle(os.path.join(directory, f)) for f in files[entry['loaded']:]]
+            # 이어서 실행한 작업은 마지막으로 기록되지 못한 페이지를 다시 받으므로 겹친 행은 버림
+            batches = [{table: self._drop_seen(table, batch[table], entry['seen'][table]) for table in entry['tables']}
+                       for batch in batches]
+            if entry['cube'] is not None:
+                for batch in batches:
+                    entry['cube'].add(batch['reviews'])
+                    entry['trends'].add_reviews(batch['reviews'])
+                # 멈췄던 작업을 이어서 실행해 배치가 늘었으면 다시 멈춘 뒤에 새로 계산
+                entry['anomalies'] = ReviewAnomalyDetector.from_cube(entry['cube']) if stopped else None
+            for table in entry['tables']:
+                entry['tables'][table] = concat_tables(
+                    table, [entry['tables'][table]] + [batch[table] for batch in batches]
+                )
+            entry['loaded'] = len(files)
+            return entry
+
+    @staticmethod
+    def _drop_seen(table, df, seen):
+        """TABLE_KEYS 기준으로 이미 읽은 행을 버리고 새 키를 seen 집합에 추가"""
+        keep = []
+        for key in row_keys(table, df).itertuples(index=False, name=None):
+            keep.append(key not in seen)
+            seen.add(key)
+        return df[keep]
+
+    def load_results(self, job_id):
+        """지금까지 저장된 배치를 합친 테이블 dict (리뷰: reviews / 토론: discussions, comments, media)"""
+        return self._load(job_id)['tables']
+
+    def review_cube(self, job_id):
+        """리뷰 작업의 지금까지 결과를 집계한 ReviewCube (배치가 늘면 새 배치만 더함)"""
+        return self._load(job_id)['cube']
+
+    def keyword_trends(self, job_id):
+        """리뷰 작업의 지금까지 결과로 쌓은 KeywordTrends (배치가 늘면 새 배치만 더함)"""
+        return self._load(job_id)['trends']
+
+    def review_anomalies(self, job_id):
+        """리뷰 작업 결과의 일별 리뷰 수/긍정 비율 이상 징후 ReviewAnomalyDetector (작업이 진행 중이면 None)"""
+        return self._load(job_id)['anomalies']
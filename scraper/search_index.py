@@ -0,0 +1,257 @@
+import os
+import re
+import sqlite3
+import threading
+from hashlib import blake2b
+
+import pandas as pd
+
+from .language_detect import get_default_detector
+from .metrics import timed
+from .schema import comment_key
+
+# 한 번에 IN (...)으로 조회할 키 수 (SQLite 변수 개수 제한보다 작게)
+LOOKUP_CHUNK_SIZE = 500
+
+# 검색 결과 점수에서 제목 일치에 주는 가중치 (본문 대비)
+TITLE_WEIGHT = 2.0
+
+SEARCH_COLUMNS = ['kind', 'app_id', 'language', 'posted_on', 'title', 'snippet', 'url', 'score']
+
+# 큰따옴표로 묶인 구절 또는 공백으로 나뉜 단어
+QUERY_TOKEN = re.compile(r'"([^"]*)"?|(\S+)')
+WORD = re.compile(r'\w+')
+
+
+def build_match_query(text):
+    """사용자 검색어를 FTS5 MATCH 식으로 변환
+
+    "여러 단어"는 구절 검색, 끝이 *인 단어는 접두어 검색이고 나머지 단어는 모두
+    포함해야 한다(AND). 특수문자는 모두 따옴표 안에 넣어 문법 오류가 나지 않게 한다.
+    """
+    terms = []
+    for phrase, word in QUERY_TOKEN.findall(text or ''):
+        words = WORD.findall(phrase or word)
+        if not words:
+            continue
+        term = '"' + ' '.join(words) + '"'
+        if word.endswith('*'):
+            term += '*'
+        terms.append(term)
+    return ' '.join(terms)
+
+
+def _text_digest(title, content):
+    return blake2b(f"{title}\0{content}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+class TextSearchIndex:
+    """리뷰 본문, 토론 제목/본문, 댓글을 담는 SQLite FTS5 전문 검색 색인
+
+    documents 테이블에 문서 키(종류:ID)와 게임/언어/날짜 같은 필터용 정보를, 같은
+    rowid의 texts(FTS5) 테이블에 검색할 텍스트를 둔다. 같은 문서를 다시 넣으면
+    텍스트가 바뀐 경우에만 색인을 갱신하므로 수집 배치마다 바로 넣어도 된다.
+    """
+
+    def __init__(self, path='data/search/index.sqlite'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "id INTEGER PRIMARY KEY, doc_key TEXT NOT NULL UNIQUE, kind TEXT NOT NULL, app_id TEXT NOT NULL, "
+            "language TEXT NOT NULL, posted_on TEXT NOT NULL, title TEXT NOT NULL, url TEXT NOT NULL, "
+            "digest TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS documents_app_date ON documents (app_id, posted_on)")
+        # 접두어 검색이 색인만으로 끝나도록 2·3글자 접두어 색인을 함께 만듦
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS texts USING fts5("
+            "title, content, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        self._conn.commit()
+
+    @timed('steam_transform_seconds', step='search_index')
+    def add_documents(self, documents):
+        """문서 dict 목록(doc_key, kind, app_id, language, posted_on, title, url, content)을 색인에 반영하고
+        새로 넣거나 바뀐 문서 수 반환
+
+        title은 화면 표시용이고, 검색 대상 제목은 index_title(없으면 title)을 쓴다.
+        """
+        documents = list({document['doc_key']: document for document in documents}.values())
+        if not documents:
+            return 0
+
+        with self._lock:
+            existing = {}
+            keys = [document['doc_key'] for document in documents]
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                existing.update(
+                    (doc_key, (doc_id, digest)) for doc_key, doc_id, digest in self._conn.execute(
+                        f"SELECT doc_key, id, digest FROM documents WHERE doc_key IN ({', '.join('?' * len(chunk))})",
+                        chunk
+                    )
+                )
+
+            changed = 0
+            with self._conn:
+                for document in documents:
+                    index_title = document.get('index_title', document['title'])
+                    digest = _text_digest(index_title, document['content'])
+                    row = (document['kind'], str(document['app_id']), document['language'],
+                           document['posted_on'], document['title'], document['url'], digest)
+                    if document['doc_key'] in existing:
+                        doc_id, old_digest = existing[document['doc_key']]
+                        if old_digest == digest:
+                            continue
+                        self._conn.execute(
+                            "UPDATE documents SET kind = ?, app_id = ?, language = ?, posted_on = ?, title = ?, "
+                            "url = ?, digest = ? WHERE id = ?", (*row, doc_id)
+                        )
+                        self._conn.execute("DELETE FROM texts WHERE rowid = ?", (doc_id,))
+                    else:
+                        doc_id = self._conn.execute(
+                            "INSERT INTO documents (doc_key, kind, app_id, language, posted_on, title, url, digest) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (document['doc_key'], *row)
+                        ).lastrowid
+                    self._conn.execute("INSERT INTO texts (rowid, title, content) VALUES (?, ?, ?)",
+                                       (doc_id, index_title, document['content']))
+                    changed += 1
+        return changed
+
+    def add_reviews(self, app_id, reviews_df):
+        """리뷰 배치 색인 (언어는 Steam이 준 값, 날짜는 작성일)"""
+        if reviews_df.empty:
+            return 0
+        return self.add_documents({
+            'doc_key': f"review:{row['review_id']}",
+            'kind': 'review',
+            'app_id': app_id,
+            'language': str(row['language']),
+            'posted_on': row['timestamp'].strftime('%Y-%m-%d'),
+            'title': '',
+            'url': f"https://steamcommunity.com/profiles/{row['author']}/recommended/{app_id}/",
+            'content': row['content'] or ''
+        } for row in reviews_df.to_dict('records'))
+
+    def add_discussion_tables(self, app_id, tables, collected_at=None, language_detector=None):
+        """normalize_discussions 형식의 토론/댓글 테이블 색인
+
+        Steam 토론 날짜는 "Mar 3 @ 5:12pm" 같은 표시용 문자열이라 수집일을 날짜로 쓰고,
+        언어는 텍스트로 감지한다. 댓글은 부모 토론 제목을 표시용으로만 붙인다.
+        """
+        discussions = tables['discussions']
+        comments = tables['comments']
+        if discussions.empty and comments.empty:
+            return 0
+
+        detector = language_detector or get_default_detector()
+        fallback_date = (collected_at or pd.Timestamp.now()).strftime('%Y-%m-%d')
+
+        def posted_on(row):
+            collected = row.get('collected_at')
+            return collected.strftime('%Y-%m-%d') if pd.notna(collected) else fallback_date
+
+        parents = {}
+        documents = []
+        discussion_rows = discussions.to_dict('records')
+        languages = detector.detect_many([f"{row['title']} {row['content'] or ''}" for row in discussion_rows])
+        for row, language in zip(discussion_rows, languages):
+            parents[row['discussion_id']] = row
+            documents.append({
+                'doc_key': f"discussion:{row['discussion_id']}",
+                'kind': 'discussion',
+                'app_id': app_id,
+                'language': language,
+                'posted_on': posted_on(row),
+                'title': row['title'] or '',
+                'url': row['url'] or '',
+                'content': row['content'] or ''
+            })
+
+        comment_rows = comments.to_dict('records')
+        languages = detector.detect_many([row['content'] or '' for row in comment_rows])
+        for row, language in zip(comment_rows, languages):
+            parent = parents.get(row['discussion_id'], {})
+            documents.append({
+                'doc_key': comment_key(row['discussion_id'], row['comment_id'], row['comment_index']),
+                'kind': 'comment',
+                'app_id': app_id,
+                'language': language,
+                'posted_on': posted_on(parent) if parent else fallback_date,
+                'title': parent.get('title') or '',
+                'index_title': '',
+                'url': parent.get('url') or '',
+                'content': row['content'] or ''
+            })
+        return self.add_documents(documents)
+
+    def search(self, query, app_id=None, kinds=None, languages=None, start_date=None, end_date=None, limit=50):
+        """검색어와 일치하는 문서를 관련도 순으로 반환 (SEARCH_COLUMNS 형식의 DataFrame)"""
+        match = build_match_query(query)
+        if not match:
+            return pd.DataFrame(columns=SEARCH_COLUMNS)
+
+        conditions = ["texts MATCH ?"]
+        params = [match]
+        if app_id:
+            conditions.append("d.app_id = ?")
+            params.append(str(app_id))
+        if kinds:
+            conditions.append(f"d.kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if languages:
+            conditions.append(f"d.language IN ({', '.join('?' * len(languages))})")
+            params.extend(languages)
+        if start_date is not None:
+            conditions.append("d.posted_on >= ?")
+            params.append(pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+        if end_date is not None:
+            conditions.append("d.posted_on <= ?")
+            params.append(pd.Timestamp(end_date).strftime('%Y-%m-%d'))
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.kind, d.app_id, d.language, d.posted_on, d.title, "
+                "snippet(texts, 1, '**', '**', '…', 16), d.url, "
+                f"bm25(texts, {TITLE_WEIGHT}, 1.0) AS score "
+                "FROM texts JOIN documents d ON d.id = texts.rowid "
+                f"WHERE {' AND '.join(conditions)} ORDER BY score LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        # bm25는 작을수록 관련도가 높으므로 부호를 바꿔 큰 값이 위로 오게 표시
+        results = pd.DataFrame(rows, columns=SEARCH_COLUMNS)
+        results['score'] = -results['score']
+        return results
+
+    def facets(self, app_id=None):
+        """검색 필터 선택지 (종류 목록, 언어 목록)"""
+        where, params = ("WHERE app_id = ?", (str(app_id),)) if app_id else ("", ())
+        with self._lock:
+            kinds = [row[0] for row in self._conn.execute(
+                f"SELECT DISTINCT kind FROM documents {where} ORDER BY kind", params)]
+            languages = [row[0] for row in self._conn.execute(
+                f"SELECT language FROM documents {where} GROUP BY language ORDER BY COUNT(*) DESC", params)]
+        return kinds, languages
+
+    def count(self, app_id=None):
+        where, params = ("WHERE app_id = ?", (str(app_id),)) if app_id else ("", ())
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM documents {where}", params).fetchone()[0]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_search_index():
+    """프로세스 전체에서 함께 쓰는 기본 검색 색인 반환"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = TextSearchIndex()
+        return _default_index
@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+
+from textblob import TextBlob
+
+from .language_detect import get_default_detector
+from .metrics import timed
+from .process_pool import MP_CONTEXT
+from .schema import comment_key
+
+# 프로세스 풀에 한 번에 넘기는 텍스트 수
+SCORE_CHUNK_SIZE = 500
+
+# 새로 채점할 텍스트가 이보다 적으면 프로세스 간 전송 비용이 더 커서 현재 프로세스에서 바로 채점
+POOL_MIN_TEXTS = 200
+
+# 한 번에 IN (...)으로 조회할 키 수 (SQLite 변수 개수 제한보다 작게)
+LOOKUP_CHUNK_SIZE = 500
+
+SENTIMENT_COLUMNS = ['polarity', 'subjectivity']
+
+# TextBlob 감성 사전은 영어 전용이라 다른 언어는 모두 0점이 되므로 채점하지 않고 NaN으로 둠
+SCORED_LANGUAGE = 'en'
+STEAM_SCORED_LANGUAGE = 'english'
+UNSCORED = (float('nan'), float('nan'))
+
+
+def score_texts(texts):
+    """텍스트마다 TextBlob (극성 -1~1, 주관성 0~1) 점수 (프로세스 풀 작업 단위)"""
+    return [tuple(TextBlob(text).sentiment) for text in texts]
+
+
+def _content_digest(text):
+    return blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SentimentScorer:
+    """리뷰/토론/댓글 텍스트의 감성 점수를 프로세스 풀에서 배치로 계산하고 캐시
+
+    점수는 문서 키(review:ID, discussion:ID, comment:토론ID:댓글ID)와 내용 해시로
+    SQLite에 저장해, 다시 수집해도 내용이 그대로인 텍스트는 다시 채점하지 않는다.
+    한 배치 안에서 내용이 같은 텍스트는 한 번만 채점한다. 영어가 아닌 텍스트(리뷰는
+    language 필드, 토론/댓글은 언어 감지 결과 기준)는 채점하지 않고 점수를 NaN으로 둔다.
+    """
+
+    def __init__(self, cache_path='data/cache/sentiment_cache.sqlite', workers=None, language_detector=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._language_detector = language_detector
+        self.last_stats = {}
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "doc_key TEXT PRIMARY KEY, digest TEXT NOT NULL, polarity REAL NOT NULL, subjectivity REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _detector(self):
+        if self._language_detector is None:
+            self._language_detector = get_default_detector()
+        return self._language_detector
+
+    def _executor(self):
+        """처음 필요할 때 프로세스 풀을 만들고 이후 계속 재사용"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=MP_CONTEXT)
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _lookup(self, keys):
+        cached = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+                cached.update(
+                    (doc_key, (digest, polarity, subjectivity))
+                    for doc_key, digest, polarity, subjectivity in self._conn.execute(
+                        f"SELECT doc_key, digest, polarity, subjectivity FROM scores "
+                        f"WHERE doc_key IN ({', '.join('?' * len(chunk))})",
+                        chunk
+                    )
+                )
+        return cached
+
+    def _score_new(self, texts):
+        if len(texts) < POOL_MIN_TEXTS or self.workers == 1:
+            return score_texts(texts)
+        # 모든 워커가 고르게 일하도록 워커 수 이상으로 나누되, 한 덩어리는 SCORE_CHUNK_SIZE 이하
+        chunk_size = max(1, min(SCORE_CHUNK_SIZE, -(-len(texts) // (self.workers * 4))))
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+        return [score for chunk_scores in self._executor().map(score_texts, chunks) for score in chunk_scores]
+
+    @timed('steam_transform_seconds', step='sentiment')
+    def score(self, keys, texts, languages=None):
+        """문서 키와 텍스트 목록을 받아 (polarity, subjectivity) 목록 반환 (캐시에 없는 것만 채점)
+
+        languages(언어 코드 목록)를 주지 않으면 텍스트마다 언어를 감지한다. 영어가 아닌
+        텍스트는 채점하지도 캐시하지도 않고 (NaN, NaN)을 돌려준다.
+        """
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        if languages is None:
+            languages = self._detector().detect_many(texts)
+        digests = [_content_digest(text) for text in texts]
+        cached = self._lookup(list(dict.fromkeys(keys)))
+
+        results = [None] * len(texts)
+        missing = {}
+        skipped = 0
+        for i, (key, digest) in enumerate(zip(keys, digests)):
+            if languages[i] != SCORED_LANGUAGE:
+                results[i] = UNSCORED
+                skipped += 1
+                continue
+            entry = cached.get(key)
+            if entry and entry[0] == digest:
+                results[i] = entry[1:]
+            else:
+                missing.setdefault(digest, texts[i])
+
+        scored = dict(zip(missing, self._score_new(list(missing.values()))))
+        new_rows = []
+        for i, (key, digest) in enumerate(zip(keys, digests)):
+            if results[i] is None:
+                results[i] = scored[digest]
+                new_rows.append((key, digest, *results[i]))
+
+        if new_rows:
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)", new_rows)
+                self._conn.commit()
+        self.last_stats = {'texts': len(texts), 'scored': len(missing), 'skipped': skipped,
+                           'cached': len(texts) - len(new_rows) - skipped}
+        return results
+
+    def _with_scores(self, df, keys, texts, languages=None):
+        scores = self.score(keys, texts, languages)
+        df = df.copy()
+        for position, column in enumerate(SENTIMENT_COLUMNS):
+            df[column] = [score[position] for score in scores]
+        return df.astype({column: 'float32' for column in SENTIMENT_COLUMNS})
+
+    def score_reviews(self, reviews_df):
+        """리뷰 DataFrame에 polarity/subjectivity 컬럼을 채워 반환"""
+        if reviews_df.empty:
+            return reviews_df
+        return self._with_scores(
+            reviews_df,
+            [f"review:{review_id}" for review_id in reviews_df['review_id']],
+            reviews_df['content'].tolist(),
+            [SCORED_LANGUAGE if language == STEAM_SCORED_LANGUAGE else language
+             for language in reviews_df['language'].astype(str)]
+        )
+
+    def score_discussion_tables(self, tables):
+        """normalize_discussions 형식 테이블의 토론(제목+본문)과 댓글에 점수 컬럼을 채워 반환"""
+        tables = dict(tables)
+        discussions = tables['discussions']
+        if not discussions.empty:
+            tables['discussions'] = self._with_scores(
+                discussions,
+                [f"discussion:{discussion_id}" for discussion_id in discussions['discussion_id']],
+                (discussions['title'].fillna('') + '\n' + discussions['content'].fillna('')).tolist()
+            )
+        comments = tables['comments']
+        if not comments.empty:
+            tables['comments'] = self._with_scores(
+                comments,
+                [comment_key(*key) for key
+                 in zip(comments['discussion_id'], comments['comment_id'], comments['comment_index'])],
+                comments['content'].tolist()
+            )
+        return tables
+
+
+_default_scorer = None
+_default_scorer_lock = threading.Lock()
+
+
+def get_default_scorer():
+    """프로세스 전체에서 함께 쓰는 기본 감성 채점기 반환"""
+    global _default_scorer
+    with _default_scorer_lock:
+        if _default_scorer is None:
+            _default_scorer = SentimentScorer()
+        return _default_scorer
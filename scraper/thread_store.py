@@ -0,0 +1,82 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class DiscussionThreadStore:
+    """토론 게시글별 목록 지문(url, reply_count, lastpost)과 마지막으로 받은 본문/댓글을 보관
+
+    목록 페이지의 지문이 저장된 값과 같으면 게시글이 바뀌지 않은 것으로 보고
+    상세 페이지를 다시 받지 않고 저장된 내용을 재사용한다.
+    """
+
+    def __init__(self, path='data/cache/discussion_threads.sqlite'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS threads ("
+            "url TEXT PRIMARY KEY, reply_count INTEGER NOT NULL, last_post TEXT NOT NULL, "
+            "details TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def fingerprint(discussion):
+        """목록 페이지에서 얻은 (reply_count, lastpost) 지문"""
+        return int(discussion.get('reply_count') or 0), discussion.get('date') or ''
+
+    def find_unchanged(self, discussions):
+        """지문이 저장된 값과 같은 게시글의 저장된 상세 정보 {url: details}"""
+        urls = [discussion['url'] for discussion in discussions if discussion.get('url')]
+        if not urls:
+            return {}
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, reply_count, last_post, details FROM threads "
+                f"WHERE url IN ({', '.join('?' * len(urls))})",
+                urls
+            ).fetchall()
+        stored = {url: ((reply_count, last_post), details) for url, reply_count, last_post, details in rows}
+
+        unchanged = {}
+        for discussion in discussions:
+            entry = stored.get(discussion.get('url'))
+            if entry and entry[0] == self.fingerprint(discussion):
+                unchanged[discussion['url']] = json.loads(entry[1])
+        return unchanged
+
+    def save(self, discussions):
+        """새로 받은 게시글의 지문과 상세 정보를 저장 (content/comments/media가 채워진 토론 dict 목록)"""
+        now = time.time()
+        rows = []
+        for discussion in discussions:
+            if not discussion.get('url'):
+                continue
+            reply_count, last_post = self.fingerprint(discussion)
+            details = {key: discussion[key] for key in ('content', 'media', 'comments') if key in discussion}
+            rows.append((discussion['url'], reply_count, last_post,
+                         json.dumps(details, ensure_ascii=False), now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO threads VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_thread_store():
+    """프로세스 전체에서 함께 쓰는 기본 게시글 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = DiscussionThreadStore()
+        return _default_store
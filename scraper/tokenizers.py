@@ -0,0 +1,212 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# 언어별 불용어 정의
+STOP_WORDS = {
+    'en': frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+                     'is', 'are', 'was', 'were', 'will', 'be', 'has', 'have', 'had']),
+    'ko': frozenset(['은', '는', '이', '가', '을', '를', '의', '에', '에서', '으로']),
+    'zh': frozenset(['的', '了', '和', '是', '就', '都', '而', '及', '與', '或']),
+    'ru': frozenset(['и', 'в', 'во', 'не', 'что', 'он', 'на', 'я', 'с', 'со'])
+}
+
+STOP_WORD_KEYS = pa.array([f"{lang}\x00{word}" for lang, words in STOP_WORDS.items() for word in words])
+
+# 어절 끝에서 떼어 낼 조사 (긴 것부터 비교)
+KOREAN_PARTICLES = sorted([
+    '에서는', '으로는', '에게서', '이라도', '에서', '으로', '에게', '한테', '까지', '부터', '처럼', '보다',
+    '이랑', '하고', '이나', '마저', '조차', '은', '는', '이', '가', '을', '를', '의', '에', '도', '로',
+    '와', '과', '만', '랑', '나'
+], key=len, reverse=True)
+
+# 한글 음절, 한자/가나(히라가나·가타카나, CJK 확장 A, 통합 한자, 호환 한자) 연속 구간, 그 밖의 글자 구간
+# (Arrow의 RE2는 \\uXXXX 표기를 모르므로 파이썬 문자열에서 실제 글자로 바꿔 넘김)
+HANGUL = '\uac00-\ud7a3'
+KANA = '\u3040-\u30ff'
+HAN_KANA = KANA + '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+SCRIPT_RUN = re.compile(f'([{HANGUL}]+)|([{HAN_KANA}]+)|([^{HANGUL}{HAN_KANA}]+)')
+CJK_CHAR = f'[{HANGUL}{HAN_KANA}]'
+
+# 글자/숫자가 아닌 문자 (RE2의 \\w는 ASCII만 포함하므로 유니코드 범주로 지정)
+NON_WORD = r'[^\p{L}\p{N}]+'
+
+# 같은 어절은 글마다 반복되므로 어절 단위 분해 결과를 캐시
+SPLIT_CACHE_SIZE = 200000
+
+
+def _flatten(token_lists):
+    """토큰 ListArray를 (토큰 배열, 각 토큰이 나온 글 번호) 쌍으로 펼침"""
+    return pc.list_flatten(token_lists), pc.list_parent_indices(token_lists).to_numpy()
+
+
+def _keep_tokens(tokens, doc_index, keep):
+    keep = pc.fill_null(keep, False).to_numpy(zero_copy_only=False)
+    return pc.filter(tokens, keep), doc_index[keep]
+
+
+def _stop_word_mask(tokens, doc_index, languages):
+    """(언어, 토큰)이 불용어인지 여부 (언어 목록이 없으면 모두 False)"""
+    if languages is None:
+        return pc.is_in(tokens, value_set=pa.array([], type=pa.string()))
+    token_langs = pc.take(languages, pa.array(doc_index))
+    return pc.is_in(pc.binary_join_element_wise(token_langs, tokens, '\x00'), value_set=STOP_WORD_KEYS)
+
+
+class WhitespaceTokenizer:
+    """소문자화한 뒤 공백으로만 나누는 기본 토크나이저 (라틴/키릴 문자 글에 적합)
+
+    min_length보다 짧은 단어와 글 언어의 불용어는 버린다. 구두점은 단어에 붙은 채로 남는다.
+    """
+
+    name = 'whitespace'
+
+    def __init__(self, min_length=3):
+        self.min_length = min_length
+
+    def tokenize(self, texts, languages=None):
+        """텍스트(문자열 Series/배열)와 언어 코드 목록을 받아 (토큰 배열, 글 번호 numpy 배열) 반환"""
+        texts = pa.array(texts, type=pa.string())
+        languages = pa.array(languages, type=pa.string()) if languages is not None else None
+        tokens, doc_index = _flatten(pc.utf8_split_whitespace(pc.utf8_lower(texts)))
+        keep = pc.and_(pc.greater_equal(pc.utf8_length(tokens), self.min_length),
+                       pc.invert(_stop_word_mask(tokens, doc_index, languages)))
+        return _keep_tokens(tokens, doc_index, keep)
+
+
+class CjkTokenizer:
+    """한중일 문자를 따로 처리하는 토크나이저
+
+    구두점을 공백으로 바꿔 나눈 뒤, 한중일 문자가 없는 단어는 WhitespaceTokenizer와 같이
+    처리한다. 한글은 어절 끝 조사를 떼어 내고(서버가 → 서버), 띄어쓰기가 없는 한자/가나
+    구간은 글자 ngram개씩 묶는다(游戏很好玩 → 游戏, 戏很, 很好, 好玩). 청크 안의 서로 다른
+    한중일 어절만 파이썬으로 분해하고 결과를 어절 단위로 캐시하므로, 글 수가 많아도 대부분은
+    Arrow/numpy 벡터 연산으로 끝난다.
+    """
+
+    name = 'cjk'
+
+    def __init__(self, ngram=2, min_length=3):
+        self.ngram = ngram
+        self.min_length = min_length
+        self._split = lru_cache(maxsize=SPLIT_CACHE_SIZE)(self._split_word)
+
+    def _split_hangul(self, run):
+        for particle in KOREAN_PARTICLES:
+            # 조사를 뗀 나머지가 한 글자뿐이면 조사가 아니라 단어의 일부로 봄 (사과, 포도)
+            if run.endswith(particle) and len(run) - len(particle) >= 2:
+                run = run[:-len(particle)]
+                break
+        return [run] if len(run) >= 2 else []
+
+    def _split_han_kana(self, run):
+        if len(run) <= self.ngram:
+            return [run] if len(run) >= 2 else []
+        return [run[start:start + self.ngram] for start in range(len(run) - self.ngram + 1)]
+
+    def _split_word(self, word):
+        """한중일 문자가 섞인 어절 하나를 토큰 목록으로 분해"""
+        tokens = []
+        for hangul, han_kana, other in SCRIPT_RUN.findall(word):
+            if hangul:
+                tokens.extend(self._split_hangul(hangul))
+            elif han_kana:
+                tokens.extend(self._split_han_kana(han_kana))
+            elif len(other) >= self.min_length:
+                tokens.append(other)
+        return tuple(tokens)
+
+    def tokenize(self, texts, languages=None):
+        """텍스트와 언어 코드 목록을 받아 (토큰 배열, 글 번호 numpy 배열) 반환"""
+        texts = pa.array(texts, type=pa.string())
+        languages = pa.array(languages, type=pa.string()) if languages is not None else None
+        words = pc.utf8_split_whitespace(pc.replace_substring_regex(pc.utf8_lower(texts), NON_WORD, ' '))
+        words, doc_index = _flatten(words)
+        not_stop_word = pc.invert(_stop_word_mask(words, doc_index, languages))
+        is_cjk = pc.match_substring_regex(words, CJK_CHAR)
+
+        # 한중일 문자가 없는 단어는 길이/불용어만 보고 그대로 사용
+        plain, plain_index = _keep_tokens(words, doc_index, pc.and_(
+            pc.and_(pc.invert(is_cjk), not_stop_word),
+            pc.greater_equal(pc.utf8_length(words), self.min_length)
+        ))
+
+        # 한중일 어절은 서로 다른 어절만 분해한 뒤 등장 위치마다 조각을 펼침
+        cjk_words, cjk_index = _keep_tokens(words, doc_index, pc.and_(is_cjk, not_stop_word))
+        encoded = pc.dictionary_encode(cjk_words)
+        pieces = [self._split(word) for word in encoded.dictionary.to_pylist()]
+        piece_tokens = pa.array([token for word_pieces in pieces for token in word_pieces], type=pa.string())
+        piece_counts = np.array([len(word_pieces) for word_pieces in pieces], dtype=np.int64)
+        piece_offsets = np.concatenate([[0], np.cumsum(piece_counts)[:-1]]).astype(np.int64)
+
+        word_ids = encoded.indices.to_numpy(zero_copy_only=False)
+        counts = piece_counts[word_ids]
+        # 등장 위치마다 (그 어절 조각의 시작 위치 + 0, 1, ..., 조각 수 - 1)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        split_tokens = pc.take(piece_tokens, pa.array(np.repeat(piece_offsets[word_ids], counts) + within))
+        split_index = np.repeat(cjk_index, counts)
+
+        tokens = pa.concat_arrays([plain, split_tokens])
+        doc_index = np.concatenate([plain_index, split_index.astype(plain_index.dtype)])
+        # 글 순서대로 정렬 (같은 글 안에서는 일반 단어 뒤에 한중일 토큰)
+        order = np.argsort(doc_index, kind='stable')
+        return pc.take(tokens, pa.array(order)), doc_index[order]
+
+
+class MorphTokenizer(CjkTokenizer):
+    """형태소 분석기로 한국어(kiwipiepy)와 중국어(jieba)를 나누는 토크나이저
+
+    한국어는 일반/고유 명사와 외국어만, 중국어는 두 글자 이상 단어만 남긴다.
+    가나 등 분석기가 없는 문자는 CjkTokenizer와 같이 처리한다. 분석기는 선택 설치
+    패키지이므로 없으면 만들 때 ImportError를 낸다.
+    """
+
+    name = 'morph'
+
+    # kiwipiepy 품사 중 키워드로 남길 것 (일반 명사, 고유 명사, 외국어, 어근)
+    KOREAN_TAGS = frozenset(['NNG', 'NNP', 'SL', 'XR'])
+
+    def __init__(self, ngram=2, min_length=3):
+        super().__init__(ngram, min_length)
+        try:
+            import jieba
+            from kiwipiepy import Kiwi
+        except ImportError as e:
+            raise ImportError("형태소 분석 토크나이저에는 kiwipiepy와 jieba가 필요합니다 "
+                              "(pip install kiwipiepy jieba)") from e
+        jieba.setLogLevel(60)
+        self._kiwi = Kiwi()
+        self._jieba = jieba
+
+    def _split_hangul(self, run):
+        return [token.form for token in self._kiwi.tokenize(run)
+                if token.tag in self.KOREAN_TAGS and len(token.form) >= 2]
+
+    def _split_han_kana(self, run):
+        if re.search(f'[{KANA}]', run):
+            return super()._split_han_kana(run)
+        return [word for word in self._jieba.lcut(run) if len(word) >= 2]
+
+
+TOKENIZERS = {
+    WhitespaceTokenizer.name: WhitespaceTokenizer,
+    CjkTokenizer.name: CjkTokenizer,
+    MorphTokenizer.name: MorphTokenizer,
+}
+
+# 기존 키워드 분석 결과가 바뀌지 않도록 공백 분리가 기본이고, CJK 분리는 이름으로 골라 씀
+DEFAULT_TOKENIZER = WhitespaceTokenizer.name
+
+
+def get_tokenizer(tokenizer=None):
+    """이름('whitespace', 'cjk', 'morph') 또는 토크나이저 객체를 받아 토크나이저 반환 (None이면 기본값)"""
+    if tokenizer is None:
+        tokenizer = DEFAULT_TOKENIZER
+    if isinstance(tokenizer, str):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"알 수 없는 토크나이저: {tokenizer} (가능한 값: {', '.join(TOKENIZERS)})")
+        return TOKENIZERS[tokenizer]()
+    return tokenizer